@@ -0,0 +1,8 @@
+"""
+Reproduzierbare Benchmarks für die Lade-, Berechnungs-, Speicher- und
+Darstellungspfade des Dashboards.
+
+    python -m benchmarks erzeuge /tmp/iu-bench --groessen 100 10000
+    python -m benchmarks lauf --groessen 100 10000 -o ergebnis.json
+    python -m benchmarks vergleiche basis.json ergebnis.json
+"""
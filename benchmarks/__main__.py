@@ -0,0 +1,73 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+from benchmarks.daten import erzeuge_datensatz, erzeuge_kohorte
+from benchmarks.laeufe import laufe, vergleiche
+
+STANDARD_VERZEICHNIS = os.path.join(tempfile.gettempdir(), "iu-dashboard-bench")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Benchmarks für das IU Dashboard")
+    sub = parser.add_subparsers(dest="befehl", required=True)
+
+    p_erz = sub.add_parser("erzeuge", help="Synthetische Datensätze anlegen")
+    p_erz.add_argument("verzeichnis", nargs="?", default=STANDARD_VERZEICHNIS)
+    p_erz.add_argument("--groessen", type=int, nargs="+", default=[10**2, 10**4])
+    p_erz.add_argument("--kohorte", type=int, default=0, help="Anzahl Studierender-Ordner")
+
+    p_lauf = sub.add_parser("lauf", help="Benchmarks ausführen und als JSON speichern")
+    p_lauf.add_argument("--verzeichnis", default=STANDARD_VERZEICHNIS)
+    p_lauf.add_argument("--groessen", type=int, nargs="+", default=[10**2, 10**4],
+                        help="Anzahl Kurse je Datensatz, z. B. 100 10000 1000000 10000000")
+    p_lauf.add_argument("--kohorte", type=int, default=0, help="Anzahl Studierender (0 = aus)")
+    p_lauf.add_argument("--wiederholungen", type=int, default=None)
+    p_lauf.add_argument("--startzeit", action="store_true",
+                        help="Startzeit von 'python -m iu_dashboard' mit dem GUI-Pfad vergleichen")
+    p_lauf.add_argument("-o", "--ausgabe", default="-", help="JSON-Datei (Standard: Standardausgabe)")
+
+    p_vgl = sub.add_parser("vergleiche", help="Neuen Lauf mit gespeicherter Basis vergleichen")
+    p_vgl.add_argument("basis")
+    p_vgl.add_argument("neu")
+    p_vgl.add_argument("--toleranz", type=float, default=0.10,
+                       help="Erlaubte Verschlechterung, z. B. 0.10 für 10 %%")
+
+    args = parser.parse_args(argv)
+
+    if args.befehl == "erzeuge":
+        for anzahl in args.groessen:
+            print(erzeuge_datensatz(args.verzeichnis, anzahl))
+        if args.kohorte:
+            print(erzeuge_kohorte(os.path.join(args.verzeichnis, f"kohorte-{args.kohorte}"),
+                                  args.kohorte))
+        return 0
+
+    if args.befehl == "lauf":
+        ergebnis = laufe(args.verzeichnis, args.groessen, args.kohorte, args.wiederholungen,
+                         args.startzeit)
+        text = json.dumps(ergebnis, indent=2)
+        if args.ausgabe == "-":
+            print(text)
+        else:
+            with open(args.ausgabe, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+        return 0
+
+    with open(args.basis, encoding="utf-8") as f:
+        basis = json.load(f)
+    with open(args.neu, encoding="utf-8") as f:
+        neu = json.load(f)
+    regressionen = 0
+    for name, alt, jetzt, faktor, regression in vergleiche(basis, neu, args.toleranz):
+        markierung = "  REGRESSION" if regression else ""
+        print(f"{name:40s} {alt * 1000:10.3f} ms -> {jetzt * 1000:10.3f} ms  x{faktor:5.2f}{markierung}")
+        regressionen += regression
+    return 1 if regressionen else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
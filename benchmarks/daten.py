@@ -0,0 +1,94 @@
+import csv
+import os
+import random
+
+from model import KursRepository, StudentRepository
+
+GROESSEN = (10**2, 10**4, 10**6, 10**7)
+
+KURSNAMEN = [
+    "Mathematik I", "Mathematik II", "Grundlagen der Programmierung",
+    "Datenbanken", "Requirements Engineering", "Spezifikation",
+    "Einführung in das wissenschaftliche Arbeiten für IT und Technik",
+    "Betriebssysteme", "Rechnernetze", "Statistik", "Projektmanagement",
+    "Software-Architektur", "IT-Sicherheit", "Bachelorarbeit",
+]
+NOTEN = ["", "", "A", "1.0", "1.3", "1.7", "2.0", "2.3", "2.7", "3.0", "3.3", "3.7", "4.0"]
+
+
+def kurscode(i):
+    """
+    Eindeutiger, realistisch kurzer Kurscode für die i-te Zeile.
+    """
+    return f"K{i:07d}"
+
+
+def erzeuge_kurse(dateipfad, anzahl, seed=0):
+    """
+    Schreibt eine synthetische kurse.csv mit der angegebenen Anzahl Zeilen.
+    Gleicher Seed ergibt dieselbe Datei.
+
+    :param dateipfad: Zielpfad
+    :param anzahl: Anzahl Kurse
+    :param seed: Startwert des Zufallsgenerators
+    """
+    rnd = random.Random(seed)
+    with open(dateipfad, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(KursRepository.HEADERS)
+        for i in range(anzahl):
+            writer.writerow((kurscode(i), rnd.choice(KURSNAMEN),
+                             rnd.choice((5, 5, 5, 10, 15)), rnd.choice(NOTEN)))
+
+
+def erzeuge_student(dateipfad, ziel_ects=180):
+    """
+    Schreibt eine synthetische student.csv.
+
+    :param dateipfad: Zielpfad
+    :param ziel_ects: Ziel-ECTS des Studierenden
+    """
+    with open(dateipfad, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(StudentRepository.HEADERS)
+        writer.writerow(("Max Mustermann", "Bachelor Softwareentwicklung", ziel_ects))
+
+
+def erzeuge_datensatz(verzeichnis, anzahl, seed=0):
+    """
+    Legt ein Verzeichnis mit student.csv und kurse.csv an, sofern es noch
+    nicht existiert, und gibt den Pfad der Kursdatei zurück.
+
+    :param verzeichnis: Basisverzeichnis aller Datensätze
+    :param anzahl: Anzahl Kurse
+    :param seed: Startwert des Zufallsgenerators
+    :return: Pfad der kurse.csv
+    """
+    ziel = os.path.join(verzeichnis, f"kurse-{anzahl}")
+    kurse_pfad = os.path.join(ziel, "kurse.csv")
+    if not os.path.exists(kurse_pfad):
+        os.makedirs(ziel, exist_ok=True)
+        erzeuge_student(os.path.join(ziel, "student.csv"))
+        erzeuge_kurse(kurse_pfad, anzahl, seed)
+    return kurse_pfad
+
+
+def erzeuge_kohorte(wurzel, studierende, kurse_pro_student=36, seed=0):
+    """
+    Legt einen Kohorten-Verzeichnisbaum an (ein Ordner pro Studierendem mit
+    student.csv und kurse.csv), sofern er noch nicht existiert.
+
+    :param wurzel: Wurzelverzeichnis der Kohorte
+    :param studierende: Anzahl Studierender
+    :param kurse_pro_student: Anzahl Kurse je Studierendem
+    :param seed: Startwert des Zufallsgenerators
+    :return: Wurzelverzeichnis
+    """
+    for i in range(studierende):
+        ziel = os.path.join(wurzel, f"{i // 1000:04d}", f"student-{i:06d}")
+        if os.path.exists(os.path.join(ziel, "kurse.csv")):
+            continue
+        os.makedirs(ziel, exist_ok=True)
+        erzeuge_student(os.path.join(ziel, "student.csv"))
+        erzeuge_kurse(os.path.join(ziel, "kurse.csv"), kurse_pro_student, seed + i)
+    return wurzel
@@ -0,0 +1,365 @@
+import gc
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import service
+from datenquelle import SqliteDatenquelle
+from model import KursKatalog, KursRepository
+from planer import SemesterPlaner
+from service import NotenPlaner, Service, StatistikCache
+from sortierung import SortierIndex
+from suche import SuchIndex
+from benchmarks.daten import erzeuge_datensatz, erzeuge_kohorte, kurscode
+
+
+class TreeAttrappe:
+    """
+    Ersatz für ttk.Treeview ohne Display. Bildet nur die von VirtuelleTabelle
+    genutzten Aufrufe nach und zählt sie, damit der Aufwand der Tabellenbefüllung
+    auch ohne Xvfb messbar ist.
+    """
+
+    def __init__(self, hoehe=600):
+        self.hoehe = hoehe
+        self.aufrufe = 0
+        self._werte = {}
+        self._n = 0
+
+    def bind(self, *args):
+        pass
+
+    def winfo_height(self):
+        return self.hoehe
+
+    def cget(self, option):
+        return 12
+
+    def insert(self, parent, index, values=()):
+        self.aufrufe += 1
+        self._n += 1
+        iid = f"I{self._n:03X}"
+        self._werte[iid] = values
+        return iid
+
+    def item(self, iid, values=None, tags=None):
+        self.aufrufe += 1
+        if values is not None:
+            self._werte[iid] = values
+
+    def move(self, iid, parent, index):
+        self.aufrufe += 1
+
+    def detach(self, iid):
+        self.aufrufe += 1
+
+    def selection(self):
+        return ()
+
+    def selection_remove(self, *items):
+        pass
+
+
+class ScrollbarAttrappe:
+    """
+    Ersatz für ttk.Scrollbar ohne Display.
+    """
+
+    def configure(self, **optionen):
+        pass
+
+    def set(self, erster, letzter):
+        pass
+
+
+def messe(funktion, wiederholungen):
+    """
+    Führt eine Funktion mehrfach aus und misst die Laufzeit.
+
+    :param funktion: Funktion ohne Parameter
+    :param wiederholungen: Anzahl Durchläufe
+    :return: Dict mit "min", "median" (Sekunden) und "wiederholungen"
+    """
+    zeiten = []
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        funktion()
+        zeiten.append(time.perf_counter() - start)
+    return {"min": min(zeiten), "median": statistics.median(zeiten), "wiederholungen": wiederholungen}
+
+
+def miss_speicher(funktion):
+    """
+    Misst mit tracemalloc, wie viel Speicher das Ergebnis einer Funktion belegt.
+
+    :param funktion: Funktion ohne Parameter
+    :return: Belegte Bytes, solange das Ergebnis noch lebt
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        ergebnis = funktion()
+        belegt = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del ergebnis
+    return belegt
+
+
+def _baue_tabelle():
+    """
+    Erzeugt eine VirtuelleTabelle: mit echtem Tk, wenn ein Display (z. B. Xvfb)
+    vorhanden ist, sonst mit TreeAttrappe.
+
+    :return: Tupel (VirtuelleTabelle, Aufräumfunktion, Art)
+    """
+    from view import VirtuelleTabelle
+    if os.environ.get("DISPLAY"):
+        import tkinter as tk
+        from tkinter import ttk
+        root = tk.Tk()
+        root.geometry("900x600")
+        tree = ttk.Treeview(root, columns=("Kurscode", "Kursname", "ECTS", "Note"),
+                            show="headings", height=12)
+        scrollbar = ttk.Scrollbar(root, orient="vertical")
+        scrollbar.pack(side="right", fill="y")
+        tree.pack(fill="both", expand=True)
+        root.update_idletasks()
+        return VirtuelleTabelle(tree, scrollbar, zeilenhoehe=20), root.destroy, "tk"
+    return VirtuelleTabelle(TreeAttrappe(), ScrollbarAttrappe(), zeilenhoehe=30), lambda: None, "attrappe"
+
+
+def laufe_groesse(verzeichnis, anzahl, wiederholungen=None):
+    """
+    Misst alle Pfade für einen Datensatz der angegebenen Größe.
+
+    :param verzeichnis: Verzeichnis für die erzeugten Datensätze
+    :param anzahl: Anzahl Kurse
+    :param wiederholungen: Durchläufe je Messung (Standard: 5, ab 10^6 Zeilen 1)
+    :return: Dict Name -> Messergebnis
+    """
+    if wiederholungen is None:
+        wiederholungen = 1 if anzahl >= 10**6 else 5
+    pfad = erzeuge_datensatz(verzeichnis, anzahl)
+    ergebnisse = {}
+
+    def merke(name, funktion):
+        ergebnisse[f"{name}/{anzahl}"] = messe(funktion, wiederholungen)
+
+    merke("lade_kurse", lambda: KursRepository.lade_kurse(pfad))
+    merke("lade_kurstabelle", lambda: KursRepository.lade_kurstabelle(pfad))
+    merke("lade_notentabelle", lambda: KursRepository.lade_notentabelle(pfad, KursKatalog()))
+
+    # Speicherbedarf: Kurs-Objekte gegen KursTabelle (Faktor = Ersparnis)
+    liste_bytes = miss_speicher(lambda: KursRepository.lade_kurse(pfad))
+    tabelle_bytes = miss_speicher(lambda: KursRepository.lade_kurstabelle(pfad))
+    ergebnisse[f"speicher_kurstabelle/{anzahl}"] = {
+        "bytes": tabelle_bytes, "bytes_kursliste": liste_bytes,
+        "faktor": round(liste_bytes / tabelle_bytes, 2) if tabelle_bytes else None,
+    }
+
+    kurse = KursRepository.lade_kurse(pfad)
+    tabelle = KursRepository.lade_kurstabelle(pfad)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ziel = os.path.join(tmp, "kurse.csv")
+        merke("speichere_kurse", lambda: KursRepository.speichere_kurse(ziel, kurse))
+
+    merke("berechne_ects", lambda: Service.berechne_ects(kurse))
+    merke("berechne_durchschnitt", lambda: Service.berechne_durchschnitt(kurse))
+    merke("berechne_ects_tabelle", lambda: Service.berechne_ects(tabelle))
+    merke("berechne_durchschnitt_tabelle", lambda: Service.berechne_durchschnitt(tabelle))
+
+    # Alle Kennzahlen: Generator über Kurs-Objekte gegen Spalten (NumPy ab
+    # service.NUMPY_AB Zeilen) und gegen die reine array-Variante ohne NumPy
+    def kennzahlen(sammlung):
+        return (Service.berechne_ects(sammlung), Service.berechne_durchschnitt(sammlung),
+                Service.zaehle_status(sammlung))
+
+    def kennzahlen_ohne_numpy(sammlung):
+        geladen, service._numpy = service._numpy, False
+        try:
+            return kennzahlen(sammlung)
+        finally:
+            service._numpy = geladen
+    merke("kennzahlen_kursliste", lambda: kennzahlen(kurse))
+    merke("kennzahlen_tabelle", lambda: kennzahlen(tabelle))
+    merke("kennzahlen_tabelle_ohne_numpy", lambda: kennzahlen_ohne_numpy(tabelle))
+
+    cache = StatistikCache(tabelle)
+    merke("statistik_cache_x1000", lambda: [cache.kennzahlen() for _ in range(1000)])
+
+    merke("notenplaner_aufbau", lambda: NotenPlaner(kurse))
+    planer = NotenPlaner(kurse)
+    # Wie bei der Eingabe im Notenplaner: je Tastendruck ein neues Ziel
+    ziele = [round(1 + i / 20, 2) for i in range(60)]
+    merke(f"notenplaner_x{len(ziele)}", lambda: [planer.schlechteste_noten(z) for z in ziele])
+
+    # Ein Studium mit 180 fehlenden ECTS, davon einige Kurse bevorzugt
+    ziel = Service.berechne_ects(kurse) + 180
+    gewichte = {k.kurscode: 1 for k in kurse[::7]}
+    merke("semesterplan", lambda: SemesterPlaner(kurse, ziel, gewichte=gewichte).plane())
+
+    rnd = random.Random(anzahl)
+    codes = [kurscode(rnd.randrange(anzahl)) for _ in range(1000)]
+    noten = [rnd.choice(("1.3", "2.7", "A", "-")) for _ in range(1000)]
+
+    def setze_noten():
+        for code, note in zip(codes, noten):
+            Service.setze_note(kurse, code, note)
+    merke("setze_note_x1000", setze_noten)
+
+    merke("suche_aufbau", lambda: SuchIndex(kurse).baue_auf())
+    index = SuchIndex(kurse)
+    index.baue_auf()
+    # Eingabe Zeichen für Zeichen wie im Suchfeld: Kurscode- und Namensanfänge
+    eingaben = [code[:i] for code in codes[:10] for i in range(1, len(code) + 1)]
+    eingaben += [kurse[i % anzahl].name[:j] for i in range(10) for j in range(1, 8)]
+    # Je Tastendruck nur die sichtbaren Zeilen, die Gesamtzahl erst danach
+    merke(f"suche_x{len(eingaben)}", lambda: [index.suche(e)[:30] for e in eingaben])
+    merke(f"suche_vollstaendig_x{len(eingaben)}", lambda: [len(index.suche(e)) for e in eingaben])
+
+    merke("sortiere_note", lambda: SortierIndex(kurse).folge("Note"))
+    sortierung = SortierIndex(kurse)
+    for spalte in ("Kurscode", "Kursname", "ECTS", "Note"):
+        sortierung.folge(spalte)
+
+    def sortierung_nachfuehren():
+        for code, note in zip(codes, noten):
+            k = kurse.finde(code)
+            k.note = Service.pruefe_note(note)[1]
+            sortierung.aktualisiere(k)
+    merke("sortierung_aktualisiere_x1000", sortierung_nachfuehren)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        quelle = SqliteDatenquelle(os.path.join(tmp, "kurse.db"))
+        quelle.speichere_kurse(tabelle)
+        werte = [Service.pruefe_note(n)[1] for n in noten]
+
+        def sqlite_setze_noten():
+            # Wie im Controller: jede Änderung einzeln speichern
+            for code, note in zip(codes, werte):
+                quelle.protokolliere([(code, "Note", note, None)])
+        merke("sqlite_setze_note_x1000", sqlite_setze_noten)
+        merke("sqlite_kennzahlen", quelle.kennzahlen)
+        quelle.schliesse()
+
+    virtuell, aufraeumen, art = _baue_tabelle()
+    try:
+        def fuelle_und_scrolle():
+            virtuell.start = 0
+            virtuell.setze_zeilen(kurse)
+            for _ in range(100):
+                virtuell.scrolle(10)
+        merke(f"tabelle_fuellen_{art}", fuelle_und_scrolle)
+    finally:
+        aufraeumen()
+    return ergebnisse
+
+
+def laufe_kohorte(verzeichnis, studierende):
+    """
+    Misst die Kohorten-Auswertung über einen erzeugten Verzeichnisbaum.
+
+    :param verzeichnis: Verzeichnis für die erzeugten Datensätze
+    :param studierende: Anzahl Studierender
+    :return: Dict Name -> Messergebnis
+    """
+    from kohorte import schreibe_kursstatistik, schreibe_zusammenfassung
+    wurzel = erzeuge_kohorte(os.path.join(verzeichnis, f"kohorte-{studierende}"), studierende)
+    return {
+        f"kohorte/{studierende}": messe(lambda: schreibe_zusammenfassung(wurzel, os.devnull), 1),
+        f"kohorte_kurse/{studierende}": messe(lambda: schreibe_kursstatistik(wurzel, os.devnull), 1),
+    }
+
+
+PROJEKT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Startpfad der GUI bis unmittelbar vor dem Erzeugen des Fensters
+GUI_START = """
+import sys
+import view
+from datenquelle import CsvDatenquelle
+from service import StatistikAggregator
+quelle = CsvDatenquelle(sys.argv[1])
+quelle.lade_student()
+StatistikAggregator.aus_kursen(quelle.lade_kurse())
+"""
+
+
+def laufe_startzeit(verzeichnis, anzahl=10**2, wiederholungen=10):
+    """
+    Vergleicht die Startzeit des Kommandozeilen-Zugangs (python -m iu_dashboard stats)
+    mit dem Startpfad der GUI (Import von view/tkinter und Laden wie im Controller).
+    Gemessen wird jeweils ein kompletter neuer Python-Prozess.
+
+    :param verzeichnis: Verzeichnis für die erzeugten Datensätze
+    :param anzahl: Anzahl Kurse des verwendeten Datensatzes
+    :param wiederholungen: Anzahl Prozessstarts je Variante
+    :return: Dict Name -> Messergebnis
+    """
+    daten = os.path.dirname(erzeuge_datensatz(verzeichnis, anzahl))
+    befehle = {
+        f"start_cli/{anzahl}": [sys.executable, "-m", "iu_dashboard", "-d", daten, "stats"],
+        f"start_gui/{anzahl}": [sys.executable, "-c", GUI_START, daten],
+    }
+    return {
+        name: messe(lambda b=befehl: subprocess.run(b, cwd=PROJEKT, check=True,
+                                                     stdout=subprocess.DEVNULL), wiederholungen)
+        for name, befehl in befehle.items()
+    }
+
+
+def laufe(verzeichnis, groessen, kohorte=0, wiederholungen=None, startzeit=False):
+    """
+    Führt alle Benchmarks aus.
+
+    :param verzeichnis: Verzeichnis für die erzeugten Datensätze (wird wiederverwendet)
+    :param groessen: Datensatzgrößen (Anzahl Kurse)
+    :param kohorte: Anzahl Studierender für den Kohorten-Benchmark (0 = aus)
+    :param wiederholungen: Durchläufe je Messung oder None für den Standard
+    :param startzeit: True, um die Startzeit von CLI und GUI-Pfad zu vergleichen
+    :return: Ergebnis-Dict mit "meta" und "ergebnisse"
+    """
+    ergebnisse = {}
+    for anzahl in groessen:
+        ergebnisse.update(laufe_groesse(verzeichnis, anzahl, wiederholungen))
+    if kohorte:
+        ergebnisse.update(laufe_kohorte(verzeichnis, kohorte))
+    if startzeit:
+        ergebnisse.update(laufe_startzeit(verzeichnis))
+    return {
+        "meta": {
+            "zeitpunkt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "plattform": platform.platform(),
+        },
+        "ergebnisse": ergebnisse,
+    }
+
+
+def vergleiche(basis, neu, toleranz=0.10):
+    """
+    Vergleicht zwei Ergebnis-Dicts anhand der Minimalzeit.
+
+    :param basis: Gespeicherte Basis (Ergebnis von laufe)
+    :param neu: Neuer Lauf (Ergebnis von laufe)
+    :param toleranz: Erlaubte relative Verschlechterung, z. B. 0.10 für 10 %
+    :return: Liste von Tupeln (Name, Basis-Zeit, neue Zeit, Faktor, Regression?)
+    """
+    zeilen = []
+    for name, messung in neu["ergebnisse"].items():
+        alt = basis["ergebnisse"].get(name)
+        # Speichermessungen (ohne "min") sind keine Laufzeiten
+        if alt is None or "min" not in messung or "min" not in alt:
+            continue
+        faktor = messung["min"] / alt["min"] if alt["min"] > 0 else float("inf")
+        zeilen.append((name, alt["min"], messung["min"], faktor, faktor > 1 + toleranz))
+    return zeilen
@@ -1,5 +1,12 @@
-from model import StudentRepository, KursRepository
-from service import Service
+import copy
+
+from datenquelle import CsvDatenquelle
+from model import Kurs, NotenImportRepository
+from persistenz import SpeicherWorker, AenderungsWaechter
+from planer import SemesterPlaner
+from service import Service, StatistikAggregator, StatistikCache
+from sortierung import SortierIndex
+from suche import SuchIndex
 
 class Controller:
     """
@@ -8,16 +15,36 @@ class Controller:
     erstellt die View und aktualisiert diese bei Änderungen.
     """
 
-    def __init__(self):
+    def __init__(self, datenquelle=None, journal=True):
         """
-        Lädt beim Programmstart den/die Student(en) und Kurse aus CSV-Dateien,
+        Lädt beim Programmstart den/die Student(en) und Kurse aus der Datenquelle,
         berechnet den anfänglichen ECTS-Stand sowie den Notendurchschnitt.
         Initialisiert dann die View, übergibt relevante Daten und zeigt sie an.
+
+        :param datenquelle: Datenquelle (Standard: CSV-Dateien im Ordner "CSV")
+        :param journal: Nur für die Standard-Datenquelle: True, um Kursänderungen
+                        an ein Journal neben der CSV anzuhängen statt die CSV
+                        jedes Mal neu zu schreiben
         """
-        self.student = StudentRepository.lade_student("CSV/student.csv")
-        self.kurse = KursRepository.lade_kurse("CSV/kurse.csv")
-        self.ects = Service.berechne_ects(self.kurse)
-        self.durchschnitt = Service.berechne_durchschnitt(self.kurse)
+        self.datenquelle = datenquelle or CsvDatenquelle(journal=journal)
+        self.student = self.datenquelle.lade_student()
+        self.kurse = self.datenquelle.lade_kurse()
+        # Laufende Summen, damit Änderungen nicht die ganze Kursliste neu berechnen
+        self.statistik = StatistikAggregator.aus_kursen(self.kurse)
+        self.ects = self.statistik.ects
+        self.durchschnitt = self.statistik.durchschnitt
+        # Weitere Kennzahlen (Fortschritt, Statuszählung) für Export und Debug-Panel,
+        # zwischengespeichert bis zur nächsten Änderung der Kursliste
+        self.kennzahlen = StatistikCache(self.kurse, self.student)
+        # Präfix-Index für das Suchfeld (wird bei der ersten Suche aufgebaut)
+        self.suche = SuchIndex(self.kurse)
+        # Zwischengespeicherte Sortierung je Tabellenspalte (beim ersten Sortieren angelegt)
+        self.sortierung = SortierIndex(self.kurse)
+        # Schreibt im Hintergrund, damit die GUI beim Speichern nicht einfriert
+        self.speicher = SpeicherWorker()
+        # Erkennt Änderungen anderer Programme; _stand zählt eigene Kursänderungen
+        self.waechter = AenderungsWaechter(self.datenquelle, self.kurse)
+        self._stand = 0
 
         # Import der View hier, um Zirkularimporte zu vermeiden
         from view import View
@@ -27,8 +54,103 @@ class Controller:
         """
         Startet die Haupt-Ereignisschleife der GUI,
         sodass Benutzerinteraktionen verarbeitet werden können.
+        Nach dem Schließen werden noch ausstehende Speichervorgänge abgeschlossen.
+        """
+        try:
+            self.view.mainloop()
+        finally:
+            self._schreibe_ausstehende()
+
+    def beenden(self):
+        """
+        Schreibt alle ausstehenden Änderungen und schließt danach das Fenster.
+        Wird vom Schließen-Button der Titelzeile aufgerufen.
+        """
+        try:
+            self._schreibe_ausstehende()
+        finally:
+            self.view.destroy()
+
+    def _schreibe_ausstehende(self):
+        """
+        Wartet auf den Speicher-Worker, übernimmt ein nicht leeres Journal in
+        den Bestand (kurse.csv enthält danach wieder den aktuellen Stand für
+        andere Programme) und schließt danach die Datenquelle.
         """
-        self.view.mainloop()
+        self.speicher.beenden()
+        try:
+            if self.datenquelle.muss_verdichten(vollstaendig=True):
+                self.datenquelle.verdichte([copy.copy(k) for k in self.kurse])
+        finally:
+            self.datenquelle.schliesse()
+
+    def aktualisiere_kurs(self, kurscode, neuer_kurscode=None, neuer_name=None,
+                          neue_ects=None, neue_note=None):
+        """
+        Ändert mehrere Felder eines Kurses als eine Einheit.
+        Zuerst werden alle übergebenen Werte geprüft; nur wenn alle gültig sind,
+        werden sie übernommen. Danach wird die CSV genau einmal geschrieben und
+        die View genau einmal aktualisiert. Ist ein Wert ungültig, bleibt der
+        Kurs vollständig unverändert.
+
+        Felder mit dem Wert None werden nicht verändert.
+
+        :param kurscode: Aktueller Code des zu ändernden Kurses
+        :param neuer_kurscode: Neuer Code (ohne führende/folgende Leerzeichen
+                               nicht leer und noch nicht vergeben)
+        :param neuer_name: Neuer Kursname
+        :param neue_ects: ECTS-Angabe als String oder int (1 bis MAX_ECTS)
+        :param neue_note: Benutzereingabe für die Note (z.B. "2.3", "A", "-")
+        :return: True, wenn alle Änderungen übernommen wurden, False, wenn
+                 es keinen Kurs mit diesem Code gibt
+        :raises ValueError: wenn ein Wert ungültig ist (der Kurs bleibt unverändert)
+        """
+        k = self.kurse.finde(kurscode)
+        if k is None:
+            return False
+
+        # 1. Prüfen, ohne den Kurs anzufassen
+        if neuer_kurscode is not None:
+            neuer_kurscode = neuer_kurscode.strip()
+            if not neuer_kurscode:
+                raise ValueError("Der Kurscode darf nicht leer sein")
+            if neuer_kurscode != kurscode and neuer_kurscode in self.kurse:
+                raise ValueError(f"Kurscode '{neuer_kurscode}' ist bereits vergeben")
+        ects = k.ects
+        if neue_ects is not None:
+            ects = Kurs.pruefe_ects(neue_ects)
+        note = k.note
+        if neue_note is not None:
+            ok, note = Service.pruefe_note(neue_note)
+            if not ok:
+                raise ValueError(f"Ungültige Note {neue_note!r}: erlaubt sind 1 bis 5, 'A' oder '-'")
+
+        # 2. Übernehmen (kann nach der Prüfung nicht mehr fehlschlagen)
+        aenderungen = []
+        if neuer_kurscode is not None and neuer_kurscode != kurscode:
+            self.kurse.aendere_kurscode(kurscode, neuer_kurscode)
+            aenderungen.append((kurscode, "Kurscode", neuer_kurscode, kurscode))
+        if neuer_name is not None and neuer_name != k.name:
+            aenderungen.append((k.kurscode, "Kursname", neuer_name, k.name))
+            k.name = neuer_name
+        if ects != k.ects or note != k.note:
+            self.statistik.entfernen(k.ects, k.note)
+            if ects != k.ects:
+                aenderungen.append((k.kurscode, "ECTS", ects, k.ects))
+            if note != k.note:
+                aenderungen.append((k.kurscode, "Note", note, k.note))
+            k.ects, k.note = ects, note
+            self.statistik.hinzufuegen(k.ects, k.note)
+
+        # 3. Einmal speichern, einmal neu zeichnen
+        if aenderungen:
+            self._stand += 1
+            self.kurse.markiere_geaendert()
+            self.suche.aktualisiere(k)
+            self.sortierung.aktualisiere(k)
+        self._speichere_kurse(aenderungen)
+        self._update_stats(geaenderte_kurse=[k] if aenderungen else [])
+        return True
 
     def aktualisiere_note(self, kurscode, raw_input):
         """
@@ -40,11 +162,49 @@ class Controller:
         :param raw_input: Benutzereingabe für die Note (z.B. "2.3", "A", "-")
         :return: True, wenn die Note erfolgreich gesetzt wurde, sonst False
         """
-        ok = Service.setze_note(self.kurse, kurscode, raw_input)
-        if ok:
-            KursRepository.speichere_kurse("CSV/kurse.csv", self.kurse)
-            self._update_stats()
-        return ok
+        return self._aktualisiere_feld(kurscode, neue_note=raw_input)
+
+    def _aktualisiere_feld(self, kurscode, **felder):
+        """
+        Ändert einzelne Felder über aktualisiere_kurs und meldet ungültige
+        Werte wie die Einzelmethoden als False statt als ValueError.
+        """
+        try:
+            return self.aktualisiere_kurs(kurscode, **felder)
+        except ValueError:
+            return False
+
+    def importiere_noten(self, dateipfad):
+        """
+        Übernimmt viele Noten auf einmal aus einer CSV- oder JSON-Datei
+        (siehe NotenImportRepository). Alle Einträge werden wie bei
+        aktualisiere_note geprüft; ungültige werden übersprungen und gemeldet.
+        Die gültigen Noten werden in einem Durchlauf übernommen, danach wird
+        genau einmal gespeichert und die View genau einmal aktualisiert.
+
+        :param dateipfad: Pfad zur Importdatei
+        :return: Tupel (Anzahl geänderter Kurse, abgelehnte Einträge als Liste
+                 von Tupeln (Zeile, Kurscode, Note als Text, Grund))
+        :raises ValueError: wenn die Datei nicht das erwartete Format hat
+        """
+        gueltig, abgelehnt = Service.pruefe_noten(self.kurse, NotenImportRepository.lade(dateipfad))
+
+        aenderungen = []
+        geaendert = []
+        for k, note in gueltig:
+            if note != k.note:
+                self.statistik.aendere_note(k.ects, k.note, note)
+                aenderungen.append((k.kurscode, "Note", note, k.note))
+                k.note = note
+                geaendert.append(k)
+
+        if aenderungen:
+            self._stand += 1
+            self.kurse.markiere_geaendert()
+            self.sortierung.aktualisiere_viele(geaendert)
+            self._speichere_kurse(aenderungen)
+            self._update_stats(geaenderte_kurse=geaendert)
+        return len(geaendert), abgelehnt
 
     def aktualisiere_kursname(self, kurscode, neuer_name):
         """
@@ -55,13 +215,7 @@ class Controller:
         :param neuer_name: Neuer Name (z.B. "Mathematik I")
         :return: True, wenn gefunden und Name geändert, sonst False
         """
-        for k in self.kurse:
-            if k.kurscode == kurscode:
-                k.name = neuer_name
-                KursRepository.speichere_kurse("CSV/kurse.csv", self.kurse)
-                self._update_stats()
-                return True
-        return False
+        return self._aktualisiere_feld(kurscode, neuer_name=neuer_name)
 
     def aktualisiere_kurscode(self, alter_kurscode, neuer_kurscode):
         """
@@ -71,14 +225,9 @@ class Controller:
         :param alter_kurscode: Bisheriger Code
         :param neuer_kurscode: Neuer Code, z.B. "PROG02"
         :return: True, wenn der Kurscode aktualisiert wurde, sonst False
+                 (auch wenn der neue Code bereits vergeben ist)
         """
-        for k in self.kurse:
-            if k.kurscode == alter_kurscode:
-                k.kurscode = neuer_kurscode
-                KursRepository.speichere_kurse("CSV/kurse.csv", self.kurse)
-                self._update_stats()
-                return True
-        return False
+        return self._aktualisiere_feld(alter_kurscode, neuer_kurscode=neuer_kurscode)
 
     def aktualisiere_kurs_ects(self, kurscode, neuer_ects):
         """
@@ -89,21 +238,12 @@ class Controller:
         :param neuer_ects: ECTS-Angabe als String (wird in int konvertiert)
         :return: True, wenn ECTS erfolgreich geändert; False, wenn Konvertierung fehlschlug
         """
-        for k in self.kurse:
-            if k.kurscode == kurscode:
-                try:
-                    k.ects = int(neuer_ects)
-                except ValueError:
-                    return False
-                KursRepository.speichere_kurse("CSV/kurse.csv", self.kurse)
-                self._update_stats()
-                return True
-        return False
+        return self._aktualisiere_feld(kurscode, neue_ects=neuer_ects)
 
     def aktualisiere_student(self, name, studiengang, ziel_ects):
         """
         Ändert die Basisdaten des Studierenden (Name, Studiengang, Ziel-ECTS).
-        Aktualisiert danach die CSV-Datei und ruft _update_stats() auf.
+        Speichert sie danach in der Datenquelle und ruft _update_stats() auf.
 
         :param name: Neuer Name des Studenten
         :param studiengang: Neuer Studiengang
@@ -112,20 +252,217 @@ class Controller:
         self.student.name = name
         self.student.studiengang = studiengang
         self.student.ziel_ects = ziel_ects
-        StudentRepository.speichere_student("CSV/student.csv", self.student)
-        self._update_stats()
+        self.speicher.ersetze(
+            "student",
+            self.datenquelle.speichere_student,
+            copy.copy(self.student)
+        )
+        self._update_stats(geaenderte_kurse=[], student_geaendert=True)
+
+    def _speichere_kurse(self, aenderungen):
+        """
+        Übergibt Kursänderungen an den Speicher-Worker. Speichert die Datenquelle
+        inkrementell (Journal, SQLite), werden nur die Änderungen übergeben (und
+        bei Bedarf verdichtet), sonst wird ein Snapshot aller Kurse geschrieben.
+
+        :param aenderungen: Liste von Tupeln (Kurscode, Feld, Wert, bisheriger Wert)
+        """
+        quelle = self.datenquelle
+        if not quelle.inkrementell:
+            self.speicher.ersetze(
+                "kurse",
+                quelle.speichere_kurse,
+                [copy.copy(k) for k in self.kurse]
+            )
+            return
+        if not aenderungen:
+            return
+        self.speicher.haenge_an("aenderungen", quelle.protokolliere, aenderungen)
+        if not self.speicher.ist_ausstehend("verdichtung") and quelle.muss_verdichten():
+            # Der Snapshot entsteht hier im GUI-Thread, passend zu den bisher eingereihten Einträgen
+            self.speicher.ersetze(
+                "verdichtung",
+                quelle.verdichte,
+                [copy.copy(k) for k in self.kurse]
+            )
 
-    def _update_stats(self):
+    def suche_kurse(self, text):
         """
-        Aktualisiert die globalen Statistiken (ECTS-Summe, Durchschnitt)
-        und weist die View an, ihre Darstellung ebenfalls zu erneuern.
+        Sucht Kurse, deren Kurscode oder Kursname zur Eingabe passt
+        (jedes Wort als Wortanfang, ohne Groß-/Kleinschreibung).
+
+        :param text: Inhalt des Suchfelds
+        :return: Suchtreffer (passende Kurse in Listenreihenfolge, erst bei
+                 Zugriff ausgewertet) oder None für "alle"
+        """
+        return self.suche.suche(text)
+
+    def sortiere_kurse(self, spalte, absteigend=False, auswahl=None):
+        """
+        Liefert die Kurse nach einer Tabellenspalte sortiert. Noten werden
+        aufsteigend als Zahl sortiert, danach folgen "A" und "-".
+
+        :param spalte: "Kurscode", "Kursname", "ECTS" oder "Note"
+        :param absteigend: True für absteigende Reihenfolge
+        :param auswahl: Teilmenge der Kurse (z. B. Suchtreffer) oder None für alle
+        :return: Indizierbare Folge von Kursen
+        """
+        return self.sortierung.folge(spalte, absteigend, auswahl)
+
+    def plane_noten(self, ziel):
+        """
+        Berechnet für einen Ziel-Durchschnitt, welche Noten in den offenen
+        Modulen noch nötig sind. Der NotenPlaner wird nur nach Änderungen der
+        Kursliste neu angelegt, sodass die Abfrage bei jeder Eingabe laufen kann.
+
+        :param ziel: Ziel-Durchschnitt (float)
+        :return: Tupel (NotenPlaner, benötigter Durchschnitt über alle offenen
+                 ECTS oder None, Liste von Paaren (offener Kurs, schlechteste
+                 noch mögliche Note oder None))
+        """
+        planer = self.kennzahlen.notenplaner
+        return (planer, planer.benoetigter_durchschnitt(ziel),
+                list(zip(planer.offene, planer.schlechteste_noten(ziel))))
+
+    def plane_semester(self, max_ects, max_semester=None, gewichte=None):
+        """
+        Plant die offenen Kurse auf die nächsten Semester, bis die Ziel-ECTS
+        des Studierenden erreicht sind (siehe SemesterPlaner).
+
+        :param max_ects: Höchstens belegbare ECTS je Semester
+        :param max_semester: Höchstens zu planende Semester oder None
+        :param gewichte: Dict Kurscode -> Gewicht (größer = lieber früher) oder None
+        :return: Tupel (SemesterPlaner, Liste von Kurslisten je Semester, erreicht)
+        :raises ValueError: wenn max_ects nicht positiv ist
+        """
+        planer = SemesterPlaner(self.kurse, self.student.ziel_ects, max_ects, gewichte)
+        return (planer, *planer.plane(max_semester))
+
+    def pruefe_externe_aenderungen(self):
         """
-        self.ects = Service.berechne_ects(self.kurse)
-        self.durchschnitt = Service.berechne_durchschnitt(self.kurse)
-        self.view.update_student_info(self.student, self.ects, self.durchschnitt)
+        Wird von der View regelmäßig aufgerufen. Übernimmt ein fertig geladenes
+        Ergebnis des AenderungsWaechters oder stößt bei einer erkannten externen
+        Änderung das Neuladen im Hintergrund an.
+
+        Solange noch eigene Änderungen auf das Schreiben warten, wird nicht
+        neu geladen, da der gelesene Stand sie sonst noch nicht enthielte.
+        Hat der Benutzer während des Ladens etwas geändert, wird das Ergebnis
+        verworfen und erneut geladen.
+
+        :return: Fehler beim Neuladen oder None
+        """
+        ergebnis = self.waechter.abholen()
+        untaetig = self.speicher.flush(timeout=0)
+        if ergebnis is not None:
+            stand, unterschiede, fehler = ergebnis
+            if fehler is not None:
+                return fehler
+            if stand == self._stand and untaetig:
+                self._uebernimm_unterschiede(*unterschiede)
+            else:
+                self.waechter.wiederhole()
+        elif untaetig:
+            self.waechter.pruefe(self._stand)
+        return None
+
+    def _uebernimm_unterschiede(self, hinzugefuegt, entfernt, geaendert):
+        """
+        Wendet extern geänderte Kurse an: Nur die betroffenen Kurse, die
+        laufenden Summen und die Tabellenzeilen werden angepasst.
+
+        :param hinzugefuegt: Neue Kurse
+        :param entfernt: Nicht mehr vorhandene Kurse
+        :param geaendert: Paare (Kurs im Speicher, neu geladener Kurs)
+        """
+        if not (hinzugefuegt or entfernt or geaendert):
+            return
+        self.kurse.entferne_viele([k.kurscode for k in entfernt])
+        for k in entfernt:
+            self.suche.entfernen(k)
+            self.sortierung.entfernen(k)
+            self.statistik.entfernen(k.ects, k.note)
+        for k in hinzugefuegt:
+            self.kurse.anhaengen(k)
+            self.suche.hinzufuegen(k)
+            self.sortierung.hinzufuegen(k)
+            self.statistik.hinzufuegen(k.ects, k.note)
+        for k, neu in geaendert:
+            self.statistik.entfernen(k.ects, k.note)
+            if k.name != neu.name:
+                k.name = neu.name
+                self.suche.aktualisiere(k)
+            k.ects, k.note = neu.ects, neu.note
+            self.sortierung.aktualisiere(k)
+            self.statistik.hinzufuegen(k.ects, k.note)
+        if geaendert:
+            self.kurse.markiere_geaendert()
+        # Die Journal-Einträge beziehen sich auf die alte Basis-CSV; extern
+        # überholte wurden beim Laden übersprungen. Gleich verdichten, damit
+        # sie nicht später über einer wieder passenden Basis erneut greifen.
+        if self.datenquelle.muss_verdichten(vollstaendig=True):
+            self.speicher.ersetze(
+                "verdichtung",
+                self.datenquelle.verdichte,
+                [copy.copy(k) for k in self.kurse]
+            )
+        self._update_stats(geaenderte_kurse=[k for k, _ in geaendert],
+                           zeilen_geaendert=bool(hinzugefuegt or entfernt))
+
+    def _update_stats(self, geaenderte_kurse=None, student_geaendert=False, zeilen_geaendert=False):
+        """
+        Übernimmt die globalen Statistiken (ECTS-Summe, Durchschnitt) aus den
+        laufenden Summen des StatistikAggregators und weist die View an,
+        ihre Darstellung ebenfalls zu erneuern. Dabei wird mitgeteilt, welche
+        Kurse und welche Kennzahlen sich geändert haben, damit die View nur
+        diese neu zeichnet.
+
+        :param geaenderte_kurse: Liste geänderter Kurs-Objekte; None = unbekannt (alles)
+        :param student_geaendert: True, wenn sich die Studierendendaten geändert haben
+        :param zeilen_geaendert: True, wenn Kurse hinzugekommen oder entfernt wurden
+        """
+        geaenderte_stats = {"student"} if student_geaendert else set()
+        if self.statistik.ects != self.ects:
+            geaenderte_stats.add("ects")
+        if self.statistik.durchschnitt != self.durchschnitt:
+            geaenderte_stats.add("durchschnitt")
+        self.ects = self.statistik.ects
+        self.durchschnitt = self.statistik.durchschnitt
+        if geaenderte_kurse is None:
+            geaenderte_stats = None
+        self.view.update_student_info(self.student, self.ects, self.durchschnitt,
+                                      geaenderte_kurse, geaenderte_stats, zeilen_geaendert)
 
 
 if __name__ == "__main__":
+    import argparse
+    import os
+    import instrumentierung
+    from datenquelle import SqliteDatenquelle
+
+    parser = argparse.ArgumentParser(description="IU Progress Tracker")
+    parser.add_argument(
+        "--profil", nargs="?", const=instrumentierung.STANDARD_AUSGABE, default=None,
+        metavar="JSON",
+        help="Laufzeiten von Controller, Repositories und View messen und beim Beenden "
+             "als JSON schreiben (alternativ: Umgebungsvariable IU_DASHBOARD_PROFIL)"
+    )
+    parser.add_argument(
+        "--datenbank", metavar="DB", default=None,
+        help="SQLite-Datenbank statt der CSV-Dateien verwenden; existiert sie noch "
+             "nicht, wird sie einmalig aus dem Ordner CSV angelegt"
+    )
+    args = parser.parse_args()
+    profil = args.profil or instrumentierung.aus_umgebung()
+    if profil:
+        instrumentierung.aktiviere(Controller, profil)
+
+    datenquelle = None
+    if args.datenbank:
+        if os.path.exists(args.datenbank):
+            datenquelle = SqliteDatenquelle(args.datenbank)
+        else:
+            datenquelle = SqliteDatenquelle.aus_csv(args.datenbank)
+
     # Falls die Datei direkt ausgeführt wird, starten wir den Controller
-    c = Controller()
+    c = Controller(datenquelle)
     c.start()
@@ -0,0 +1,399 @@
+import os
+import threading
+
+from model import Student, Kurs, KursListe, KursTabelle, StudentRepository, KursRepository, KursJournal
+from service import Service
+
+STANDARD_VERZEICHNIS = "CSV"
+
+
+class ExterneAenderung(Exception):
+    """
+    Die Daten wurden seit dem letzten Laden von einem anderen Programm geändert;
+    ein vollständiges Überschreiben würde diese Änderungen verwerfen.
+    """
+
+
+def _datei_kennung(pfad):
+    """
+    :return: (Änderungszeit in ns, Größe) der Datei oder None, wenn sie fehlt
+    """
+    try:
+        st = os.stat(pfad)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class Datenquelle:
+    """
+    Schnittstelle für die Speicherung von Student und Kursen.
+    Controller und Kommandozeile arbeiten nur gegen diese Methoden, sodass
+    das Speicherformat (CSV-Dateien oder SQLite-Datenbank) austauschbar ist.
+
+    Ist inkrementell True, genügt es, Änderungen über protokolliere() zu
+    melden; sonst muss nach jeder Änderung speichere_kurse() mit dem
+    vollständigen Bestand aufgerufen werden.
+
+    Über kennung() lässt sich erkennen, ob ein anderes Programm die Daten
+    seit dem letzten lade_kurse() geändert hat (siehe fremd_geaendert()).
+    """
+    inkrementell = False
+    _bekannte_kennung = None
+
+    def lade_student(self):
+        """
+        :return: Student-Objekt oder None, wenn keiner gespeichert ist
+        """
+        raise NotImplementedError
+
+    def speichere_student(self, student):
+        """
+        :param student: Student-Objekt, das gespeichert werden soll
+        """
+        raise NotImplementedError
+
+    def lade_kurse(self, tabelle=False):
+        """
+        :param tabelle: True für eine speichersparende KursTabelle statt einer KursListe
+        :return: KursListe bzw. KursTabelle mit dem aktuellen Stand
+        """
+        raise NotImplementedError
+
+    def speichere_kurse(self, kurse):
+        """
+        Schreibt den vollständigen Kursbestand.
+
+        :param kurse: Iterable von Kurs-Objekten
+        """
+        raise NotImplementedError
+
+    def protokolliere(self, aenderungen):
+        """
+        Speichert einzelne Änderungen (nur bei inkrementell == True).
+
+        :param aenderungen: Liste von Tupeln (Kurscode, Feld, Wert, bisheriger Wert)
+                            wie bei KursJournal
+        """
+        raise NotImplementedError
+
+    def muss_verdichten(self, vollstaendig=False):
+        """
+        :param vollstaendig: True, um schon bei jeder gesammelten Änderung zu
+                             verdichten (z. B. beim Beenden), damit andere
+                             Programme den aktuellen Stand lesen
+        :return: True, wenn die gesammelten Änderungen in den Bestand übernommen werden sollten
+        """
+        return False
+
+    def verdichte(self, kurse):
+        """
+        Übernimmt die gesammelten Änderungen in den Bestand.
+
+        :param kurse: Snapshot des vollständigen Kursbestands
+        """
+
+    def kennung(self):
+        """
+        Liefert eine Kennung des gespeicherten Kursstands, die sich bei jeder
+        Änderung von außen ändert (z. B. Änderungszeit und Größe der Datei).
+
+        :return: Vergleichbarer Wert oder None, wenn keine Überwachung möglich ist
+        """
+        return None
+
+    def fremd_geaendert(self):
+        """
+        :return: True, wenn die Kurse seit dem letzten Laden von einem anderen
+                 Programm geändert wurden (eigene Schreibvorgänge zählen nicht)
+        """
+        kennung = self.kennung()
+        return kennung is not None and kennung != self._bekannte_kennung
+
+    def finde_kurs(self, kurscode):
+        """
+        :param kurscode: Gesuchter Kurscode
+        :return: Kurs (bzw. KursZeile) oder None
+        """
+        return self.lade_kurse(tabelle=True).finde(kurscode)
+
+    def kennzahlen(self):
+        """
+        Berechnet die Kennzahlen über alle Kurse.
+
+        :return: Dict mit ects, durchschnitt, benotet, angerechnet, offen
+        """
+        kurse = self.lade_kurse(tabelle=True)
+        return {
+            "ects": Service.berechne_ects(kurse),
+            "durchschnitt": Service.berechne_durchschnitt(kurse),
+            **Service.zaehle_status(kurse),
+        }
+
+    def schliesse(self):
+        """
+        Schließt offene Ressourcen und wartet auf laufende Hintergrundarbeit.
+        """
+
+
+class CsvDatenquelle(Datenquelle):
+    """
+    Speicherung in student.csv und kurse.csv eines Verzeichnisses, wahlweise
+    mit Änderungsjournal (siehe KursJournal) und binärem SnapshotCache.
+    """
+
+    def __init__(self, verzeichnis=STANDARD_VERZEICHNIS, journal=True, cache=True):
+        """
+        :param verzeichnis: Ordner mit student.csv und kurse.csv
+        :param journal: True, um Kursänderungen an ein Journal anzuhängen
+                        statt die CSV jedes Mal neu zu schreiben
+        :param cache: True, um den SnapshotCache beim Laden zu nutzen
+        """
+        self.verzeichnis = verzeichnis
+        self.student_pfad = os.path.join(verzeichnis, "student.csv")
+        self.kurse_pfad = os.path.join(verzeichnis, "kurse.csv")
+        self.journal = KursJournal(self.kurse_pfad) if journal else None
+        self.inkrementell = self.journal is not None
+        self.cache = cache
+        self._sperre = threading.Lock()
+
+    def lade_student(self):
+        return StudentRepository.lade_student(self.student_pfad, cache=self.cache)
+
+    def speichere_student(self, student):
+        StudentRepository.speichere_student(self.student_pfad, student)
+
+    def lade_kurse(self, tabelle=False):
+        # Kennung vor dem Lesen bestimmen: Eine Änderung währenddessen fällt so später auf
+        kennung = self.kennung()
+        if tabelle:
+            kurse = KursRepository.lade_kurstabelle(self.kurse_pfad, cache=self.cache)
+            if self.journal is not None:
+                self.journal.wiedergeben(kurse)
+        elif self.journal is not None:
+            kurse = self.journal.lade_kurse(cache=self.cache)
+        else:
+            kurse = KursRepository.lade_kurse(self.kurse_pfad, cache=self.cache)
+        with self._sperre:
+            self._bekannte_kennung = kennung
+        return kurse
+
+    def speichere_kurse(self, kurse):
+        """
+        :raises ExterneAenderung: wenn kurse.csv seit dem Laden von außen geändert wurde
+        """
+        self._schreibe(KursRepository.speichere_kurse, self.kurse_pfad, kurse, ueberschreibt=True)
+
+    def protokolliere(self, aenderungen):
+        self._schreibe(self.journal.protokolliere, aenderungen)
+
+    def muss_verdichten(self, vollstaendig=False):
+        if self.journal is None:
+            return False
+        if vollstaendig:
+            return not self.journal.ist_leer()
+        return self.journal.muss_verdichten()
+
+    def verdichte(self, kurse):
+        """
+        Verdichtet das Journal. Wurde kurse.csv von außen geändert, wird die
+        Verdichtung übersprungen, bis die Änderung eingelesen ist; das Journal
+        bleibt bis dahin vollständig erhalten.
+        """
+        try:
+            self._schreibe(self.journal.verdichte, kurse, False, ueberschreibt=True)
+        except ExterneAenderung:
+            pass
+
+    def kennung(self):
+        return (_datei_kennung(self.kurse_pfad),
+                _datei_kennung(self.journal.pfad) if self.journal is not None else None)
+
+    def _schreibe(self, funktion, *args, ueberschreibt=False):
+        """
+        Führt einen eigenen Schreibvorgang aus und merkt sich danach die neue
+        Kennung, damit er nicht als externe Änderung gilt. Hatte sich die Kennung
+        schon vorher geändert, bleibt die alte stehen, damit die externe
+        Änderung trotzdem erkannt wird.
+
+        :param ueberschreibt: True, wenn der Vorgang kurse.csv komplett neu schreibt
+        :raises ExterneAenderung: wenn ueberschreibt gesetzt ist und die Daten
+                                  von außen geändert wurden
+        """
+        with self._sperre:
+            fremd = self._bekannte_kennung is not None and self.kennung() != self._bekannte_kennung
+            if fremd and ueberschreibt:
+                raise ExterneAenderung(f"{self.kurse_pfad} wurde von einem anderen Programm geändert")
+            funktion(*args)
+            if not fremd:
+                self._bekannte_kennung = self.kennung()
+
+    def schliesse(self):
+        if self.journal is not None:
+            self.journal.warte()
+
+
+class SqliteDatenquelle(Datenquelle):
+    """
+    Speicherung in einer SQLite-Datenbank. Der Kurscode ist eindeutig
+    indiziert, eine Notenänderung ist ein einzelnes UPDATE, und ECTS-Summe,
+    Durchschnitt und Statuszählung werden per SQL-Aggregat berechnet, ohne
+    die Kurse nach Python zu laden.
+
+    Die Verbindung wird von GUI-Thread und Speicher-Worker gemeinsam genutzt
+    und ist daher durch eine Sperre geschützt. Änderungen anderer Programme
+    erkennt kennung() über PRAGMA data_version, das sich nur bei Commits
+    anderer Verbindungen ändert.
+    """
+    inkrementell = True
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS student (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            name TEXT NOT NULL,
+            studiengang TEXT NOT NULL,
+            ziel_ects INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS kurse (
+            id INTEGER PRIMARY KEY,
+            kurscode TEXT NOT NULL,
+            name TEXT NOT NULL,
+            ects INTEGER NOT NULL,
+            note REAL
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS kurse_kurscode ON kurse (kurscode);
+    """
+    # Feldname aus KursJournal.FELDER -> Spalte
+    SPALTEN = {"Kurscode": "kurscode", "Kursname": "name", "ECTS": "ects", "Note": "note"}
+
+    def __init__(self, pfad):
+        """
+        Öffnet (bzw. erzeugt) die Datenbank und legt fehlende Tabellen an.
+
+        :param pfad: Pfad der Datenbankdatei, z. B. "CSV/iu-dashboard.db"
+        """
+        # Erst hier importieren: CSV-Befehle der Kommandozeile sparen so den Import
+        import sqlite3
+        self.pfad = pfad
+        self._sperre = threading.Lock()
+        self._db = sqlite3.connect(pfad, check_same_thread=False)
+        # WAL: Ein UPDATE schreibt nur wenige Seiten ins Log statt die Datei umzuschreiben
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(self.SCHEMA)
+
+    @classmethod
+    def aus_csv(cls, pfad, verzeichnis=STANDARD_VERZEICHNIS):
+        """
+        Einmalige Migration: Übernimmt Student und Kurse (inkl. Journal) aus
+        den CSV-Dateien eines Verzeichnisses in die Datenbank. Vorhandene
+        Daten in der Datenbank werden ersetzt.
+
+        :param pfad: Pfad der Datenbankdatei
+        :param verzeichnis: Ordner mit student.csv und kurse.csv
+        :return: SqliteDatenquelle auf der befüllten Datenbank
+        """
+        csv_quelle = CsvDatenquelle(verzeichnis, cache=False)
+        quelle = cls(pfad)
+        student = csv_quelle.lade_student()
+        if student is not None:
+            quelle.speichere_student(student)
+        quelle.speichere_kurse(csv_quelle.lade_kurse(tabelle=True))
+        return quelle
+
+    def lade_student(self):
+        with self._sperre:
+            zeile = self._db.execute(
+                "SELECT name, studiengang, ziel_ects FROM student WHERE id = 1"
+            ).fetchone()
+        return Student(*zeile) if zeile else None
+
+    def speichere_student(self, student):
+        with self._sperre, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO student (id, name, studiengang, ziel_ects) VALUES (1, ?, ?, ?)",
+                (student.name, student.studiengang, student.ziel_ects)
+            )
+
+    def lade_kurse(self, tabelle=False):
+        with self._sperre:
+            self._bekannte_kennung = self._db.execute("PRAGMA data_version").fetchone()[0]
+            zeilen = self._db.execute("SELECT kurscode, name, ects, note FROM kurse ORDER BY id").fetchall()
+        if tabelle:
+            kurse = KursTabelle()
+            for zeile in zeilen:
+                kurse.anhaengen_werte(*zeile)
+            return kurse
+        kurse = KursListe()
+        for kurscode, name, ects, note in zeilen:
+            k = Kurs(kurscode, name, ects)
+            k.note = note
+            kurse.anhaengen(k)
+        return kurse
+
+    def speichere_kurse(self, kurse):
+        with self._sperre, self._db:
+            self._db.execute("DELETE FROM kurse")
+            self._db.executemany(
+                "INSERT INTO kurse (kurscode, name, ects, note) VALUES (?, ?, ?, ?)",
+                ((k.kurscode, k.name, k.ects, k.note) for k in kurse)
+            )
+
+    def protokolliere(self, aenderungen):
+        """
+        Schreibt die Änderungen als UPDATEs einzelner Zeilen in einer Transaktion.
+        Änderungen an unbekannten Kursen werden (wie im Journal) übergangen.
+        Der bisherige Wert wird nicht gebraucht, da fremde Schreiber direkt in
+        die Datenbank schreiben und nichts nachträglich wiedergegeben wird.
+        """
+        with self._sperre, self._db:
+            for kurscode, feld, wert, _ in aenderungen:
+                self._db.execute(
+                    f"UPDATE kurse SET {self.SPALTEN[feld]} = ? WHERE kurscode = ?",
+                    (wert, kurscode)
+                )
+
+    def kennung(self):
+        with self._sperre:
+            return self._db.execute("PRAGMA data_version").fetchone()[0]
+
+    def finde_kurs(self, kurscode):
+        with self._sperre:
+            zeile = self._db.execute(
+                "SELECT name, ects, note FROM kurse WHERE kurscode = ?", (kurscode,)
+            ).fetchone()
+        if zeile is None:
+            return None
+        k = Kurs(kurscode, zeile[0], zeile[1])
+        k.note = zeile[2]
+        return k
+
+    def kennzahlen(self):
+        """
+        Berechnet alle Kennzahlen mit einer Aggregat-Abfrage; für den
+        Durchschnitt liefert SQLite nur die gruppierten (Note, ECTS)-Paare.
+        """
+        with self._sperre:
+            ects, benotet, angerechnet, anzahl = self._db.execute("""
+                SELECT COALESCE(SUM(CASE WHEN note IS NOT NULL THEN ects END), 0),
+                       COUNT(CASE WHEN note > 0 THEN 1 END),
+                       COUNT(CASE WHEN note = 0 THEN 1 END),
+                       COUNT(*)
+                FROM kurse
+            """).fetchone()
+            # SQL summiert nur in Fließkomma; die wenigen verschiedenen
+            # (Note, ECTS)-Paare werden exakt wie im Service aufsummiert
+            gruppen = self._db.execute(
+                "SELECT note, ects, COUNT(*) FROM kurse WHERE note > 0 GROUP BY note, ects"
+            ).fetchall()
+        return {
+            "ects": ects,
+            "durchschnitt": Service.durchschnitt_aus_gruppen(gruppen),
+            "benotet": benotet,
+            "angerechnet": angerechnet,
+            "offen": anzahl - benotet - angerechnet,
+        }
+
+    def schliesse(self):
+        with self._sperre:
+            self._db.close()
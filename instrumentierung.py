@@ -0,0 +1,214 @@
+import atexit
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+
+UMGEBUNGSVARIABLE = "IU_DASHBOARD_PROFIL"
+STANDARD_AUSGABE = "iu-dashboard-profil.json"
+
+_aktiv = False
+_sperre = threading.Lock()
+_messwerte = {}
+
+
+def ist_aktiv():
+    """
+    :return: True, wenn die Instrumentierung eingeschaltet wurde
+    """
+    return _aktiv
+
+
+def aus_umgebung():
+    """
+    Liest die Umgebungsvariable IU_DASHBOARD_PROFIL. Erlaubt sind "1" (Ausgabe
+    nach iu-dashboard-profil.json) oder ein Pfad für die JSON-Ausgabe.
+
+    :return: Ausgabepfad oder None, wenn die Instrumentierung aus ist
+    """
+    wert = os.environ.get(UMGEBUNGSVARIABLE, "").strip()
+    if not wert or wert == "0":
+        return None
+    return STANDARD_AUSGABE if wert == "1" else wert
+
+
+def aktiviere(controller_klasse=None, ausgabe=STANDARD_AUSGABE, gui=True):
+    """
+    Schaltet die Instrumentierung ein: Controller-Aktionen, Repository-Aufrufe
+    und (mit gui=True) View.update_student_info werden mit Zeitmessung umhüllt.
+    Ist sie nicht aktiviert, bleiben alle Methoden unverändert und es entsteht
+    kein Zusatzaufwand.
+
+    :param controller_klasse: Die tatsächlich verwendete Controller-Klasse
+                              (beim Start über "python controller.py" die aus __main__)
+    :param ausgabe: Pfad der JSON-Datei, die beim Beenden geschrieben wird (None = keine)
+    :param gui: True, um auch die View zu instrumentieren (importiert tkinter)
+    """
+    global _aktiv
+    if _aktiv:
+        return
+    _aktiv = True
+
+    from model import KursRepository, StudentRepository, KursJournal
+    from datenquelle import SqliteDatenquelle
+
+    if controller_klasse is not None:
+        for name in ("aktualisiere_kurs", "aktualisiere_note", "aktualisiere_kursname",
+                     "aktualisiere_kurscode", "aktualisiere_kurs_ects", "aktualisiere_student",
+                     "importiere_noten", "_update_stats"):
+            _umhuelle(controller_klasse, name)
+    for name in ("lade_kurse", "lade_kurstabelle"):
+        _umhuelle(KursRepository, name)
+    _umhuelle(KursRepository, "speichere_kurse", pfad_von=lambda args: args[0])
+    _umhuelle(StudentRepository, "lade_student")
+    _umhuelle(StudentRepository, "speichere_student", pfad_von=lambda args: args[0])
+    _umhuelle(KursJournal, "lade_kurse")
+    _umhuelle(KursJournal, "verdichte")
+    _umhuelle(KursJournal, "protokolliere", pfad_von=lambda args: args[0].pfad, anhaengend=True)
+    for name in ("lade_kurse", "kennzahlen"):
+        _umhuelle(SqliteDatenquelle, name)
+    # Geschrieben wird in Datenbank und WAL; gezählt wird der Zuwachs beider Dateien
+    for name in ("speichere_kurse", "protokolliere", "speichere_student"):
+        _umhuelle(SqliteDatenquelle, name, pfad_von=lambda args: (args[0].pfad, args[0].pfad + "-wal"),
+                  anhaengend=True)
+    if gui:
+        from view import View
+        _umhuelle(View, "update_student_info")
+
+    if ausgabe:
+        atexit.register(schreibe_json, ausgabe)
+
+
+def _groesse(pfad):
+    """
+    Dateigröße in Bytes, 0 für nicht vorhandene Dateien.
+
+    :param pfad: Pfad oder Tupel von Pfaden (dann die Summe der Größen)
+    """
+    if isinstance(pfad, tuple):
+        return sum(map(_groesse, pfad))
+    try:
+        return os.path.getsize(pfad)
+    except OSError:
+        return 0
+
+
+def _umhuelle(klasse, name, pfad_von=None, anhaengend=False):
+    """
+    Ersetzt eine Methode (auch staticmethod) einer Klasse durch eine Variante
+    mit Zeitmessung. Der Messwert heißt "<Klasse>.<Methode>".
+
+    :param pfad_von: Funktion, die aus den Aufrufargumenten den geschriebenen
+                     Dateipfad (oder ein Tupel von Pfaden) bestimmt; None, wenn
+                     die Methode nicht schreibt
+    :param anhaengend: True, wenn die Methode an die Datei anhängt (gezählt wird
+                       der Zuwachs, höchstens 0 abwärts), sonst zählt die
+                       Dateigröße nach dem Aufruf
+    """
+    roh = klasse.__dict__[name]
+    statisch = isinstance(roh, staticmethod)
+    funktion = roh.__func__ if statisch else roh
+    schluessel = f"{klasse.__name__}.{name}"
+
+    @functools.wraps(funktion)
+    def gemessen(*args, **kwargs):
+        pfad = pfad_von(args) if pfad_von else None
+        vorher = _groesse(pfad) if pfad and anhaengend else 0
+        start = time.perf_counter()
+        try:
+            return funktion(*args, **kwargs)
+        finally:
+            dauer = time.perf_counter() - start
+            geschrieben = max(0, _groesse(pfad) - vorher) if pfad else 0
+            erfasse(schluessel, dauer, geschrieben)
+
+    setattr(klasse, name, staticmethod(gemessen) if statisch else gemessen)
+
+
+def erfasse(name, dauer, geschrieben=0):
+    """
+    Verbucht einen Aufruf. Thread-sicher, da auch der Speicher-Worker misst.
+
+    :param name: Name des Messpunkts
+    :param dauer: Laufzeit in Sekunden
+    :param geschrieben: Anzahl geschriebener Bytes
+    """
+    with _sperre:
+        m = _messwerte.get(name)
+        if m is None:
+            m = _messwerte[name] = {"aufrufe": 0, "gesamt_s": 0.0, "max_s": 0.0, "bytes": 0}
+        m["aufrufe"] += 1
+        m["gesamt_s"] += dauer
+        m["bytes"] += geschrieben
+        if dauer > m["max_s"]:
+            m["max_s"] = dauer
+
+
+def messwerte():
+    """
+    :return: Kopie aller Messwerte, Name -> Dict mit aufrufe, gesamt_s, max_s, bytes
+    """
+    with _sperre:
+        return {name: dict(m) for name, m in _messwerte.items()}
+
+
+def als_text():
+    """
+    Formatiert die Messwerte als Tabelle, absteigend nach Gesamtzeit.
+
+    :return: Mehrzeiliger String
+    """
+    zeilen = [f"{'Messpunkt':38s} {'Aufrufe':>8s} {'Gesamt ms':>10s} {'Max ms':>9s} {'Bytes':>10s}"]
+    for name, m in sorted(messwerte().items(), key=lambda e: -e[1]["gesamt_s"]):
+        zeilen.append(f"{name:38s} {m['aufrufe']:8d} {m['gesamt_s'] * 1000:10.2f} "
+                      f"{m['max_s'] * 1000:9.2f} {m['bytes']:10d}")
+    return "\n".join(zeilen)
+
+
+def schreibe_json(pfad):
+    """
+    Schreibt alle Messwerte als JSON-Datei.
+
+    :param pfad: Zielpfad
+    """
+    with open(pfad, "w", encoding="utf-8") as f:
+        json.dump(messwerte(), f, indent=2)
+
+
+class ProfilAufnahme:
+    """
+    Zeitlich begrenzte cProfile-Aufnahme, z. B. per Tastenkürzel gestartet,
+    um einen "hängenden" Moment gezielt mitzuschneiden.
+    """
+
+    def __init__(self):
+        self._profil = None
+
+    @property
+    def laeuft(self):
+        return self._profil is not None
+
+    def starte(self):
+        """
+        Beginnt eine neue Aufnahme (falls noch keine läuft).
+        """
+        if self._profil is None:
+            self._profil = cProfile.Profile()
+            self._profil.enable()
+
+    def stoppe(self, pfad=None):
+        """
+        Beendet die Aufnahme und schreibt sie als .prof-Datei (für pstats/snakeviz).
+
+        :param pfad: Zielpfad oder None für einen Namen mit Zeitstempel
+        :return: Pfad der geschriebenen Datei oder None, wenn keine Aufnahme lief
+        """
+        if self._profil is None:
+            return None
+        self._profil.disable()
+        pfad = pfad or time.strftime("iu-dashboard-%Y%m%d-%H%M%S.prof")
+        self._profil.dump_stats(pfad)
+        self._profil = None
+        return pfad
@@ -0,0 +1,13 @@
+"""
+Kommandozeilen-Zugang zum IU Progress Tracker ohne GUI.
+
+    python -m iu_dashboard stats [--json]
+    python -m iu_dashboard set-grade KURSCODE NOTE
+    python -m iu_dashboard import-grades NOTEN.csv|NOTEN.json
+    python -m iu_dashboard plan [--max-ects 30] [--semester N] [--bevorzuge KURSCODE[=GEWICHT]]
+    python -m iu_dashboard export [--format csv|json]
+    python -m iu_dashboard migrate ZIEL.db
+    python -m iu_dashboard --datenbank ZIEL.db stats
+
+Nutzt nur model, service und planer; tkinter wird nie importiert.
+"""
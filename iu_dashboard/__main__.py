@@ -0,0 +1,5 @@
+import sys
+
+from iu_dashboard.cli import main
+
+sys.exit(main())
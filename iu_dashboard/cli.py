@@ -0,0 +1,262 @@
+import argparse
+import csv
+import json
+import sys
+
+from datenquelle import CsvDatenquelle, SqliteDatenquelle, STANDARD_VERZEICHNIS
+from model import KursRepository, NotenImportRepository
+from planer import SemesterPlaner, STANDARD_MAX_ECTS
+from service import Service
+
+
+def _quelle(args, cache=True):
+    """
+    Öffnet die Datenquelle passend zu den Optionen --verzeichnis bzw. --datenbank.
+
+    :param cache: False für Befehle, die die Daten nur einmal lesen: Ein
+                  SnapshotCache würde nur zusätzlich kurse.csv.cache schreiben,
+                  ohne dass ein späterer Start des Befehls davon profitiert
+    """
+    if args.datenbank:
+        return SqliteDatenquelle(args.datenbank)
+    return CsvDatenquelle(args.verzeichnis, cache=cache)
+
+
+def _verdichte(quelle):
+    """
+    Übernimmt gesammelte Journal-Einträge sofort in kurse.csv, damit die
+    Datei nach jedem schreibenden Befehl den aktuellen Stand enthält.
+    """
+    if quelle.muss_verdichten(vollstaendig=True):
+        quelle.verdichte(quelle.lade_kurse(tabelle=True))
+
+
+def statistik(student, kennzahlen):
+    """
+    Ergänzt die Kennzahlen der Datenquelle um Studierendendaten und Fortschritt,
+    wie sie auch das Dashboard anzeigt.
+
+    :param student: Student-Objekt oder None
+    :param kennzahlen: Ergebnis von Datenquelle.kennzahlen()
+    :return: Dict mit ects, ziel_ects, fortschritt, durchschnitt und Statuszählung
+    """
+    ziel = student.ziel_ects if student else 0
+    return {
+        "name": student.name if student else None,
+        "studiengang": student.studiengang if student else None,
+        "ects": kennzahlen["ects"],
+        "ziel_ects": ziel,
+        "fortschritt": round(kennzahlen["ects"] / ziel * 100, 1) if ziel > 0 else 0,
+        "durchschnitt": kennzahlen["durchschnitt"],
+        "benotet": kennzahlen["benotet"],
+        "angerechnet": kennzahlen["angerechnet"],
+        "offen": kennzahlen["offen"],
+    }
+
+
+def _befehl_stats(args):
+    quelle = _quelle(args, cache=False)
+    try:
+        werte = statistik(quelle.lade_student(), quelle.kennzahlen())
+    finally:
+        quelle.schliesse()
+    if args.json:
+        print(json.dumps(werte, ensure_ascii=False))
+        return 0
+    print(f"Name:              {werte['name'] or '-'}")
+    print(f"Studiengang:       {werte['studiengang'] or '-'}")
+    print(f"Erreichte ECTS:    {werte['ects']} / {werte['ziel_ects']} ({werte['fortschritt']:.0f}%)")
+    print(f"Notendurchschnitt: {werte['durchschnitt'] or '-'}")
+    print(f"Kurse:             {werte['benotet']} benotet, {werte['angerechnet']} angerechnet, "
+          f"{werte['offen']} offen")
+    return 0
+
+
+def _befehl_set_grade(args):
+    ok, note = Service.pruefe_note(args.note)
+    if not ok:
+        print(f"Ungültige Note: {args.note} (erlaubt: 1-5, 'A', '-')", file=sys.stderr)
+        return 1
+    quelle = _quelle(args)
+    try:
+        kurs = quelle.finde_kurs(args.kurscode)
+        if kurs is None:
+            print(f"Unbekannter Kurscode: {args.kurscode}", file=sys.stderr)
+            return 1
+        if note != kurs.note:
+            # Wie in der GUI: nur die Änderung speichern (Journal bzw. UPDATE)
+            if quelle.inkrementell:
+                quelle.protokolliere([(args.kurscode, "Note", note, kurs.note)])
+            else:
+                kurse = quelle.lade_kurse()
+                kurse.finde(args.kurscode).note = note
+                quelle.speichere_kurse(kurse)
+        _verdichte(quelle)
+        return 0
+    finally:
+        quelle.schliesse()
+
+
+def _befehl_import_grades(args):
+    try:
+        eintraege = NotenImportRepository.lade(args.datei)
+    except (OSError, ValueError) as e:
+        print(f"Import fehlgeschlagen: {e}", file=sys.stderr)
+        return 1
+    quelle = _quelle(args)
+    try:
+        kurse = quelle.lade_kurse()
+        gueltig, abgelehnt = Service.pruefe_noten(kurse, eintraege)
+        aenderungen = []
+        for k, note in gueltig:
+            if note != k.note:
+                aenderungen.append((k.kurscode, "Note", note, k.note))
+                k.note = note
+        # Wie in der GUI: alle Änderungen mit einem Schreibvorgang speichern
+        if aenderungen:
+            if quelle.inkrementell:
+                quelle.protokolliere(aenderungen)
+            else:
+                quelle.speichere_kurse(kurse)
+        _verdichte(quelle)
+    finally:
+        quelle.schliesse()
+    for zeile, kurscode, text, grund in abgelehnt:
+        print(f"Zeile {zeile}: {kurscode} {text!r} abgelehnt ({grund})", file=sys.stderr)
+    print(f"{len(aenderungen)} Noten importiert, {len(abgelehnt)} abgelehnt")
+    return 1 if abgelehnt else 0
+
+
+def _gewichte(angaben):
+    """
+    Wertet --bevorzuge KURSCODE[=GEWICHT] aus (ohne Gewicht: 1).
+    """
+    gewichte = {}
+    for angabe in angaben:
+        kurscode, _, gewicht = angabe.partition("=")
+        gewichte[kurscode] = float(gewicht) if gewicht else 1.0
+    return gewichte
+
+
+def _befehl_plan(args):
+    try:
+        gewichte = _gewichte(args.bevorzuge)
+    except ValueError:
+        print("Ungültiges Gewicht (erwartet KURSCODE=ZAHL)", file=sys.stderr)
+        return 1
+    if args.max_ects <= 0:
+        print("--max-ects muss größer als 0 sein", file=sys.stderr)
+        return 1
+    quelle = _quelle(args, cache=False)
+    try:
+        student = quelle.lade_student()
+        kurse = quelle.lade_kurse(tabelle=True)
+    finally:
+        quelle.schliesse()
+    if student is None:
+        print("Kein Studierender gespeichert (Ziel-ECTS unbekannt)", file=sys.stderr)
+        return 1
+    planer = SemesterPlaner(kurse, student.ziel_ects, args.max_ects, gewichte)
+    semester, erreicht = planer.plane(args.semester)
+
+    if args.json:
+        print(json.dumps({
+            "fehlende_ects": planer.fehlend,
+            "erreicht": erreicht,
+            "semester": [[{"Kurscode": k.kurscode, "Kursname": k.name, "ECTS": k.ects} for k in s]
+                         for s in semester],
+        }, ensure_ascii=False))
+    else:
+        print(f"Fehlende ECTS: {planer.fehlend} (mindestens {planer.untere_grenze} Semester "
+              f"bei {args.max_ects} ECTS)")
+        for nr, kurse_im_semester in enumerate(semester, start=1):
+            print(f"Semester {nr} ({sum(k.ects for k in kurse_im_semester)} ECTS):")
+            for k in kurse_im_semester:
+                print(f"  {k.kurscode:12s} {k.ects:3d}  {k.name}")
+        if not erreicht:
+            print("Ziel-ECTS mit den offenen Kursen nicht erreichbar"
+                  + (f" (höchstens {args.semester} Semester)" if args.semester else ""))
+    return 0 if erreicht else 1
+
+
+def _befehl_export(args):
+    quelle = _quelle(args, cache=False)
+    try:
+        kurse = quelle.lade_kurse(tabelle=True)
+    finally:
+        quelle.schliesse()
+    ausgabe = sys.stdout if args.ausgabe == "-" else open(args.ausgabe, "w", newline="", encoding="utf-8")
+    try:
+        if args.format == "json":
+            json.dump([{"Kurscode": k.kurscode, "Kursname": k.name, "ECTS": k.ects,
+                        "Note": KursRepository.note_als_text(k.note)} for k in kurse],
+                      ausgabe, ensure_ascii=False, indent=2)
+            ausgabe.write("\n")
+        else:
+            writer = csv.writer(ausgabe)
+            writer.writerow(KursRepository.HEADERS)
+            for k in kurse:
+                writer.writerow((k.kurscode, k.name, k.ects, KursRepository.note_als_text(k.note)))
+    finally:
+        if ausgabe is not sys.stdout:
+            ausgabe.close()
+    return 0
+
+
+def _befehl_migrate(args):
+    quelle = SqliteDatenquelle.aus_csv(args.ziel, args.verzeichnis)
+    anzahl = len(quelle.lade_kurse(tabelle=True))
+    quelle.schliesse()
+    print(f"{anzahl} Kurse nach {args.ziel} übernommen")
+    return 0
+
+
+def main(argv=None):
+    """
+    Einstiegspunkt für "python -m iu_dashboard".
+
+    :param argv: Argumentliste (Standard: sys.argv[1:])
+    :return: Exit-Code
+    """
+    parser = argparse.ArgumentParser(prog="python -m iu_dashboard",
+                                     description="IU Progress Tracker ohne GUI")
+    parser.add_argument("-d", "--verzeichnis", default=STANDARD_VERZEICHNIS,
+                        help="Ordner mit student.csv und kurse.csv (Standard: CSV)")
+    parser.add_argument("--datenbank", metavar="DB", default=None,
+                        help="SQLite-Datenbank statt der CSV-Dateien verwenden")
+    sub = parser.add_subparsers(dest="befehl", required=True)
+
+    p_stats = sub.add_parser("stats", help="ECTS, Fortschritt und Notendurchschnitt ausgeben")
+    p_stats.add_argument("--json", action="store_true", help="Ausgabe als JSON")
+    p_stats.set_defaults(funktion=_befehl_stats)
+
+    p_note = sub.add_parser("set-grade", help="Note eines Kurses setzen")
+    p_note.add_argument("kurscode")
+    p_note.add_argument("note", help="1-5, 'A' (angerechnet) oder '-' (keine Note)")
+    p_note.set_defaults(funktion=_befehl_set_grade)
+
+    p_import = sub.add_parser("import-grades",
+                              help="Noten aus einer CSV- oder JSON-Datei (Kurscode, Note) übernehmen")
+    p_import.add_argument("datei", help="CSV mit den Spalten Kurscode und Note oder JSON")
+    p_import.set_defaults(funktion=_befehl_import_grades)
+
+    p_plan = sub.add_parser("plan", help="Offene Kurse bis zu den Ziel-ECTS auf Semester verteilen")
+    p_plan.add_argument("--max-ects", type=int, default=STANDARD_MAX_ECTS,
+                        help=f"Höchstens belegbare ECTS je Semester (Standard: {STANDARD_MAX_ECTS})")
+    p_plan.add_argument("--semester", type=int, default=None, help="Höchstens so viele Semester planen")
+    p_plan.add_argument("--bevorzuge", action="append", default=[], metavar="KURSCODE[=GEWICHT]",
+                        help="Kurs bevorzugt früh einplanen (mehrfach möglich)")
+    p_plan.add_argument("--json", action="store_true", help="Ausgabe als JSON")
+    p_plan.set_defaults(funktion=_befehl_plan)
+
+    p_export = sub.add_parser("export", help="Kurse (inkl. Journal) exportieren")
+    p_export.add_argument("--format", choices=("csv", "json"), default="csv")
+    p_export.add_argument("-o", "--ausgabe", default="-", help="Zieldatei (Standard: Standardausgabe)")
+    p_export.set_defaults(funktion=_befehl_export)
+
+    p_migrate = sub.add_parser("migrate", help="CSV-Dateien einmalig in eine SQLite-Datenbank übernehmen")
+    p_migrate.add_argument("ziel", help="Pfad der Datenbankdatei")
+    p_migrate.set_defaults(funktion=_befehl_migrate)
+
+    args = parser.parse_args(argv)
+    return args.funktion(args)
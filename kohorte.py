@@ -0,0 +1,396 @@
+import argparse
+import csv
+import math
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from model import StudentRepository, KursRepository, KursJournal, KursKatalog
+from service import Service
+
+STUDENT_DATEI = "student.csv"
+KURSE_DATEI = "kurse.csv"
+
+HEADERS = ["Verzeichnis", "Name", "Studiengang", "Ziel-ECTS",
+           "Erreichte ECTS", "Notendurchschnitt", "Fortschritt", "Fehler"]
+
+KURS_HEADERS = ["Kurscode", "Kursname", "Anzahl", "Mittelwert", "Varianz", "Minimum", "Maximum",
+                "P10", "P25", "Median", "P75", "P90", "Angerechnet", "Offen"]
+QUANTILE = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+def finde_studierende(wurzel):
+    """
+    Durchsucht ein Verzeichnis rekursiv nach Studierenden-Verzeichnissen,
+    also Ordnern, die sowohl student.csv als auch kurse.csv enthalten.
+    Die Treffer werden einzeln geliefert, ohne die Liste aufzubauen.
+
+    :param wurzel: Wurzelverzeichnis der Kohorte
+    :return: Generator von Verzeichnispfaden
+    """
+    for verzeichnis, unterordner, dateien in os.walk(wurzel):
+        unterordner.sort()
+        if STUDENT_DATEI in dateien and KURSE_DATEI in dateien:
+            yield verzeichnis
+
+
+def werte_aus(verzeichnis, katalog=None):
+    """
+    Lädt einen Studierenden samt Kursen (inkl. Journal) und berechnet
+    ECTS, Notendurchschnitt und Fortschritt in Prozent.
+    Fehler beim Lesen werden in der Spalte "Fehler" gemeldet, statt den
+    gesamten Lauf abzubrechen.
+
+    :param verzeichnis: Verzeichnis mit student.csv und kurse.csv
+    :param katalog: KursKatalog, den sich die Studierenden eines Blocks teilen,
+                    oder None für einen eigenen
+    :return: Zeile (Liste) passend zu HEADERS
+    """
+    if katalog is None:
+        katalog = KursKatalog()
+    try:
+        student = StudentRepository.lade_student(os.path.join(verzeichnis, STUDENT_DATEI))
+        kurse_pfad = os.path.join(verzeichnis, KURSE_DATEI)
+        kurse = KursRepository.lade_notentabelle(kurse_pfad, katalog)
+        KursJournal(kurse_pfad).wiedergeben(kurse)
+    except (OSError, ValueError, KeyError, csv.Error) as e:
+        return [verzeichnis, "", "", "", "", "", "", str(e)]
+    if student is None:
+        return [verzeichnis, "", "", "", "", "", "", "student.csv ist leer"]
+
+    ects = Service.berechne_ects(kurse)
+    durchschnitt = Service.berechne_durchschnitt(kurse)
+    prozent = round(ects / student.ziel_ects * 100, 1) if student.ziel_ects > 0 else 0
+    return [verzeichnis, student.name, student.studiengang, student.ziel_ects,
+            ects, durchschnitt if durchschnitt is not None else "", prozent, ""]
+
+
+def _werte_block_aus(verzeichnisse):
+    """
+    Wertet einen Block von Verzeichnissen in einem Worker-Prozess aus,
+    damit nicht jedes Verzeichnis einzeln zwischen Prozessen verschickt wird.
+    Die Kursstammdaten teilen sich nur die Studierenden des Blocks, sodass
+    der Katalog im (langlebigen) Worker nicht über alle Blöcke wächst.
+    """
+    katalog = KursKatalog()
+    return [werte_aus(v, katalog) for v in verzeichnisse]
+
+
+def _bloecke(iterable, groesse):
+    """
+    Fasst Elemente eines Iterables zu Listen der angegebenen Größe zusammen.
+    """
+    block = []
+    for element in iterable:
+        block.append(element)
+        if len(block) >= groesse:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def iter_ergebnisse(wurzel, max_workers=None, blockgroesse=32):
+    """
+    Wertet alle Studierenden unterhalb der Wurzel parallel aus.
+    Es sind höchstens zwei Blöcke pro Worker gleichzeitig unterwegs; die
+    Ergebnisse werden in Verzeichnisreihenfolge geliefert, sobald sie
+    vorliegen. So bleibt der Speicherbedarf unabhängig von der Kohortengröße.
+
+    :param wurzel: Wurzelverzeichnis der Kohorte
+    :param max_workers: Anzahl Prozesse (Standard: Anzahl CPU-Kerne)
+    :param blockgroesse: Verzeichnisse pro Auftrag an einen Worker
+    :return: Generator von Ergebniszeilen (siehe HEADERS)
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        laufend = deque()
+        for block in _bloecke(finde_studierende(wurzel), blockgroesse):
+            laufend.append(pool.submit(_werte_block_aus, block))
+            if len(laufend) >= 2 * max_workers:
+                yield from laufend.popleft().result()
+        while laufend:
+            yield from laufend.popleft().result()
+
+
+def schreibe_zusammenfassung(wurzel, ausgabe, max_workers=None, blockgroesse=32):
+    """
+    Wertet eine Kohorte aus und schreibt eine Zeile pro Studierendem in eine CSV-Datei.
+
+    :param wurzel: Wurzelverzeichnis der Kohorte
+    :param ausgabe: Pfad der Ergebnis-CSV oder "-" für die Standardausgabe
+    :param max_workers: Anzahl Prozesse (Standard: Anzahl CPU-Kerne)
+    :param blockgroesse: Verzeichnisse pro Auftrag an einen Worker
+    :return: Anzahl ausgewerteter Studierender
+    """
+    f = sys.stdout if ausgabe == "-" else open(ausgabe, "w", newline="", encoding="utf-8")
+    try:
+        writer = csv.writer(f)
+        writer.writerow(HEADERS)
+        anzahl = 0
+        for zeile in iter_ergebnisse(wurzel, max_workers, blockgroesse):
+            writer.writerow(zeile)
+            anzahl += 1
+        return anzahl
+    finally:
+        if f is not sys.stdout:
+            f.close()
+
+
+class NotenStatistik:
+    """
+    Verteilung der Noten eines Kurses über viele Studierende, in einem
+    Durchlauf erfasst. Anzahl, Mittelwert und Varianz werden nach Welford
+    laufend fortgeschrieben, Minimum und Maximum direkt.
+
+    Für Median und Perzentile werden die Noten in Hundertstel-Klassen
+    gezählt. Da Noten zwischen 1 und 5 liegen, gibt es höchstens 401
+    Klassen, unabhängig von der Zahl der Studierenden. Exakt sind die
+    Quantile nur für Noten mit höchstens zwei Nachkommastellen; genauere
+    Noten gehen auf Hundertstel gerundet ein (Mittelwert, Varianz, Minimum
+    und Maximum bleiben davon unberührt). Zwei Statistiken
+    (z. B. aus verschiedenen Worker-Prozessen) lassen sich mit vereinige()
+    ohne Genauigkeitsverlust zusammenführen.
+    """
+    __slots__ = ("name", "anzahl", "mittel", "m2", "minimum", "maximum",
+                 "verteilung", "angerechnet", "offen")
+
+    def __init__(self, name=""):
+        """
+        :param name: Kursname (zur Anzeige)
+        """
+        self.name = name
+        self.anzahl = 0
+        self.mittel = 0.0
+        self.m2 = 0.0
+        self.minimum = None
+        self.maximum = None
+        # Note in Hundertsteln -> Häufigkeit
+        self.verteilung = {}
+        self.angerechnet = 0
+        self.offen = 0
+
+    def erfasse(self, note):
+        """
+        Nimmt die Note eines Studierenden auf.
+
+        :param note: Float, 0.0 für angerechnet oder None
+        """
+        if note is None:
+            self.offen += 1
+            return
+        if note == 0.0:
+            self.angerechnet += 1
+            return
+        self.anzahl += 1
+        delta = note - self.mittel
+        self.mittel += delta / self.anzahl
+        self.m2 += delta * (note - self.mittel)
+        if self.minimum is None or note < self.minimum:
+            self.minimum = note
+        if self.maximum is None or note > self.maximum:
+            self.maximum = note
+        klasse = round(note * 100)
+        self.verteilung[klasse] = self.verteilung.get(klasse, 0) + 1
+
+    def vereinige(self, andere):
+        """
+        Übernimmt die Werte einer zweiten Statistik desselben Kurses
+        (parallele Variante von Welford nach Chan et al.).
+
+        :param andere: NotenStatistik
+        """
+        self.name = self.name or andere.name
+        self.angerechnet += andere.angerechnet
+        self.offen += andere.offen
+        if not andere.anzahl:
+            return
+        if not self.anzahl:
+            self.anzahl, self.mittel, self.m2 = andere.anzahl, andere.mittel, andere.m2
+            self.minimum, self.maximum = andere.minimum, andere.maximum
+            self.verteilung = dict(andere.verteilung)
+            return
+        anzahl = self.anzahl + andere.anzahl
+        delta = andere.mittel - self.mittel
+        self.mittel += delta * andere.anzahl / anzahl
+        self.m2 += andere.m2 + delta * delta * self.anzahl * andere.anzahl / anzahl
+        self.anzahl = anzahl
+        self.minimum = min(self.minimum, andere.minimum)
+        self.maximum = max(self.maximum, andere.maximum)
+        for klasse, haeufigkeit in andere.verteilung.items():
+            self.verteilung[klasse] = self.verteilung.get(klasse, 0) + haeufigkeit
+
+    @property
+    def varianz(self):
+        """
+        :return: Stichprobenvarianz der Noten oder None bei weniger als zwei Noten
+        """
+        return self.m2 / (self.anzahl - 1) if self.anzahl > 1 else None
+
+    def quantile(self, anteile=QUANTILE):
+        """
+        Quantile nach der Nearest-Rank-Methode (der Median ist bei gerader
+        Anzahl die untere der beiden mittleren Noten).
+
+        :param anteile: Aufsteigende Anteile zwischen 0 und 1
+        :return: Liste der Noten zu den Anteilen (leer, wenn keine Noten erfasst sind)
+        """
+        if not self.anzahl:
+            return []
+        raenge = [max(1, math.ceil(a * self.anzahl)) for a in anteile]
+        ergebnis = []
+        kumuliert = 0
+        klassen = iter(sorted(self.verteilung.items()))
+        klasse = None
+        for rang in raenge:
+            while kumuliert < rang:
+                klasse, haeufigkeit = next(klassen)
+                kumuliert += haeufigkeit
+            ergebnis.append(klasse / 100)
+        return ergebnis
+
+
+class KursStatistiken:
+    """
+    Notenverteilungen je Kurscode über eine Kohorte. Der Speicherbedarf
+    wächst mit der Zahl verschiedener Kurse, nicht mit der Zahl der
+    Studierenden: Jede kurse.csv wird gelesen, in die Statistiken
+    eingerechnet und danach verworfen.
+    """
+
+    def __init__(self):
+        self.kurse = {}
+        self.dateien = 0
+        self.fehlerhaft = 0
+
+    def erfasse_verzeichnis(self, verzeichnis, katalog=None):
+        """
+        Rechnet die Kurse (inkl. Journal) eines Studierenden-Verzeichnisses ein.
+        Nicht lesbare Dateien werden gezählt statt den Lauf abzubrechen.
+
+        :param verzeichnis: Verzeichnis mit kurse.csv
+        :param katalog: KursKatalog, den sich die Studierenden eines Blocks teilen,
+                        oder None für einen eigenen
+        """
+        if katalog is None:
+            katalog = KursKatalog()
+        try:
+            kurse_pfad = os.path.join(verzeichnis, KURSE_DATEI)
+            kurse = KursRepository.lade_notentabelle(kurse_pfad, katalog)
+            KursJournal(kurse_pfad).wiedergeben(kurse)
+        except (OSError, ValueError, KeyError, csv.Error):
+            self.fehlerhaft += 1
+            return
+        self.dateien += 1
+        statistiken = self.kurse
+        codes, namen = katalog.kurscodes, katalog.namen
+        for i, k in enumerate(kurse.indizes):
+            statistik = statistiken.get(codes[k])
+            if statistik is None:
+                statistik = statistiken[codes[k]] = NotenStatistik(namen[k])
+            statistik.erfasse(kurse.note_an(i))
+
+    def vereinige(self, andere):
+        """
+        Übernimmt die Statistiken eines anderen Durchlaufs (z. B. eines Workers).
+
+        :param andere: KursStatistiken
+        """
+        self.dateien += andere.dateien
+        self.fehlerhaft += andere.fehlerhaft
+        for kurscode, statistik in andere.kurse.items():
+            eigene = self.kurse.get(kurscode)
+            if eigene is None:
+                self.kurse[kurscode] = statistik
+            else:
+                eigene.vereinige(statistik)
+
+    def zeilen(self):
+        """
+        :return: Generator von Zeilen passend zu KURS_HEADERS, nach Kurscode sortiert
+        """
+        for kurscode in sorted(self.kurse):
+            s = self.kurse[kurscode]
+            varianz = s.varianz
+            werte = [round(s.mittel, 3), "" if varianz is None else round(varianz, 4),
+                     s.minimum, s.maximum, *s.quantile()] if s.anzahl else [""] * 9
+            yield [kurscode, s.name, s.anzahl, *werte, s.angerechnet, s.offen]
+
+
+def _kursstatistik_block(verzeichnisse):
+    """
+    Erfasst einen Block von Verzeichnissen in einem Worker-Prozess; zurück
+    geht nur die (kleine) Statistik je Kurs.
+    """
+    statistiken = KursStatistiken()
+    katalog = KursKatalog()
+    for v in verzeichnisse:
+        statistiken.erfasse_verzeichnis(v, katalog)
+    return statistiken
+
+
+def kursstatistik(wurzel, max_workers=None, blockgroesse=32):
+    """
+    Berechnet die Notenverteilung je Kurscode über alle Studierenden unterhalb
+    der Wurzel. Die Worker liefern Teilstatistiken, die sofort zusammengeführt
+    werden; wie bei iter_ergebnisse sind höchstens zwei Blöcke pro Worker
+    gleichzeitig unterwegs.
+
+    :param wurzel: Wurzelverzeichnis der Kohorte
+    :param max_workers: Anzahl Prozesse (Standard: Anzahl CPU-Kerne)
+    :param blockgroesse: Verzeichnisse pro Auftrag an einen Worker
+    :return: KursStatistiken
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    gesamt = KursStatistiken()
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        laufend = deque()
+        for block in _bloecke(finde_studierende(wurzel), blockgroesse):
+            laufend.append(pool.submit(_kursstatistik_block, block))
+            if len(laufend) >= 2 * max_workers:
+                gesamt.vereinige(laufend.popleft().result())
+        while laufend:
+            gesamt.vereinige(laufend.popleft().result())
+    return gesamt
+
+
+def schreibe_kursstatistik(wurzel, ausgabe, max_workers=None, blockgroesse=32):
+    """
+    Schreibt die Notenverteilung je Kurscode (siehe kursstatistik) in eine CSV-Datei.
+
+    :param wurzel: Wurzelverzeichnis der Kohorte
+    :param ausgabe: Pfad der Ergebnis-CSV oder "-" für die Standardausgabe
+    :param max_workers: Anzahl Prozesse (Standard: Anzahl CPU-Kerne)
+    :param blockgroesse: Verzeichnisse pro Auftrag an einen Worker
+    :return: KursStatistiken
+    """
+    statistiken = kursstatistik(wurzel, max_workers, blockgroesse)
+    f = sys.stdout if ausgabe == "-" else open(ausgabe, "w", newline="", encoding="utf-8")
+    try:
+        writer = csv.writer(f)
+        writer.writerow(KURS_HEADERS)
+        writer.writerows(statistiken.zeilen())
+    finally:
+        if f is not sys.stdout:
+            f.close()
+    return statistiken
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Wertet alle Studierenden-Verzeichnisse einer Kohorte aus (ohne GUI)."
+    )
+    parser.add_argument("wurzel", help="Verzeichnis, unter dem die Studierenden-Ordner liegen")
+    parser.add_argument("-o", "--ausgabe", default="-", help="Ergebnis-CSV (Standard: Standardausgabe)")
+    parser.add_argument("-j", "--prozesse", type=int, default=None, help="Anzahl Worker-Prozesse")
+    parser.add_argument("--blockgroesse", type=int, default=32, help="Verzeichnisse pro Worker-Auftrag")
+    parser.add_argument("--kurse", action="store_true",
+                        help="Notenverteilung je Kurscode statt einer Zeile pro Studierendem")
+    args = parser.parse_args()
+    if args.kurse:
+        ergebnis = schreibe_kursstatistik(args.wurzel, args.ausgabe, args.prozesse, args.blockgroesse)
+        if ergebnis.fehlerhaft:
+            print(f"{ergebnis.fehlerhaft} Verzeichnisse konnten nicht gelesen werden", file=sys.stderr)
+    else:
+        schreibe_zusammenfassung(args.wurzel, args.ausgabe, args.prozesse, args.blockgroesse)
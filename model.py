@@ -1,4 +1,16 @@
+import copy
 import csv
+import gzip
+import hashlib
+import json
+import marshal
+import os
+import sys
+import threading
+from array import array
+
+# Größter ECTS-Wert, den die ECTS-Spalten (array('H')) aufnehmen
+MAX_ECTS = 65535
 
 class Student:
     """
@@ -37,17 +49,958 @@ class Kurs:
         self.kurscode = kurscode
         self.name = name
         self.ects = int(ects)
+        self.note = Kurs.note_aus_text(note)
+
+    @staticmethod
+    def pruefe_ects(ects):
+        """
+        Wandelt eine ECTS-Angabe (z. B. eine Benutzereingabe oder einen
+        Journal-Eintrag) in einen int um und prüft, dass sie positiv ist und
+        in die ECTS-Spalten passt.
+
+        :param ects: ECTS als String oder int
+        :return: ECTS (int)
+        :raises ValueError: wenn ects keine ganze Zahl von 1 bis MAX_ECTS ist
+        """
+        try:
+            ects = int(ects)
+        except ValueError:
+            raise ValueError(f"Ungültige ECTS {ects!r}: erwartet wird eine ganze Zahl") from None
+        if not 0 < ects <= MAX_ECTS:
+            raise ValueError(f"Ungültige ECTS {ects}: erlaubt sind 1 bis {MAX_ECTS}")
+        return ects
 
+    @staticmethod
+    def note_aus_text(note):
+        """
+        Wandelt eine Note aus der CSV-Darstellung in den internen Wert um.
+
+        :param note: None, Float/String oder "A" (angerechnet)
+        :return: Float, 0.0 für angerechnet oder None
+        """
         if note == "A":
             # Angerechnete Leistung -> 0.0
-            self.note = 0.0
+            return 0.0
         elif note:
             try:
-                self.note = float(note)
+                return float(note)
             except ValueError:
-                self.note = None
-        else:
-            self.note = None
+                return None
+        return None
+
+
+class KursListe:
+    """
+    Geordnete Sammlung von Kurs-Objekten mit Hash-Index auf dem Kurscode.
+    Behält die Einfügereihenfolge (wie die CSV-Datei) bei, erlaubt aber
+    Zugriff per Kurscode in O(1) und verhindert doppelte Kurscodes.
+    """
+
+    def __init__(self, kurse=()):
+        """
+        Legt die Sammlung an und übernimmt optional vorhandene Kurse.
+
+        :param kurse: Iterable von Kurs-Objekten
+        :raises ValueError: wenn ein Kurscode mehrfach vorkommt
+        """
+        self._kurse = []
+        self._index = {}
+        # Zählt jede Änderung am Bestand (siehe StatistikCache)
+        self.version = 0
+        for k in kurse:
+            self.anhaengen(k)
+
+    def __iter__(self):
+        return iter(self._kurse)
+
+    def __len__(self):
+        return len(self._kurse)
+
+    def __getitem__(self, position):
+        return self._kurse[position]
+
+    def __contains__(self, kurscode):
+        return kurscode in self._index
+
+    def anhaengen(self, kurs):
+        """
+        Fügt einen Kurs am Ende hinzu.
+
+        :param kurs: Kurs-Objekt
+        :raises ValueError: wenn der Kurscode bereits vergeben ist
+        """
+        if kurs.kurscode in self._index:
+            raise ValueError(f"Kurscode '{kurs.kurscode}' ist bereits vergeben")
+        self._index[kurs.kurscode] = kurs
+        self._kurse.append(kurs)
+        self.version += 1
+
+    def finde(self, kurscode):
+        """
+        Sucht einen Kurs anhand seines Codes.
+
+        :param kurscode: z. B. "MAT01"
+        :return: Kurs-Objekt oder None
+        """
+        return self._index.get(kurscode)
+
+    def aendere_kurscode(self, alter_kurscode, neuer_kurscode):
+        """
+        Ändert den Kurscode eines Kurses und passt den Index an.
+
+        :param alter_kurscode: Bisheriger Code
+        :param neuer_kurscode: Neuer Code
+        :return: True bei Erfolg, False wenn der alte Code nicht existiert
+                 oder der neue bereits vergeben ist
+        """
+        kurs = self._index.get(alter_kurscode)
+        if kurs is None:
+            return False
+        if neuer_kurscode == alter_kurscode:
+            return True
+        if neuer_kurscode in self._index:
+            return False
+        del self._index[alter_kurscode]
+        kurs.kurscode = neuer_kurscode
+        self._index[neuer_kurscode] = kurs
+        self.version += 1
+        return True
+
+    def entferne(self, kurscode):
+        """
+        Entfernt einen Kurs aus der Sammlung.
+
+        :param kurscode: Code des zu entfernenden Kurses
+        :return: Das entfernte Kurs-Objekt oder None, wenn der Code nicht existiert
+        """
+        kurs = self._index.pop(kurscode, None)
+        if kurs is not None:
+            self._kurse.remove(kurs)
+            self.version += 1
+        return kurs
+
+    def entferne_viele(self, kurscodes):
+        """
+        Entfernt mehrere Kurse auf einmal. Die Kurse werden über den Index
+        gefunden und die Liste nur einmal neu aufgebaut, statt sie wie bei
+        wiederholtem entferne() für jeden Kurs erneut zu durchsuchen.
+
+        :param kurscodes: Iterable von Kurscodes; unbekannte werden übergangen
+        :return: Liste der entfernten Kurs-Objekte
+        """
+        entfernt = [k for k in (self._index.pop(c, None) for c in kurscodes) if k is not None]
+        if entfernt:
+            weg = set(map(id, entfernt))
+            self._kurse = [k for k in self._kurse if id(k) not in weg]
+            self.version += 1
+        return entfernt
+
+    def markiere_geaendert(self):
+        """
+        Erhöht die Version, nachdem Name, ECTS oder Note eines enthaltenen
+        Kurs-Objekts direkt geändert wurden (davon erfährt die Liste sonst nichts).
+        """
+        self.version += 1
+
+
+class SpaltenKursListe(KursListe):
+    """
+    KursListe über bereits geparsten Spalten (z. B. aus dem SnapshotCache).
+    Die Kurs-Objekte werden erst beim ersten Zugriff auf eine Zeile erzeugt;
+    beim Start entstehen so nur die Objekte der sichtbaren Tabellenzeilen.
+
+    Solange die Liste nicht strukturell verändert wurde, liefert spalten()
+    ECTS und Noten für die Spaltenauswertungen in Service und
+    StatistikAggregator, ergänzt um die Werte bereits erzeugter (und
+    möglicherweise geänderter) Kurs-Objekte. Beim Anhängen oder Entfernen
+    werden alle Objekte erzeugt und die Liste verhält sich danach wie eine
+    gewöhnliche KursListe.
+    """
+
+    def __init__(self, kurscodes, namen, ects, noten):
+        """
+        :param kurscodes: Liste der Kurscodes
+        :param namen: Liste der Kursnamen
+        :param ects: array('H') der ECTS
+        :param noten: array('d') der Noten (KursTabelle.KEINE_NOTE für keine Note)
+        :raises ValueError: wenn ein Kurscode mehrfach vorkommt
+        """
+        super().__init__()
+        self._spalten = (kurscodes, namen, ects, noten)
+        self._kurse = [None] * len(kurscodes)
+        self._position = {c: i for i, c in enumerate(kurscodes)}
+        if len(self._position) != len(kurscodes):
+            raise ValueError("Kursdaten enthalten doppelte Kurscodes")
+        # Zeilen, für die bereits ein Kurs-Objekt existiert
+        self._erzeugt = []
+        # Auch der Änderungswächter liest die Liste (aus seinem Thread)
+        self._sperre = threading.Lock()
+
+    def _kurs(self, i):
+        """
+        Liefert das Kurs-Objekt der Zeile i und erzeugt es beim ersten Zugriff.
+        """
+        k = self._kurse[i]
+        if k is None:
+            with self._sperre:
+                k = self._kurse[i]
+                if k is None:
+                    codes, namen, ects, noten = self._spalten
+                    k = Kurs(codes[i], namen[i], ects[i])
+                    n = noten[i]
+                    k.note = None if n < 0 else n
+                    self._kurse[i] = k
+                    self._erzeugt.append(i)
+        return k
+
+    def _vervollstaendige(self):
+        """
+        Erzeugt alle noch fehlenden Kurs-Objekte und baut den Index der
+        KursListe auf; danach gelten wieder deren Methoden.
+        """
+        if self._spalten is None:
+            return
+        kurse = [self._kurs(i) for i in range(len(self._kurse))]
+        self._index = {k.kurscode: k for k in kurse}
+        self._spalten = self._position = None
+
+    def __iter__(self):
+        if self._spalten is None:
+            return super().__iter__()
+        return map(self._kurs, range(len(self._kurse)))
+
+    def __getitem__(self, position):
+        if self._spalten is None:
+            return super().__getitem__(position)
+        if isinstance(position, slice):
+            return [self._kurs(i) for i in range(*position.indices(len(self._kurse)))]
+        if position < 0:
+            position += len(self._kurse)
+        if not 0 <= position < len(self._kurse):
+            raise IndexError(position)
+        return self._kurs(position)
+
+    def __contains__(self, kurscode):
+        if self._spalten is None:
+            return super().__contains__(kurscode)
+        return kurscode in self._position
+
+    def finde(self, kurscode):
+        if self._spalten is None:
+            return super().finde(kurscode)
+        i = self._position.get(kurscode)
+        return None if i is None else self._kurs(i)
+
+    def aendere_kurscode(self, alter_kurscode, neuer_kurscode):
+        if self._spalten is None:
+            return super().aendere_kurscode(alter_kurscode, neuer_kurscode)
+        i = self._position.get(alter_kurscode)
+        if i is None:
+            return False
+        if neuer_kurscode == alter_kurscode:
+            return True
+        if neuer_kurscode in self._position:
+            return False
+        # Die Zeile hat danach ein eigenes Kurs-Objekt, die Spalte wird nicht mehr gelesen
+        self._kurs(i).kurscode = neuer_kurscode
+        del self._position[alter_kurscode]
+        self._position[neuer_kurscode] = i
+        self.version += 1
+        return True
+
+    def anhaengen(self, kurs):
+        self._vervollstaendige()
+        super().anhaengen(kurs)
+
+    def entferne(self, kurscode):
+        self._vervollstaendige()
+        return super().entferne(kurscode)
+
+    def entferne_viele(self, kurscodes):
+        self._vervollstaendige()
+        return super().entferne_viele(kurscodes)
+
+    def spalten(self):
+        """
+        ECTS- und Notenspalte des aktuellen Stands (siehe KursTabelle.spalten).
+
+        :return: Tupel (ects: array('H'), noten: array('d')) oder None, wenn
+                 die Liste schon wie eine gewöhnliche KursListe arbeitet oder
+                 ein Kurs-Objekt Werte außerhalb der Spalten hält
+        """
+        if self._spalten is None:
+            return None
+        ects, noten = array("H", self._spalten[2]), array("d", self._spalten[3])
+        with self._sperre:
+            erzeugt = list(self._erzeugt)
+        try:
+            for i in erzeugt:
+                k = self._kurse[i]
+                ects[i] = k.ects
+                noten[i] = KursTabelle.kodiere_note(k.note)
+        except (OverflowError, ValueError):
+            # Ein Kurs-Objekt hält ECTS oder eine Note, die die Spalten nicht
+            # darstellen können: Auswertung über die Kurs-Objekte
+            return None
+        return ects, noten
+
+
+class TextSpalte:
+    """
+    Kompakte Spalte von Zeichenketten: Alle Texte liegen UTF-8-kodiert
+    hintereinander in einem gemeinsamen bytearray, je Zeile werden nur
+    Startposition und Länge (je array('I')) gespeichert. Ein
+    str-Objekt entsteht erst beim Zugriff auf eine Zeile.
+
+    Beim Überschreiben wird der neue Text ans Pufferende gehängt und die Zeile
+    darauf verwiesen; der alte Platz bleibt ungenutzt. Das betrifft nur
+    Umbenennungen einzelner Kurscodes und fällt nicht ins Gewicht.
+    """
+    __slots__ = ("puffer", "start", "laenge")
+
+    def __init__(self, texte=()):
+        """
+        :param texte: Iterable von Zeichenketten
+        """
+        self.puffer = bytearray()
+        self.start = array("I")
+        self.laenge = array("I")
+        for text in texte:
+            self.append(text)
+
+    @classmethod
+    def aus_puffer(cls, puffer, start, laenge):
+        """
+        Übernimmt bereits kodierte Spalten, z. B. aus einem SnapshotCache.
+
+        :param puffer: bytes/bytearray mit den hintereinander liegenden Texten
+        :param start: array('I') der Startpositionen
+        :param laenge: array('I') der Längen in Bytes
+        :return: TextSpalte
+        """
+        spalte = cls()
+        spalte.puffer = bytearray(puffer)
+        spalte.start = start
+        spalte.laenge = laenge
+        return spalte
+
+    def __len__(self):
+        return len(self.start)
+
+    def __getitem__(self, i):
+        s = self.start[i]
+        return self.puffer[s:s + self.laenge[i]].decode()
+
+    def __setitem__(self, i, text):
+        daten = text.encode()
+        self.start[i] = len(self.puffer)
+        self.laenge[i] = len(daten)
+        self.puffer += daten
+
+    def __delitem__(self, i):
+        del self.start[i], self.laenge[i]
+
+    def __iter__(self):
+        puffer = self.puffer
+        return (puffer[s:s + n].decode() for s, n in zip(self.start, self.laenge))
+
+    def append(self, text):
+        daten = text.encode()
+        self.start.append(len(self.puffer))
+        self.laenge.append(len(daten))
+        self.puffer += daten
+
+
+class KursTabelle:
+    """
+    Spaltenorientierte, speichersparende Alternative zur KursListe.
+    ECTS liegen in einem array('H'), Noten in einem array('d'), Kurscodes in
+    einer TextSpalte (ein gemeinsamer Puffer statt eines str-Objekts je Zeile)
+    und Kursnamen in einer Liste. Kursnamen wiederholen sich über Kataloge
+    hinweg und werden daher interniert. Pro Kurs entsteht damit kein eigenes
+    Objekt mehr.
+
+    Noten-Kodierung in der Notenspalte:
+      - KEINE_NOTE (-1.0) => keine Note (None)
+      - ANGERECHNET (0.0) => angerechnet ('A')
+      - sonst            => Note (derselbe Float wie im Kurs-Objekt, sodass
+                            Export, Journal und Statistik verlustfrei bleiben)
+    Negative Noten lassen sich so nicht darstellen und werden abgelehnt
+    (siehe kodiere_note), statt stillschweigend zu "keine Note" zu werden.
+
+    Bietet dieselbe Schnittstelle wie KursListe (Iteration, finde,
+    anhaengen, aendere_kurscode); Iteration und finde liefern KursZeile-Sichten.
+    Der Kurscode-Index wird erst beim ersten Zugriff per Code aufgebaut, sodass
+    reine Auswertungen (Summen, Export) ohne ihn auskommen.
+    """
+    KEINE_NOTE = -1.0
+    ANGERECHNET = 0.0
+    __slots__ = ("kurscodes", "namen", "ects", "noten", "_index_cache", "version")
+
+    def __init__(self, kurse=()):
+        """
+        Legt die Tabelle an und übernimmt optional vorhandene Kurse.
+
+        :param kurse: Iterable von Kurs-Objekten (oder KursZeilen)
+        """
+        self.kurscodes = TextSpalte()
+        self.namen = []
+        self.ects = array("H")
+        self.noten = array("d")
+        self._index_cache = None
+        # Zählt jede Änderung am Bestand, auch über KursZeile (siehe StatistikCache)
+        self.version = 0
+        for k in kurse:
+            self.anhaengen(k)
+
+    def __iter__(self):
+        return (KursZeile(self, i) for i in range(len(self.kurscodes)))
+
+    def __len__(self):
+        return len(self.kurscodes)
+
+    def __getitem__(self, position):
+        if position < 0:
+            position += len(self.kurscodes)
+        if not 0 <= position < len(self.kurscodes):
+            raise IndexError(position)
+        return KursZeile(self, position)
+
+    def __contains__(self, kurscode):
+        return kurscode in self._index
+
+    @staticmethod
+    def kodiere_note(note):
+        """
+        Wandelt eine Note in den Wert der Notenspalte um.
+
+        :param note: Float, 0.0 für angerechnet oder None
+        :return: Float für array('d'); KEINE_NOTE für None
+        :raises ValueError: bei negativen Noten (nicht von KEINE_NOTE unterscheidbar)
+        """
+        if note is None:
+            return KursTabelle.KEINE_NOTE
+        if not note >= 0:
+            raise ValueError(f"Ungültige Note {note!r}: Noten dürfen nicht negativ sein")
+        # -0.0 als 0.0 speichern: Service wertet das Vorzeichenbit direkt aus
+        return note + 0.0
+
+    @staticmethod
+    def kodiere_ects(ects):
+        """
+        Wandelt ECTS in den Wert der ECTS-Spalte um.
+
+        :param ects: ECTS als String oder int
+        :return: int für array('H')
+        :raises ValueError: wenn ects nicht zwischen 0 und MAX_ECTS liegt
+        """
+        ects = int(ects)
+        if not 0 <= ects <= MAX_ECTS:
+            raise ValueError(f"Ungültige ECTS {ects}: erlaubt sind 0 bis {MAX_ECTS}")
+        return ects
+
+    @property
+    def _index(self):
+        """
+        Kurscode -> Zeilennummer; wird bei Bedarf einmalig aufgebaut.
+        """
+        if self._index_cache is None:
+            index = {c: i for i, c in enumerate(self.kurscodes)}
+            if len(index) != len(self.kurscodes):
+                raise ValueError("KursTabelle enthält doppelte Kurscodes")
+            self._index_cache = index
+        return self._index_cache
+
+    def anhaengen(self, kurs):
+        """
+        Fügt einen Kurs am Ende hinzu.
+
+        :param kurs: Kurs-Objekt (oder KursZeile)
+        :raises ValueError: wenn der Kurscode bereits vergeben ist
+                            (geprüft, sobald der Index aufgebaut ist)
+        """
+        self.anhaengen_werte(kurs.kurscode, kurs.name, kurs.ects, kurs.note)
+
+    def anhaengen_werte(self, kurscode, name, ects, note):
+        """
+        Fügt einen Kurs aus Einzelwerten hinzu, ohne ein Kurs-Objekt zu erzeugen.
+
+        :param kurscode: z. B. "MAT01"
+        :param name: Kursname
+        :param ects: ECTS (int)
+        :param note: Float, 0.0 für angerechnet oder None
+        :raises ValueError: wenn der Kurscode bereits vergeben ist
+                            (geprüft, sobald der Index aufgebaut ist),
+                            die Note negativ ist oder die ECTS nicht in
+                            die ECTS-Spalte passen
+        """
+        note = KursTabelle.kodiere_note(note)
+        ects = KursTabelle.kodiere_ects(ects)
+        if self._index_cache is not None:
+            if kurscode in self._index_cache:
+                raise ValueError(f"Kurscode '{kurscode}' ist bereits vergeben")
+            self._index_cache[kurscode] = len(self.kurscodes)
+        self.kurscodes.append(kurscode)
+        self.namen.append(sys.intern(name))
+        self.ects.append(ects)
+        self.noten.append(note)
+        self.version += 1
+
+    def finde(self, kurscode):
+        """
+        Sucht einen Kurs anhand seines Codes.
+
+        :param kurscode: z. B. "MAT01"
+        :return: KursZeile oder None
+        """
+        i = self._index.get(kurscode)
+        return None if i is None else KursZeile(self, i)
+
+    def aendere_kurscode(self, alter_kurscode, neuer_kurscode):
+        """
+        Ändert den Kurscode eines Kurses und passt den Index an.
+
+        :param alter_kurscode: Bisheriger Code
+        :param neuer_kurscode: Neuer Code
+        :return: True bei Erfolg, False wenn der alte Code nicht existiert
+                 oder der neue bereits vergeben ist
+        """
+        i = self._index.get(alter_kurscode)
+        if i is None:
+            return False
+        if neuer_kurscode == alter_kurscode:
+            return True
+        if neuer_kurscode in self._index:
+            return False
+        del self._index[alter_kurscode]
+        self.kurscodes[i] = neuer_kurscode
+        self._index[neuer_kurscode] = i
+        self.version += 1
+        return True
+
+    def entferne(self, kurscode):
+        """
+        Entfernt einen Kurs aus der Tabelle. Die Zeilennummern dahinter
+        verschieben sich, daher wird der Index beim nächsten Zugriff neu aufgebaut.
+
+        :param kurscode: Code des zu entfernenden Kurses
+        :return: Kopie des entfernten Kurses (Kurs-Objekt) oder None
+        """
+        i = self._index.get(kurscode)
+        if i is None:
+            return None
+        kurs = KursZeile(self, i).als_kurs()
+        del self.kurscodes[i], self.namen[i], self.ects[i], self.noten[i]
+        self._index_cache = None
+        self.version += 1
+        return kurs
+
+    def markiere_geaendert(self):
+        """
+        Erhöht die Version, nachdem die Spalten direkt (nicht über KursZeile)
+        geändert wurden.
+        """
+        self.version += 1
+
+    def spalten(self):
+        """
+        Gibt die ECTS- und Notenspalte für vektorisierte Auswertungen zurück
+        (siehe Service.berechne_ects / Service.berechne_durchschnitt).
+
+        :return: Tupel (ects: array('H'), noten: array('d'))
+        """
+        return self.ects, self.noten
+
+    def note_an(self, i):
+        """
+        :param i: Zeilennummer
+        :return: Note der Zeile als Float, 0.0 (angerechnet) oder None
+        """
+        n = self.noten[i]
+        return None if n < 0 else n
+
+
+class KursZeile:
+    """
+    Leichtgewichtige Sicht (__slots__) auf eine Zeile einer KursTabelle.
+    Verhält sich wie ein Kurs-Objekt; Änderungen an name, ects und note
+    werden direkt in die Spalten der Tabelle geschrieben. Der Kurscode
+    wird über KursTabelle.aendere_kurscode geändert, damit der Index stimmt.
+    """
+    __slots__ = ("_tabelle", "_i")
+
+    def __init__(self, tabelle, i):
+        self._tabelle = tabelle
+        self._i = i
+
+    @property
+    def kurscode(self):
+        return self._tabelle.kurscodes[self._i]
+
+    @property
+    def name(self):
+        return self._tabelle.namen[self._i]
+
+    @name.setter
+    def name(self, wert):
+        self._tabelle.namen[self._i] = sys.intern(wert)
+        self._tabelle.version += 1
+
+    @property
+    def ects(self):
+        return self._tabelle.ects[self._i]
+
+    @ects.setter
+    def ects(self, wert):
+        self._tabelle.ects[self._i] = KursTabelle.kodiere_ects(wert)
+        self._tabelle.version += 1
+
+    @property
+    def note(self):
+        return self._tabelle.note_an(self._i)
+
+    @note.setter
+    def note(self, wert):
+        self._tabelle.noten[self._i] = KursTabelle.kodiere_note(wert)
+        self._tabelle.version += 1
+
+    def __eq__(self, other):
+        return (isinstance(other, KursZeile)
+                and other._tabelle is self._tabelle and other._i == self._i)
+
+    def __hash__(self):
+        return hash((id(self._tabelle), self._i))
+
+    def als_kurs(self):
+        """
+        Erzeugt eine unabhängige Kopie als Kurs-Objekt (z. B. für Snapshots).
+
+        :return: Kurs-Objekt mit den aktuellen Werten der Zeile
+        """
+        k = Kurs(self.kurscode, self.name, self.ects)
+        k.note = self.note
+        return k
+
+    __copy__ = als_kurs
+
+
+class KursKatalog:
+    """
+    Gemeinsame Kursstammdaten (Kurscode, Kursname, ECTS) für viele Studierende.
+    Jede verschiedene Kombination wird genau einmal gespeichert; eine
+    NotenTabelle verweist nur per Katalog-Index darauf. Weicht ein Studierender
+    bei Kursname oder ECTS ab, entsteht dafür ein eigener Eintrag, sodass
+    beim Zurückschreiben nichts verloren geht.
+    """
+
+    def __init__(self):
+        self.kurscodes = []
+        self.namen = []
+        self.ects = array("H")
+        # (Kurscode, Kursname, ECTS) -> Katalog-Index
+        self._index = {}
+
+    def __len__(self):
+        return len(self.kurscodes)
+
+    def eintrag(self, kurscode, name, ects):
+        """
+        Liefert den Index eines Katalog-Eintrags und legt ihn bei Bedarf an.
+
+        :param kurscode: z. B. "MAT01"
+        :param name: Kursname
+        :param ects: ECTS als String oder int
+        :return: Katalog-Index (int)
+        :raises ValueError: wenn die ECTS nicht in die ECTS-Spalte passen
+        """
+        ects = KursTabelle.kodiere_ects(ects)
+        schluessel = (kurscode, name, ects)
+        i = self._index.get(schluessel)
+        if i is None:
+            i = self._index[schluessel] = len(self.kurscodes)
+            self.kurscodes.append(kurscode)
+            self.namen.append(sys.intern(name))
+            self.ects.append(ects)
+        return i
+
+
+class NotenTabelle:
+    """
+    Kompakte Kurse eines Studierenden: je Kurs nur der Index in einen
+    gemeinsamen KursKatalog (array('I')) und die Note (array('d'), kodiert
+    wie in KursTabelle). Kurscode, Kursname und ECTS werden nicht je
+    Studierendem gespeichert, sondern aus dem Katalog gelesen.
+
+    Bietet dieselbe Schnittstelle wie KursTabelle (Iteration, finde, anhaengen,
+    aendere_kurscode, entferne, spalten), sodass Service, KursJournal und
+    KursRepository.speichere_kurse unverändert damit arbeiten.
+    """
+    KEINE_NOTE = KursTabelle.KEINE_NOTE
+
+    def __init__(self, katalog, kurse=()):
+        """
+        :param katalog: Gemeinsamer KursKatalog
+        :param kurse: Iterable von Kurs-Objekten (oder KursZeilen)
+        """
+        self.katalog = katalog
+        self.indizes = array("I")
+        self.noten = array("d")
+        self._index_cache = None
+        self.version = 0
+        for k in kurse:
+            self.anhaengen(k)
+
+    def __iter__(self):
+        return (NotenZeile(self, i) for i in range(len(self.indizes)))
+
+    def __len__(self):
+        return len(self.indizes)
+
+    def __getitem__(self, position):
+        if position < 0:
+            position += len(self.indizes)
+        if not 0 <= position < len(self.indizes):
+            raise IndexError(position)
+        return NotenZeile(self, position)
+
+    def __contains__(self, kurscode):
+        return kurscode in self._index
+
+    @property
+    def _index(self):
+        """
+        Kurscode -> Zeilennummer; wird bei Bedarf einmalig aufgebaut.
+        """
+        if self._index_cache is None:
+            codes = self.katalog.kurscodes
+            index = {codes[k]: i for i, k in enumerate(self.indizes)}
+            if len(index) != len(self.indizes):
+                raise ValueError("NotenTabelle enthält doppelte Kurscodes")
+            self._index_cache = index
+        return self._index_cache
+
+    def anhaengen(self, kurs):
+        """
+        Fügt einen Kurs am Ende hinzu (Stammdaten gehen in den Katalog).
+
+        :param kurs: Kurs-Objekt (oder KursZeile)
+        :raises ValueError: wenn der Kurscode bereits vergeben ist
+                            (geprüft, sobald der Index aufgebaut ist)
+        """
+        self.anhaengen_werte(kurs.kurscode, kurs.name, kurs.ects, kurs.note)
+
+    def anhaengen_werte(self, kurscode, name, ects, note):
+        """
+        Fügt einen Kurs aus Einzelwerten hinzu.
+
+        :param kurscode: z. B. "MAT01"
+        :param name: Kursname
+        :param ects: ECTS (int oder String)
+        :param note: Float, 0.0 für angerechnet oder None
+        :raises ValueError: wenn der Kurscode bereits vergeben ist
+                            (geprüft, sobald der Index aufgebaut ist),
+                            die Note negativ ist oder die ECTS nicht in
+                            die ECTS-Spalte passen
+        """
+        note = KursTabelle.kodiere_note(note)
+        if self._index_cache is not None and kurscode in self._index_cache:
+            raise ValueError(f"Kurscode '{kurscode}' ist bereits vergeben")
+        eintrag = self.katalog.eintrag(kurscode, name, ects)
+        if self._index_cache is not None:
+            self._index_cache[kurscode] = len(self.indizes)
+        self.indizes.append(eintrag)
+        self.noten.append(note)
+        self.version += 1
+
+    def finde(self, kurscode):
+        """
+        Sucht einen Kurs anhand seines Codes.
+
+        :param kurscode: z. B. "MAT01"
+        :return: NotenZeile oder None
+        """
+        i = self._index.get(kurscode)
+        return None if i is None else NotenZeile(self, i)
+
+    def aendere_kurscode(self, alter_kurscode, neuer_kurscode):
+        """
+        Ändert den Kurscode eines Kurses (verweist auf einen anderen
+        Katalog-Eintrag) und passt den Index an.
+
+        :param alter_kurscode: Bisheriger Code
+        :param neuer_kurscode: Neuer Code
+        :return: True bei Erfolg, False wenn der alte Code nicht existiert
+                 oder der neue bereits vergeben ist
+        """
+        i = self._index.get(alter_kurscode)
+        if i is None:
+            return False
+        if neuer_kurscode == alter_kurscode:
+            return True
+        if neuer_kurscode in self._index:
+            return False
+        zeile = NotenZeile(self, i)
+        self._verweise(i, neuer_kurscode, zeile.name, zeile.ects)
+        del self._index[alter_kurscode]
+        self._index[neuer_kurscode] = i
+        return True
+
+    def _verweise(self, i, kurscode, name, ects):
+        """
+        Lässt Zeile i auf den Katalog-Eintrag mit den angegebenen Stammdaten zeigen.
+        """
+        self.indizes[i] = self.katalog.eintrag(kurscode, name, ects)
+        self.version += 1
+
+    def entferne(self, kurscode):
+        """
+        Entfernt einen Kurs; der Katalog-Eintrag bleibt für andere erhalten.
+
+        :param kurscode: Code des zu entfernenden Kurses
+        :return: Kopie des entfernten Kurses (Kurs-Objekt) oder None
+        """
+        i = self._index.get(kurscode)
+        if i is None:
+            return None
+        kurs = NotenZeile(self, i).als_kurs()
+        del self.indizes[i], self.noten[i]
+        self._index_cache = None
+        self.version += 1
+        return kurs
+
+    def markiere_geaendert(self):
+        """
+        Erhöht die Version, nachdem die Spalten direkt (nicht über NotenZeile)
+        geändert wurden.
+        """
+        self.version += 1
+
+    def spalten(self):
+        """
+        Gibt ECTS- und Notenspalte für die vektorisierten Auswertungen in
+        Service zurück; die ECTS werden dazu aus dem Katalog zusammengestellt.
+
+        :return: Tupel (ects: array('H'), noten: array('d'))
+        """
+        return array("H", map(self.katalog.ects.__getitem__, self.indizes)), self.noten
+
+    note_an = KursTabelle.note_an
+
+
+class NotenZeile(KursZeile):
+    """
+    Sicht auf eine Zeile einer NotenTabelle. Die Note wird wie bei KursZeile
+    direkt in die Tabelle geschrieben; Kursname und ECTS kommen aus dem
+    Katalog, eine Änderung verweist die Zeile auf einen passenden Eintrag.
+    """
+    __slots__ = ()
+
+    @property
+    def kurscode(self):
+        t = self._tabelle
+        return t.katalog.kurscodes[t.indizes[self._i]]
+
+    @property
+    def name(self):
+        t = self._tabelle
+        return t.katalog.namen[t.indizes[self._i]]
+
+    @name.setter
+    def name(self, wert):
+        self._tabelle._verweise(self._i, self.kurscode, wert, self.ects)
+
+    @property
+    def ects(self):
+        t = self._tabelle
+        return t.katalog.ects[t.indizes[self._i]]
+
+    @ects.setter
+    def ects(self, wert):
+        self._tabelle._verweise(self._i, self.kurscode, self.name, wert)
+
+
+class SnapshotCache:
+    """
+    Binärer Zwischenspeicher (marshal) für bereits geparste CSV-Daten, abgelegt
+    neben der CSV als "<datei>.cache". Der Snapshot gilt, solange Pfad, Größe
+    und Änderungszeit der CSV übereinstimmen; die CSV wird dafür nicht gelesen.
+    Weicht nur die Änderungszeit ab (z. B. nach einem Kopieren oder "touch"),
+    entscheidet der Inhalts-Hash. Sonst wird die CSV normal geparst und der
+    Snapshot neu geschrieben.
+    """
+    VERSION = 1
+    ENDUNG = ".cache"
+
+    @staticmethod
+    def _kennung(dateipfad):
+        """
+        Ermittelt Pfad, Größe und Änderungszeit der CSV (ohne sie zu lesen).
+        """
+        st = os.stat(dateipfad)
+        return os.path.abspath(dateipfad), st.st_size, st.st_mtime_ns
+
+    @staticmethod
+    def _hash(dateipfad):
+        """
+        Inhalts-Hash der CSV (BLAKE2b).
+        """
+        h = hashlib.blake2b(digest_size=16)
+        with open(dateipfad, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        return h.digest()
+
+    @staticmethod
+    def lade(dateipfad, art):
+        """
+        Liefert die zwischengespeicherten Daten, wenn der Snapshot zur CSV passt.
+
+        :param dateipfad: Pfad zur CSV-Datei
+        :param art: Art der Daten, z. B. "kurse" oder "student"
+        :return: Gespeicherte Nutzdaten oder None, wenn kein gültiger Snapshot existiert
+        """
+        try:
+            # Erst komplett lesen: marshal.load() liest aus Dateien in sehr kleinen Stücken
+            with open(dateipfad + SnapshotCache.ENDUNG, "rb") as f:
+                version, gespeicherte_art, kennung, inhalt_hash, daten = marshal.loads(f.read())
+            if version != SnapshotCache.VERSION or gespeicherte_art != art:
+                return None
+            aktuell = SnapshotCache._kennung(dateipfad)
+            if kennung == aktuell:
+                return daten
+            # Andere Datei oder Größe: sicher ein anderer Inhalt. Nur bei gleicher
+            # Größe und anderer Änderungszeit lohnt der Vergleich des Inhalts-Hash.
+            if kennung[:2] != aktuell[:2]:
+                return None
+            if inhalt_hash != SnapshotCache._hash(dateipfad):
+                return None
+            # Kennung auffrischen, damit der nächste Start ohne Hash auskommt
+            SnapshotCache.speichere(dateipfad, art, daten, inhalt_hash)
+            return daten
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+    @staticmethod
+    def speichere(dateipfad, art, daten, inhalt_hash=None):
+        """
+        Schreibt einen Snapshot für den aktuellen Stand der CSV-Datei.
+        Fehler beim Schreiben werden ignoriert, da der Cache nur beschleunigt.
+
+        :param dateipfad: Pfad zur CSV-Datei
+        :param art: Art der Daten, z. B. "kurse" oder "student"
+        :param daten: Mit marshal serialisierbare Nutzdaten
+        :param inhalt_hash: Bereits berechneter Inhalts-Hash oder None
+        """
+        ziel = dateipfad + SnapshotCache.ENDUNG
+        tmp_pfad = ziel + ".tmp"
+        try:
+            eintrag = (SnapshotCache.VERSION, art, SnapshotCache._kennung(dateipfad),
+                       inhalt_hash or SnapshotCache._hash(dateipfad), daten)
+            with open(tmp_pfad, "wb") as f:
+                f.write(marshal.dumps(eintrag))
+            os.replace(tmp_pfad, ziel)
+        except OSError:
+            pass
 
 
 class KursRepository:
@@ -58,47 +1011,385 @@ class KursRepository:
     HEADERS = ["Kurscode", "Kursname", "ECTS", "Note"]
 
     @staticmethod
-    def lade_kurse(dateipfad):
+    def lade_kurse(dateipfad, cache=False):
         """
-        Liest Kursdaten aus einer CSV-Datei und gibt sie als Liste von Kurs-Objekten zurück.
+        Liest Kursdaten aus einer CSV-Datei und gibt sie als KursListe zurück.
 
         :param dateipfad: Pfad zur CSV-Datei, z. B. "CSV/kurse.csv"
-        :return: Liste von Kurs-Objekten
+        :param cache: True, um einen gültigen SnapshotCache zu nutzen bzw. anzulegen
+        :return: KursListe mit allen Kurs-Objekten (mit cache eine
+                 SpaltenKursListe, sofern die Werte in die Spalten passen)
+        :raises ValueError: wenn ein Kurscode mehrfach vorkommt
         """
-        kurse = []
-        with open(dateipfad, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                k = Kurs(
-                    kurscode=row["Kurscode"],
-                    name=row["Kursname"],
-                    ects=row["ECTS"],
-                    note=row["Note"]
-                )
-                kurse.append(k)
+        if cache:
+            spalten = KursRepository._lade_spalten(dateipfad)
+            if spalten is not None:
+                # Kurs-Objekte entstehen erst beim Zugriff auf die jeweilige Zeile
+                return SpaltenKursListe(*spalten)
+
+        kurse = KursListe()
+        for block in KursRepository.iter_kurse(dateipfad):
+            for k in block:
+                kurse.anhaengen(k)
         return kurse
 
+    @staticmethod
+    def _lade_spalten(dateipfad):
+        """
+        Liefert die Kursdaten spaltenweise (Codes, Namen, ECTS, Noten mit -1.0
+        für "keine Note") aus dem SnapshotCache oder, falls dieser veraltet ist,
+        aus der CSV; im zweiten Fall wird der Snapshot neu geschrieben.
+        None, wenn eine Zeile nicht in die Spalten passt (z. B. ECTS über
+        MAX_ECTS); der Aufrufer liest die Datei dann über Kurs-Objekte.
+        """
+        daten = SnapshotCache.lade(dateipfad, "kurse")
+        if daten is not None:
+            codes, namen, ects_bytes, noten_bytes = daten
+            ects, noten = array("H"), array("d")
+            ects.frombytes(ects_bytes)
+            noten.frombytes(noten_bytes)
+            return codes, [sys.intern(n) for n in namen], ects, noten
+
+        codes, namen, ects, noten = [], [], array("H"), array("d")
+        try:
+            for code, name, e, note in KursRepository._iter_zeilen(dateipfad):
+                ects.append(KursTabelle.kodiere_ects(e))
+                noten.append(KursTabelle.kodiere_note(Kurs.note_aus_text(note)))
+                codes.append(code)
+                namen.append(sys.intern(name))
+        except ValueError:
+            return None
+        SnapshotCache.speichere(dateipfad, "kurse",
+                                (codes, namen, ects.tobytes(), noten.tobytes()))
+        return codes, namen, ects, noten
+
+    @staticmethod
+    def iter_kurse(dateipfad, chunk_size=1000):
+        """
+        Liest Kursdaten blockweise aus einer (optional gzip-komprimierten) CSV-Datei.
+        Die Kopfzeile wird einmal ausgewertet, danach werden die Spalten per
+        Position statt über ein Dict pro Zeile gelesen. So können Aufrufer
+        Statistiken falten oder die GUI schrittweise füllen, ohne die ganze
+        Datei im Speicher zu halten.
+
+        :param dateipfad: Pfad zur CSV-Datei, z. B. "CSV/kurse.csv" oder "export.csv.gz"
+        :param chunk_size: Anzahl Kurse pro Block
+        :return: Generator, der Listen von Kurs-Objekten liefert
+        :raises ValueError: wenn eine Pflichtspalte in der Kopfzeile fehlt
+        """
+        block = []
+        for code, name, ects, note in KursRepository._iter_zeilen(dateipfad):
+            block.append(Kurs(code, name, ects, note))
+            if len(block) >= chunk_size:
+                yield block
+                block = []
+        if block:
+            yield block
+
+    @staticmethod
+    def lade_kurstabelle(dateipfad, cache=False):
+        """
+        Liest Kursdaten direkt in eine spaltenorientierte KursTabelle,
+        ohne Kurs-Objekte zu erzeugen.
+
+        :param dateipfad: Pfad zur CSV-Datei, z. B. "CSV/kurse.csv"
+        :param cache: True, um einen gültigen SnapshotCache zu nutzen bzw. anzulegen
+        :return: KursTabelle mit allen Kursen (doppelte Kurscodes fallen
+                 beim ersten Zugriff per Kurscode als ValueError auf); passt
+                 eine Zeile nicht in die Spalten (z. B. ECTS über MAX_ECTS),
+                 eine KursListe wie von lade_kurse
+        """
+        spalten = KursRepository._lade_spalten(dateipfad) if cache else None
+        if spalten is not None:
+            codes, namen, ects, noten = spalten
+            tabelle = KursTabelle()
+            tabelle.kurscodes = TextSpalte(codes)
+            tabelle.namen = namen
+            tabelle.ects = ects
+            tabelle.noten = noten
+            return tabelle
+
+        tabelle = KursTabelle()
+        try:
+            for code, name, ects, note in KursRepository._iter_zeilen(dateipfad):
+                tabelle.anhaengen_werte(code, name, ects, Kurs.note_aus_text(note))
+        except ValueError:
+            return KursRepository.lade_kurse(dateipfad)
+        return tabelle
+
+    @staticmethod
+    def lade_notentabelle(dateipfad, katalog):
+        """
+        Liest Kursdaten in eine kompakte NotenTabelle. Kurscode, Kursname und
+        ECTS werden im gemeinsamen Katalog nachgeschlagen bzw. dort einmalig
+        angelegt; je Kurs bleiben nur Katalog-Index und Note.
+
+        :param dateipfad: Pfad zur CSV-Datei, z. B. "CSV/kurse.csv"
+        :param katalog: KursKatalog, der über viele Dateien geteilt wird
+        :return: NotenTabelle (doppelte Kurscodes fallen beim ersten
+                 Zugriff per Kurscode als ValueError auf)
+        """
+        tabelle = NotenTabelle(katalog)
+        eintrag = katalog.eintrag
+        indizes, noten = tabelle.indizes, tabelle.noten
+        for code, name, ects, note in KursRepository._iter_zeilen(dateipfad):
+            indizes.append(eintrag(code, name, ects))
+            noten.append(KursTabelle.kodiere_note(Kurs.note_aus_text(note)))
+        return tabelle
+
+    @staticmethod
+    def _iter_zeilen(dateipfad):
+        """
+        Liefert die Rohwerte (Kurscode, Kursname, ECTS, Note) jeder Zeile,
+        per Spaltenposition aus der einmal gelesenen Kopfzeile.
+        """
+        with KursRepository._oeffne(dateipfad) as f:
+            reader = csv.reader(f)
+            kopf = next(reader, None)
+            if kopf is None:
+                return
+            try:
+                i_code, i_name, i_ects, i_note = (kopf.index(h) for h in KursRepository.HEADERS)
+            except ValueError:
+                raise ValueError(f"{dateipfad}: Kopfzeile muss {KursRepository.HEADERS} enthalten")
+
+            breite = len(kopf)
+            for row in reader:
+                if not row:
+                    continue
+                if len(row) < breite:
+                    # Fehlende Spalten am Zeilenende wie DictReader als leer werten
+                    row += [""] * (breite - len(row))
+                yield row[i_code], row[i_name], row[i_ects], row[i_note]
+
+    @staticmethod
+    def _oeffne(dateipfad):
+        """
+        Öffnet eine CSV-Datei zum Lesen. Gzip-Dateien werden an ihren
+        Magic-Bytes erkannt und beim Lesen entpackt.
+        """
+        with open(dateipfad, "rb") as f:
+            gzip_datei = f.read(2) == b"\x1f\x8b"
+        if gzip_datei:
+            return gzip.open(dateipfad, "rt", newline="", encoding="utf-8")
+        return open(dateipfad, newline="", encoding="utf-8")
+
     @staticmethod
     def speichere_kurse(dateipfad, kurse):
         """
-        Schreibt eine Liste von Kurs-Objekten in eine CSV-Datei.
+        Schreibt Kurse (KursListe, KursTabelle oder Liste) in eine CSV-Datei.
         Falls eine Note 0.0 ist, wird "A" in die CSV geschrieben.
+        Es wird zuerst in eine temporäre Datei geschrieben, die anschließend
+        atomar umbenannt wird, damit ein Absturz keine halbe Datei hinterlässt.
 
         :param dateipfad: Pfad zur CSV-Datei, z. B. "CSV/kurse.csv"
         :param kurse: Liste von Kurs-Objekten
         """
-        with open(dateipfad, "w", newline="", encoding="utf-8") as f:
+        tmp_pfad = dateipfad + ".tmp"
+        with open(tmp_pfad, "w", newline="", encoding="utf-8") as f:
             writer = csv.DictWriter(f, fieldnames=KursRepository.HEADERS)
             writer.writeheader()
             for k in kurse:
-                # 0.0 wird im System als angerechnet ("A") dargestellt
-                n = "A" if k.note == 0.0 else (k.note if k.note is not None else "")
                 writer.writerow({
                     "Kurscode": k.kurscode,
                     "Kursname": k.name,
                     "ECTS": k.ects,
-                    "Note": n
+                    "Note": KursRepository.note_als_text(k.note)
                 })
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_pfad, dateipfad)
+
+    @staticmethod
+    def note_als_text(note):
+        """
+        Wandelt eine interne Note in ihre CSV-Darstellung um.
+        0.0 wird im System als angerechnet ("A") dargestellt.
+
+        :param note: Float, 0.0 oder None
+        :return: "A", "" oder die Note
+        """
+        if note == 0.0:
+            return "A"
+        return note if note is not None else ""
+
+
+class KursJournal:
+    """
+    Append-only Änderungsprotokoll neben der Kurs-CSV (z. B. "CSV/kurse.csv.journal").
+    Jede Änderung wird als kleine CSV-Zeile (Kurscode, Feld, Wert, bisheriger
+    Wert) angehängt, statt die komplette Kursdatei neu zu schreiben. Beim
+    Laden wird das Journal auf die Basis-CSV angewendet.
+
+    Ein Eintrag greift nur, solange die Basis-CSV im Feld noch den bisherigen
+    Wert enthält. Hat ein anderes Programm die CSV inzwischen neu geschrieben
+    und das Feld dabei geändert, gewinnt dessen Wert, statt vom Journal
+    stillschweigend zurückgedreht zu werden.
+
+    Überschreitet das Journal die Größenschwelle, wird es in eine frische
+    Basis-CSV verdichtet: Das Journal wird dazu nach "<journal>.alt" rotiert,
+    die CSV im Hintergrund über eine temporäre Datei atomar ersetzt und erst
+    danach die rotierte Datei gelöscht. Neue Änderungen landen währenddessen
+    bereits wieder im frischen Journal.
+    """
+    FELDER = ("Kurscode", "Kursname", "ECTS", "Note")
+    SCHWELLE = 64 * 1024
+
+    def __init__(self, csv_pfad, schwelle=SCHWELLE):
+        """
+        :param csv_pfad: Pfad zur Basis-CSV, z. B. "CSV/kurse.csv"
+        :param schwelle: Journalgröße in Bytes, ab der verdichtet wird
+        """
+        self.csv_pfad = csv_pfad
+        self.pfad = csv_pfad + ".journal"
+        self.alt_pfad = self.pfad + ".alt"
+        self.schwelle = schwelle
+        self._verdichtung = None
+
+    def lade_kurse(self, cache=False):
+        """
+        Lädt die Basis-CSV und wendet anschließend alle Journal-Einträge an.
+
+        :param cache: True, um die Basis-CSV über den SnapshotCache zu laden
+        :return: KursListe mit dem aktuellen Stand
+        """
+        kurse = KursRepository.lade_kurse(self.csv_pfad, cache)
+        self.wiedergeben(kurse)
+        return kurse
+
+    def wiedergeben(self, kurse):
+        """
+        Wendet die Einträge aus rotiertem und aktuellem Journal (in dieser
+        Reihenfolge) auf die Kurse an. Unvollständige Zeilen, etwa nach einem
+        Absturz mitten im Schreiben, Einträge zu unbekannten Kursen und
+        Einträge, deren bisheriger Wert nicht mehr zum Kurs passt (extern
+        überholt), werden übersprungen.
+
+        :param kurse: KursListe, die verändert wird
+        :return: Anzahl der übersprungenen, extern überholten Einträge
+        """
+        ueberholt = 0
+        for pfad in (self.alt_pfad, self.pfad):
+            if not os.path.exists(pfad):
+                continue
+            with open(pfad, newline="", encoding="utf-8") as f:
+                for row in csv.reader(f):
+                    # Drei Spalten: Journal aus älteren Versionen ohne bisherigen Wert
+                    if len(row) in (3, 4) and not self._anwenden(kurse, *row):
+                        ueberholt += 1
+        return ueberholt
+
+    @staticmethod
+    def _anwenden(kurse, kurscode, feld, wert, bisher=None):
+        """
+        Wendet einen einzelnen Journal-Eintrag an.
+
+        :return: False, wenn der Kurs im Feld nicht mehr den bisherigen Wert hat
+        """
+        if feld == "Kurscode":
+            kurse.aendere_kurscode(kurscode, wert)
+            return True
+        k = kurse.finde(kurscode)
+        if k is None:
+            return True
+        try:
+            if feld == "Kursname":
+                if bisher is not None and k.name != bisher:
+                    return False
+                k.name = wert
+            elif feld == "ECTS":
+                if bisher is not None and k.ects != int(bisher):
+                    return False
+                k.ects = Kurs.pruefe_ects(wert)
+            elif feld == "Note":
+                if bisher is not None and k.note != Kurs.note_aus_text(bisher):
+                    return False
+                k.note = Kurs.note_aus_text(wert)
+        except ValueError:
+            pass
+        return True
+
+    def protokolliere(self, aenderungen):
+        """
+        Hängt Änderungen an das Journal an.
+
+        :param aenderungen: Liste von Tupeln (Kurscode, Feld, Wert, bisheriger
+                            Wert); Feld ist einer der CSV-Spaltennamen aus
+                            FELDER, Kurscode der Code des Kurses vor dieser
+                            Änderung
+        """
+        with open(self.pfad, "a", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            for kurscode, feld, wert, bisher in aenderungen:
+                if feld == "Note":
+                    wert = KursRepository.note_als_text(wert)
+                    bisher = KursRepository.note_als_text(bisher)
+                writer.writerow((kurscode, feld, wert, bisher))
+
+    def muss_verdichten(self):
+        """
+        :return: True, wenn das Journal die Größenschwelle erreicht hat
+        """
+        try:
+            return os.path.getsize(self.pfad) >= self.schwelle
+        except OSError:
+            return False
+
+    def ist_leer(self):
+        """
+        :return: True, wenn weder das Journal noch ein rotiertes Journal Einträge enthält
+        """
+        for pfad in (self.pfad, self.alt_pfad):
+            try:
+                if os.path.getsize(pfad) > 0:
+                    return False
+            except OSError:
+                pass
+        return True
+
+    def verdichte(self, kurse, im_hintergrund=True):
+        """
+        Schreibt den aktuellen Stand als neue Basis-CSV und leert das Journal.
+        Der Stand wird sofort kopiert, sodass die Kurse danach gefahrlos
+        weiter verändert werden können.
+
+        :param kurse: Aktueller, vollständiger Kursbestand
+        :param im_hintergrund: True, um die CSV in einem Thread zu schreiben
+        """
+        self.warte()
+        stand = [copy.copy(k) for k in kurse]
+
+        if os.path.exists(self.alt_pfad):
+            # Rest einer abgebrochenen Verdichtung: Journal an die rotierte Datei anhängen
+            if os.path.exists(self.pfad):
+                with open(self.pfad, encoding="utf-8") as quelle, \
+                        open(self.alt_pfad, "a", encoding="utf-8") as ziel:
+                    ziel.write(quelle.read())
+                os.remove(self.pfad)
+        elif os.path.exists(self.pfad):
+            os.replace(self.pfad, self.alt_pfad)
+
+        if im_hintergrund:
+            self._verdichtung = threading.Thread(target=self._schreibe_basis, args=(stand,))
+            self._verdichtung.start()
+        else:
+            self._schreibe_basis(stand)
+
+    def _schreibe_basis(self, stand):
+        """
+        Ersetzt die Basis-CSV atomar und verwirft danach das rotierte Journal.
+        """
+        KursRepository.speichere_kurse(self.csv_pfad, stand)
+        if os.path.exists(self.alt_pfad):
+            os.remove(self.alt_pfad)
+
+    def warte(self):
+        """
+        Wartet, bis eine laufende Hintergrund-Verdichtung abgeschlossen ist.
+        """
+        if self._verdichtung is not None:
+            self._verdichtung.join()
+            self._verdichtung = None
 
 
 class StudentRepository:
@@ -108,14 +1399,23 @@ class StudentRepository:
     HEADERS = ["Name", "Studiengang", "Ziel-ECTS"]
 
     @staticmethod
-    def lade_student(dateipfad):
+    def lade_student(dateipfad, cache=False):
         """
         Liest einen Studenten aus der CSV-Datei. Ist die Datei leer oder unvollständig,
         wird None zurückgegeben.
 
         :param dateipfad: Pfad zur CSV-Datei, z. B. "CSV/student.csv"
+        :param cache: True, um einen gültigen SnapshotCache zu nutzen bzw. anzulegen
         :return: Ein Student-Objekt oder None
         """
+        if cache:
+            daten = SnapshotCache.lade(dateipfad, "student")
+            if daten is None:
+                student = StudentRepository.lade_student(dateipfad)
+                daten = (student.name, student.studiengang, student.ziel_ects) if student else ()
+                SnapshotCache.speichere(dateipfad, "student", daten)
+            return Student(*daten) if daten else None
+
         with open(dateipfad, newline="", encoding="utf-8") as f:
             reader = csv.DictReader(f)
             daten = next(reader, None)
@@ -143,3 +1443,72 @@ class StudentRepository:
                 "Studiengang": student.studiengang,
                 "Ziel-ECTS": student.ziel_ects
             })
+
+
+class NotenImportRepository:
+    """
+    Statische Methode zum Einlesen einer Notenliste (Kurscode, Note), z. B.
+    aus einem Transcript. Unterstützt CSV mit den Spalten "Kurscode" und "Note"
+    (weitere Spalten wie in einem Export werden ignoriert) sowie JSON als Liste
+    von Objekten mit diesen Schlüsseln oder als Objekt {Kurscode: Note}.
+    """
+    HEADERS = ["Kurscode", "Note"]
+
+    @staticmethod
+    def lade(dateipfad):
+        """
+        Liest die Einträge unverändert als Text, damit sie anschließend mit
+        denselben Regeln wie eine Benutzereingabe geprüft werden können.
+
+        :param dateipfad: Pfad zur CSV- oder JSON-Datei
+        :return: Liste von Tupeln (Zeile bzw. Position, Kurscode, Note als Text)
+        :raises ValueError: wenn die Datei nicht das erwartete Format hat
+        """
+        with open(dateipfad, encoding="utf-8-sig") as f:
+            inhalt = f.read()
+        if inhalt.lstrip()[:1] in ("[", "{"):
+            try:
+                daten = json.loads(inhalt)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{dateipfad}: ungültiges JSON ({e})")
+            return NotenImportRepository._aus_json(dateipfad, daten)
+
+        reader = csv.reader(inhalt.splitlines())
+        kopf = next(reader, None)
+        if kopf is None:
+            return []
+        try:
+            i_code, i_note = (kopf.index(h) for h in NotenImportRepository.HEADERS)
+        except ValueError:
+            raise ValueError(f"{dateipfad}: Kopfzeile muss {NotenImportRepository.HEADERS} enthalten")
+        eintraege = []
+        for zeile, row in enumerate(reader, start=2):
+            if not row:
+                continue
+            code = row[i_code] if i_code < len(row) else ""
+            note = row[i_note] if i_note < len(row) else ""
+            eintraege.append((zeile, code, note))
+        return eintraege
+
+    @staticmethod
+    def _aus_json(dateipfad, daten):
+        """
+        Wandelt die JSON-Varianten in Einträge um. Zahlen werden zu Text,
+        null zu "" (keine Note).
+        """
+        if isinstance(daten, dict):
+            paare = enumerate(daten.items(), start=1)
+        elif isinstance(daten, list):
+            paare = []
+            for position, objekt in enumerate(daten, start=1):
+                if not isinstance(objekt, dict):
+                    raise ValueError(f"{dateipfad}: Eintrag {position} ist kein Objekt")
+                paare.append((position, (objekt.get("Kurscode"), objekt.get("Note"))))
+        else:
+            raise ValueError(f"{dateipfad}: erwartet Liste oder Objekt")
+        eintraege = []
+        for position, (code, note) in paare:
+            if note is None:
+                note = ""
+            eintraege.append((position, "" if code is None else str(code), str(note)))
+        return eintraege
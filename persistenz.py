@@ -0,0 +1,248 @@
+import queue
+import threading
+from collections import deque
+
+from service import Service
+
+
+class SpeicherAuftrag:
+    """
+    Ein ausstehender Schreibauftrag des SpeicherWorkers.
+    """
+
+    def __init__(self, schluessel, funktion, daten):
+        """
+        :param schluessel: Art des Auftrags, z. B. "student" oder "journal"
+        :param funktion: Aufrufbare Funktion, die mit daten aufgerufen wird
+        :param daten: Snapshot der zu schreibenden Daten
+        """
+        self.schluessel = schluessel
+        self.funktion = funktion
+        self.daten = daten
+
+
+class SpeicherWorker:
+    """
+    Hintergrund-Thread, der Schreibaufträge abarbeitet, damit Speichervorgänge
+    nie die Tk-Ereignisschleife blockieren.
+
+    Aufträge enthalten Snapshots der Daten, nicht die Live-Objekte. Ein neuerer
+    Snapshot ersetzt einen noch nicht geschriebenen älteren mit demselben
+    Schlüssel (es wird also nur der neueste Stand geschrieben). Journal-Einträge
+    werden stattdessen an den letzten ausstehenden Auftrag angehängt, damit
+    keine Änderung verloren geht. Die Warteschlange ist begrenzt; ist sie voll,
+    wartet der Aufrufer, bis wieder Platz ist.
+
+    Ergebnisse (Erfolg oder Fehler) werden in einer Meldungs-Queue abgelegt,
+    die die View per after() abholt.
+    """
+    MAX_AUSSTEHEND = 16
+
+    def __init__(self, max_ausstehend=MAX_AUSSTEHEND):
+        """
+        Startet den Worker-Thread.
+
+        :param max_ausstehend: Maximale Anzahl ausstehender Aufträge
+        """
+        self.max_ausstehend = max_ausstehend
+        self._auftraege = deque()
+        self._bedingung = threading.Condition()
+        self._beschaeftigt = False
+        self._beendet = False
+        self._meldungen = queue.Queue()
+        self._thread = threading.Thread(target=self._lauf, name="SpeicherWorker", daemon=True)
+        self._thread.start()
+
+    def ersetze(self, schluessel, funktion, snapshot):
+        """
+        Reicht einen Snapshot ein. Ein noch ausstehender Auftrag mit demselben
+        Schlüssel wird durch den neueren Snapshot ersetzt.
+
+        :param schluessel: z. B. "student" oder "kurse"
+        :param funktion: Schreibfunktion, wird mit dem Snapshot aufgerufen
+        :param snapshot: Kopie der zu schreibenden Daten
+        """
+        with self._bedingung:
+            for auftrag in self._auftraege:
+                if auftrag.schluessel == schluessel:
+                    auftrag.funktion = funktion
+                    auftrag.daten = snapshot
+                    return
+            self._einreihen(SpeicherAuftrag(schluessel, funktion, snapshot))
+
+    def haenge_an(self, schluessel, funktion, eintraege):
+        """
+        Reicht Einträge ein, die alle geschrieben werden müssen (z. B. Journal-
+        Zeilen). Ist der letzte ausstehende Auftrag vom selben Schlüssel,
+        werden die Einträge dort angehängt, sonst entsteht ein neuer Auftrag.
+        So bleibt die Reihenfolge zu anderen Aufträgen erhalten.
+
+        :param schluessel: z. B. "journal"
+        :param funktion: Schreibfunktion, wird mit der Liste aller Einträge aufgerufen
+        :param eintraege: Liste von Einträgen
+        """
+        with self._bedingung:
+            if self._auftraege and self._auftraege[-1].schluessel == schluessel:
+                self._auftraege[-1].daten.extend(eintraege)
+                return
+            self._einreihen(SpeicherAuftrag(schluessel, funktion, list(eintraege)))
+
+    def ist_ausstehend(self, schluessel):
+        """
+        :return: True, wenn ein Auftrag mit diesem Schlüssel noch nicht begonnen wurde
+        """
+        with self._bedingung:
+            return any(a.schluessel == schluessel for a in self._auftraege)
+
+    def _einreihen(self, auftrag):
+        """
+        Hängt einen Auftrag an die Warteschlange an; wartet, solange sie voll ist.
+        Muss mit gehaltener Bedingung aufgerufen werden.
+        """
+        while len(self._auftraege) >= self.max_ausstehend and not self._beendet:
+            self._bedingung.wait()
+        self._auftraege.append(auftrag)
+        self._bedingung.notify_all()
+
+    def _lauf(self):
+        """
+        Arbeitsschleife des Threads: nimmt Aufträge in Reihenfolge entgegen
+        und meldet Erfolg oder Fehler.
+        """
+        while True:
+            with self._bedingung:
+                while not self._auftraege and not self._beendet:
+                    self._bedingung.wait()
+                if not self._auftraege:
+                    return
+                auftrag = self._auftraege.popleft()
+                self._beschaeftigt = True
+                self._bedingung.notify_all()
+            try:
+                auftrag.funktion(auftrag.daten)
+                self._meldungen.put((auftrag.schluessel, None))
+            except Exception as e:
+                self._meldungen.put((auftrag.schluessel, e))
+            finally:
+                with self._bedingung:
+                    self._beschaeftigt = False
+                    self._bedingung.notify_all()
+
+    def meldungen_abholen(self):
+        """
+        Holt alle seit dem letzten Aufruf abgeschlossenen Aufträge ab, ohne zu warten.
+
+        :return: Liste von Tupeln (Schlüssel, Fehler oder None)
+        """
+        meldungen = []
+        while True:
+            try:
+                meldungen.append(self._meldungen.get_nowait())
+            except queue.Empty:
+                return meldungen
+
+    def flush(self, timeout=None):
+        """
+        Wartet, bis alle ausstehenden Aufträge geschrieben sind.
+
+        :param timeout: Maximale Wartezeit in Sekunden oder None
+        :return: True, wenn alles geschrieben wurde
+        """
+        with self._bedingung:
+            return self._bedingung.wait_for(
+                lambda: not self._auftraege and not self._beschaeftigt, timeout
+            )
+
+    def beenden(self, timeout=None):
+        """
+        Schreibt alle ausstehenden Aufträge und beendet den Thread.
+
+        :param timeout: Maximale Wartezeit in Sekunden oder None
+        """
+        self.flush(timeout)
+        with self._bedingung:
+            self._beendet = True
+            self._bedingung.notify_all()
+        self._thread.join(timeout)
+
+
+class AenderungsWaechter:
+    """
+    Erkennt Änderungen anderer Programme an den gespeicherten Kursen (z. B.
+    ein Skript, das Noten in kurse.csv einträgt), während das Dashboard läuft.
+
+    pruefe() wird regelmäßig per after() aus der Tk-Ereignisschleife aufgerufen
+    und fragt nur die günstige Kennung der Datenquelle ab (Änderungszeit und
+    Größe bzw. PRAGMA data_version). Erst bei einer Änderung wird der Bestand in
+    einem Hintergrund-Thread neu geladen und mit einer Momentaufnahme der Kurse
+    im Speicher verglichen; das Ergebnis holt die View mit abholen() ab. Ein Dateisystem-
+    Ereignisdienst (inotify) ist in der Standardbibliothek nicht verfügbar,
+    daher wird gepollt.
+    """
+
+    def __init__(self, datenquelle, kurse):
+        """
+        :param datenquelle: Überwachte Datenquelle
+        :param kurse: Kurse im Speicher, mit denen verglichen wird
+        """
+        self.datenquelle = datenquelle
+        self.kurse = kurse
+        self._thread = None
+        self._erzwingen = False
+        self._ergebnisse = queue.Queue()
+
+    @property
+    def laeuft(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def pruefe(self, stand):
+        """
+        Startet das Neuladen im Hintergrund, falls die Daten von außen
+        geändert wurden und gerade kein Neuladen läuft.
+
+        :param stand: Änderungsstand der Kurse im Speicher; wird mit dem
+                      Ergebnis zurückgegeben, damit veraltete Ergebnisse
+                      erkannt werden können
+        :return: True, wenn ein Neuladen gestartet wurde
+        """
+        if self.laeuft or not (self._erzwingen or self.datenquelle.fremd_geaendert()):
+            return False
+        self._erzwingen = False
+        # Momentaufnahme im Tk-Thread: Die GUI kann die Liste während des Ladens
+        # weiter ändern; solche Ergebnisse erkennt der Aufrufer am Stand
+        kurse = list(self.kurse)
+        self._thread = threading.Thread(target=self._lade, args=(stand, kurse),
+                                        name="AenderungsWaechter", daemon=True)
+        self._thread.start()
+        return True
+
+    def wiederhole(self):
+        """
+        Verwirft ein abgeholtes Ergebnis: Beim nächsten pruefe() wird auf
+        jeden Fall neu geladen.
+        """
+        self._erzwingen = True
+
+    def _lade(self, stand, kurse):
+        """
+        Lädt den Bestand und vergleicht ihn nach Kurscode mit der Momentaufnahme.
+
+        :param kurse: Liste der Kurse im Speicher beim Start des Neuladens
+        """
+        try:
+            neu = self.datenquelle.lade_kurse()
+            self._ergebnisse.put((stand, Service.vergleiche_kurse(kurse, neu), None))
+        except Exception as e:
+            self._ergebnisse.put((stand, None, e))
+
+    def abholen(self):
+        """
+        Holt ein fertiges Ergebnis ab, ohne zu warten.
+
+        :return: Tupel (stand, (hinzugefuegt, entfernt, geaendert), Fehler oder None)
+                 oder None, wenn kein Ergebnis vorliegt
+        """
+        try:
+            return self._ergebnisse.get_nowait()
+        except queue.Empty:
+            return None
@@ -0,0 +1,176 @@
+from functools import lru_cache
+from math import gcd
+
+from service import Service
+
+# Übliche Obergrenze je Semester (Vollzeitstudium)
+STANDARD_MAX_ECTS = 30
+
+
+class SemesterPlaner:
+    """
+    Plant, welche offenen Kurse (Note None) in den nächsten Semestern belegt
+    werden, um die fehlenden ECTS bis Student.ziel_ects in möglichst wenigen
+    Semestern zu erreichen.
+
+    Das ist ein Bin-Packing-Problem mit der ECTS-Obergrenze als Kapazität je
+    Semester. Kurse mit gleichen ECTS sind dafür austauschbar und werden zu
+    Gruppen zusammengefasst; gerechnet wird nur mit der Anzahl der noch
+    verfügbaren Kurse je Gruppe. Für k = untere_grenze, untere_grenze + 1, ...
+    wird geprüft, wie viele ECTS sich in k Semestern höchstens belegen lassen
+    (per lru_cache gemerkt über (k, Anzahlen)); das erste k, das die fehlenden
+    ECTS erreicht, ist die kleinste Semesteranzahl. Dabei genügen Belegungen,
+    in die kein weiterer offener Kurs mehr passt: Ein passender Kurs aus einem
+    späteren Semester kann immer vorgezogen werden.
+
+    Die Gewichte (Vorliebe) entscheiden nur bei Gleichstand: Aus jeder Gruppe
+    werden die Kurse mit dem höchsten Gewicht zuerst eingeplant, und unter
+    gleich vielen ECTS in einem Semester wird die Belegung mit dem höheren
+    Gewicht gewählt. Im letzten Semester wird die kleinste Belegung gewählt,
+    die den Rest erreicht.
+    """
+
+    def __init__(self, kurse, ziel_ects, max_ects=STANDARD_MAX_ECTS, gewichte=None):
+        """
+        :param kurse: KursListe, KursTabelle oder Liste von Kurs-Objekten
+        :param ziel_ects: Ziel-ECTS des Studierenden
+        :param max_ects: Höchstens belegbare ECTS je Semester
+        :param gewichte: Dict Kurscode -> Gewicht (größer = lieber früher) oder None
+        :raises ValueError: wenn max_ects nicht positiv ist
+        """
+        if max_ects <= 0:
+            raise ValueError("max_ects muss größer als 0 sein")
+        self.max_ects = max_ects
+        self.gewichte = gewichte or {}
+        self.fehlend = max(0, ziel_ects - Service.berechne_ects(kurse))
+        # Kurse über der Semestergrenze können nie belegt werden
+        self.offene = [k for k in kurse if k.note is None and 0 < k.ects <= max_ects]
+
+    @property
+    def untere_grenze(self):
+        """
+        :return: Mindestanzahl Semester, wenn jedes Semester voll belegt wird
+        """
+        return -(-self.fehlend // self.max_ects)
+
+    def plane(self, max_semester=None):
+        """
+        Erstellt den Semesterplan mit der kleinsten Anzahl Semester. Reichen
+        die offenen Kurse oder max_semester nicht aus, werden so viele der
+        fehlenden ECTS wie möglich eingeplant.
+
+        :param max_semester: Höchstens zu planende Semester oder None für beliebig viele
+        :return: Tupel (semester, erreicht); semester ist eine Liste von Listen
+                 der Kurse je Semester, erreicht ist True, wenn der Plan die
+                 fehlenden ECTS abdeckt
+        """
+        gruppen = self._gruppen()
+        werte = tuple(ects for ects, _ in gruppen)
+        anzahlen = tuple(len(positionen) for _, positionen in gruppen)
+        gesamt = sum(a * e for a, e in zip(anzahlen, werte))
+        # Nur Vielfache des ggT der ECTS sind belegbar: Grenze ab-, Ziel aufrunden
+        schritt = gcd(*werte) or 1
+        kapazitaet = self.max_ects - self.max_ects % schritt
+        ziel = min(-(-self.fehlend // schritt) * schritt, gesamt)
+
+        @lru_cache(maxsize=None)
+        def reicht(k, anzahlen, rest):
+            # Lassen sich mit den verbleibenden Kursen in k Semestern noch rest ECTS belegen?
+            if rest <= 0:
+                return True
+            if k * kapazitaet < rest or sum(a * e for a, e in zip(anzahlen, werte)) < rest:
+                return False
+            # Insgesamt dürfen höchstens k * kapazitaet - rest ECTS ungenutzt bleiben
+            for belegung, summe in self._belegungen(anzahlen, werte, kapazitaet,
+                                                    rest - (k - 1) * kapazitaet, True):
+                if reicht(k - 1, tuple(a - m for a, m in zip(anzahlen, belegung)), rest - summe):
+                    return True
+            return False
+
+        if max_semester is not None:
+            while ziel > 0 and not reicht(max_semester, anzahlen, ziel):
+                ziel -= schritt
+        if ziel <= 0:
+            return [], self.fehlend <= 0
+        # Kleinste Semesteranzahl, ab der untersten möglichen aufwärts
+        k = -(-ziel // kapazitaet)
+        while not reicht(k, anzahlen, ziel):
+            k += 1
+
+        # Plan Semester für Semester zurückverfolgen
+        genommen = [0] * len(gruppen)
+        semester = []
+        rest = ziel
+        for k in range(k, 0, -1):
+            kandidaten = []
+            # Im letzten Semester die kleinste Belegung, die den Rest erreicht,
+            # sonst die größte, mit der die übrigen Semester noch reichen
+            mindestens = rest if k == 1 else rest - (k - 1) * kapazitaet
+            for belegung, summe in self._belegungen(anzahlen, werte, kapazitaet, mindestens, k > 1):
+                danach = tuple(a - m for a, m in zip(anzahlen, belegung))
+                if k > 1 and not reicht(k - 1, danach, rest - summe):
+                    continue
+                gewicht = sum(self.gewichte.get(self.offene[i].kurscode, 0)
+                              for (_, positionen), g, m in zip(gruppen, genommen, belegung)
+                              for i in positionen[g:g + m])
+                kandidaten.append(((-summe if k == 1 else summe, gewicht), belegung, summe))
+            _, belegung, summe = max(kandidaten, key=lambda kandidat: kandidat[0])
+            auswahl = []
+            for i, m in enumerate(belegung):
+                auswahl.extend(gruppen[i][1][genommen[i]:genommen[i] + m])
+                genommen[i] += m
+            anzahlen = tuple(a - m for a, m in zip(anzahlen, belegung))
+            # Innerhalb eines Semesters in der Reihenfolge der Kursliste
+            semester.append([self.offene[i] for i in sorted(auswahl)])
+            rest -= summe
+        return semester, ziel >= self.fehlend
+
+    @staticmethod
+    def _belegungen(anzahlen, werte, kapazitaet, mindestens, maximal):
+        """
+        Zählt die Belegungen eines Semesters auf, größere Kurse zuerst.
+
+        :param anzahlen: Verfügbare Kurse je Gruppe
+        :param werte: ECTS je Gruppe, absteigend
+        :param kapazitaet: ECTS-Obergrenze des Semesters
+        :param mindestens: Kleinste zulässige Summe der Belegung
+        :param maximal: True, um nur Belegungen zu liefern, in die kein
+                        weiterer verfügbarer Kurs mehr passt
+        :return: Generator von Tupeln (Anzahl je Gruppe, ECTS)
+        """
+        # Höchstens noch erreichbare ECTS ab Gruppe i
+        danach = [0] * (len(werte) + 1)
+        for i in range(len(werte) - 1, -1, -1):
+            danach[i] = danach[i + 1] + anzahlen[i] * werte[i]
+
+        def rekursiv(i, frei, ausgelassen):
+            if kapazitaet - frei + min(frei, danach[i]) < mindestens:
+                return
+            if i == len(werte):
+                # ausgelassen: kleinste ECTS einer nicht ausgeschöpften Gruppe
+                if not maximal or frei < ausgelassen:
+                    yield (), kapazitaet - frei
+                return
+            for m in range(min(anzahlen[i], frei // werte[i]), -1, -1):
+                weiter = ausgelassen if m == anzahlen[i] else werte[i]
+                for belegung, summe in rekursiv(i + 1, frei - m * werte[i], weiter):
+                    yield (m, *belegung), summe
+
+        return rekursiv(0, kapazitaet, kapazitaet + 1)
+
+    def _gruppen(self):
+        """
+        Fasst die offenen Kurse nach ECTS zusammen. Innerhalb einer Gruppe
+        stehen die Kurse nach absteigendem Gewicht, bei gleichem Gewicht in
+        der Reihenfolge der Kursliste.
+
+        :return: Liste von Tupeln (ECTS, Liste der Positionen in offene),
+                 größte ECTS zuerst
+        """
+        gruppen = {}
+        for i, k in enumerate(self.offene):
+            gruppen.setdefault(k.ects, []).append(i)
+        if self.gewichte:
+            for positionen in gruppen.values():
+                positionen.sort(key=lambda i: -self.gewichte.get(self.offene[i].kurscode, 0))
+        return sorted(gruppen.items(), reverse=True)
@@ -1,3 +1,94 @@
+import sys
+from collections import Counter
+from itertools import compress
+
+_numpy = None
+
+# Unterhalb dieser Zeilenzahl lohnt der Import von NumPy (~0,1 s) nicht
+NUMPY_AB = 50_000
+
+# Festkomma-Skala der Notensumme: Note * ECTS (ein Float >= 2**-11) ist mit
+# 2**64 multipliziert stets ganzzahlig, die Umrechnung damit verlustfrei
+SKALA = 1 << 64
+_SKALA_FLOAT = float(SKALA)
+
+# Position des Bytes mit Vorzeichen und Exponent in jedem Float einer Notenspalte
+_HOCH = 7 if sys.byteorder == "little" else 0
+# Übersetzungstabelle Byte -> 0/1 (Vorzeichenbit nicht gesetzt) für bytes.translate
+_NICHT_NEGATIV = bytes(b < 0x80 for b in range(256))
+# Ab dieser Zeilenzahl lohnt es, gleiche (Note, ECTS)-Paare vorab zu zählen
+_ZAEHLEN_AB = 256
+
+
+def _lade_numpy(anzahl=None):
+    """
+    Importiert NumPy erst bei der ersten vektorisierten Berechnung, damit
+    einfache Aufrufe keinen Import-Aufwand haben. Ohne NumPy (oder bei
+    weniger als NUMPY_AB Zeilen, solange NumPy noch nicht geladen ist) wird
+    False zurückgegeben und die reine array-Variante verwendet.
+
+    :param anzahl: Anzahl zu verarbeitender Zeilen oder None
+    """
+    global _numpy
+    if _numpy is None and anzahl is not None and anzahl < NUMPY_AB:
+        return False
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy
+
+
+def _anteil(note, ects):
+    """
+    :return: Note * ECTS (derselbe Float wie sum(k.note * k.ects ...)) als
+             int in Einheiten von 1 / SKALA
+    """
+    return int(note * ects * _SKALA_FLOAT)
+
+
+def _durchschnitt(summe, ects):
+    """
+    Rundet den gewichteten Durchschnitt aus einer ganzzahligen Notensumme.
+    Alle Berechnungswege (Kurs-Objekte, Spalten, laufende Summen, SQLite)
+    summieren die Produkte Note * ECTS exakt als Festkommazahl (siehe
+    _anteil); das Ergebnis hängt damit nicht von der Reihenfolge der
+    Additionen ab, und alle Wege liefern auch an Rundungsgrenzen dasselbe.
+    summe / SKALA ist die korrekt gerundete Summe der Produkte (wie
+    math.fsum), sodass beliebig genaue Noten nicht verfälscht werden.
+
+    :param summe: Summe von _anteil(Note, ECTS) (int)
+    :param ects: Summe der ECTS der benoteten Kurse (int, > 0)
+    :return: Auf 2 Nachkommastellen gerundeter Durchschnitt
+    """
+    return round(summe / SKALA / ects, 2)
+
+
+def _maske_vorhanden(noten):
+    """
+    Bildet ohne Python-Schleife je Zeile ein Byte 0/1 für "Note vorhanden"
+    (>= 0). Das Vorzeichen steht im obersten Byte jedes Floats; Byte-Slice
+    und bytes.translate laufen in C, anders als map() über die Spalte
+    entsteht so kein Float-Objekt je Zeile.
+
+    :param noten: array('d') der Notenspalte (ohne -0.0, siehe KursTabelle.kodiere_note)
+    :return: bytes gleicher Länge wie noten
+    """
+    return noten.tobytes()[_HOCH::8].translate(_NICHT_NEGATIV)
+
+
+def _spalten_von(kurse):
+    """
+    :param kurse: Kurs-Sammlung
+    :return: Tupel (ects, noten) für die Spaltenauswertung oder None, wenn die
+             Sammlung keine (aktuellen) Spalten anbietet
+    """
+    spalten = getattr(kurse, "spalten", None)
+    return spalten() if spalten is not None else None
+
+
 class Service:
     """
     Bündelt zentrale Berechnungs- und Validierungsfunktionen,
@@ -10,9 +101,12 @@ class Service:
         Summiert alle ECTS der Kurse, bei denen eine Note vorhanden ist.
         Angerechnete Kurse (Note == 0.0) zählen auch als 'vorhandene' Note.
 
-        :param kurse: Liste von Kurs-Objekten
+        :param kurse: Liste von Kurs-Objekten oder spaltenorientierte KursTabelle/NotenTabelle
         :return: Gesamtanzahl erreichter ECTS (int)
         """
+        spalten = _spalten_von(kurse)
+        if spalten is not None:
+            return Service._ects_spalten(*spalten)
         return sum(k.ects for k in kurse if k.note is not None)
 
     @staticmethod
@@ -21,15 +115,133 @@ class Service:
         Berechnet den gewichteten Notendurchschnitt (Note * ECTS),
         ignoriert Kurse ohne Note (None) oder angerechnete (== 0.0).
 
-        :param kurse: Liste von Kurs-Objekten
+        :param kurse: Liste von Kurs-Objekten oder spaltenorientierte KursTabelle/NotenTabelle
         :return: Rundeter Durchschnittswert (float) oder None, wenn keine validen Noten
         """
+        spalten = _spalten_von(kurse)
+        if spalten is not None:
+            return Service._durchschnitt_spalten(*spalten)
         valid = [k for k in kurse if k.note is not None and k.note != 0.0]
         if not valid:
             return None
-        s = sum(k.note * k.ects for k in valid)
+        s = sum(_anteil(k.note, k.ects) for k in valid)
         e = sum(k.ects for k in valid)
-        return round(s / e, 2)
+        return _durchschnitt(s, e)
+
+    @staticmethod
+    def durchschnitt_aus_gruppen(gruppen):
+        """
+        Gewichteter Durchschnitt aus vorab gruppierten Noten, z. B. aus
+        einer GROUP BY-Abfrage. Gleiche (Note, ECTS)-Paare liefern dasselbe
+        Produkt, das Ergebnis entspricht daher berechne_durchschnitt.
+
+        :param gruppen: Iterable von Tupeln (Note, ECTS, Anzahl) mit Note > 0
+        :return: Gerundeter Durchschnitt oder None, wenn keine Gruppen
+        """
+        summe = gewichte = 0
+        for note, ects, anzahl in gruppen:
+            summe += _anteil(note, ects) * anzahl
+            gewichte += ects * anzahl
+        return _durchschnitt(summe, gewichte) if gewichte else None
+
+    @staticmethod
+    def zaehle_status(kurse):
+        """
+        Zählt die Kurse nach Status: benotet (Note 1-5), angerechnet (0.0)
+        und offen (keine Note).
+
+        :param kurse: Liste von Kurs-Objekten oder spaltenorientierte KursTabelle/NotenTabelle
+        :return: Dict mit den Schlüsseln "benotet", "angerechnet", "offen"
+        """
+        spalten = _spalten_von(kurse)
+        if spalten is not None:
+            return Service._status_spalten(*spalten)
+        benotet = angerechnet = offen = 0
+        for k in kurse:
+            if k.note is None:
+                offen += 1
+            elif k.note == 0.0:
+                angerechnet += 1
+            else:
+                benotet += 1
+        return {"benotet": benotet, "angerechnet": angerechnet, "offen": offen}
+
+    @staticmethod
+    def _ects_spalten(ects, noten):
+        """
+        ECTS-Summe über Spalten (siehe KursTabelle, NotenTabelle): Noten >= 0 zählen als erreicht.
+        """
+        np = _lade_numpy(len(noten))
+        if np:
+            e = np.frombuffer(ects, dtype=np.uint16)
+            n = np.frombuffer(noten, dtype=np.float64)
+            return int(e.sum(where=n >= 0, dtype=np.int64))
+        return sum(compress(ects, _maske_vorhanden(noten)))
+
+    @staticmethod
+    def _durchschnitt_spalten(ects, noten):
+        """
+        Gewichteter Durchschnitt über Spalten (siehe KursTabelle): nur Noten > 0.
+        """
+        s, g = Service._notensumme_spalten(ects, noten)
+        return _durchschnitt(s, g) if g else None
+
+    @staticmethod
+    def _notensumme_spalten(ects, noten):
+        """
+        Summe Note * ECTS als Festkommazahl (siehe _anteil) und ECTS-Summe
+        der Noten > 0, exakt wie bei Kurs-Objekten (siehe _durchschnitt).
+
+        :return: Tupel (Notensumme als int, benotete ECTS)
+        """
+        np = _lade_numpy(len(noten))
+        if np:
+            e = np.frombuffer(ects, dtype=np.uint16)
+            n = np.frombuffer(noten, dtype=np.float64)
+            maske = n > 0
+            gewichte = e[maske]
+            produkte = n[maske] * gewichte
+            # Produkt * 2**64 passt nicht in int64: in ganzen Teil und zwei
+            # 32-Bit-Stücke des Nachkommaanteils zerlegen (alles exakt)
+            ganz = np.floor(produkte)
+            rest = (produkte - ganz) * 2.0 ** 32
+            mitte = np.floor(rest)
+            unten = np.floor((rest - mitte) * 2.0 ** 32)
+            summe = ((int(ganz.astype(np.int64).sum()) << 64) + (int(mitte.astype(np.int64).sum()) << 32)
+                     + int(unten.astype(np.int64).sum()))
+            return summe, int(gewichte.sum(dtype=np.int64))
+        maske = _maske_vorhanden(noten)
+        paare = zip(compress(noten, maske), compress(ects, maske))
+        summe = gewichte = 0
+        if len(noten) <= _ZAEHLEN_AB:
+            for note, e in paare:
+                if note:
+                    summe += _anteil(note, e)
+                    gewichte += e
+            return summe, gewichte
+        # Es gibt nur wenige verschiedene Paare (Note, ECTS): einmal in C
+        # zählen, dann je Paar statt je Zeile umrechnen
+        for (note, e), anzahl in Counter(paare).items():
+            if note:
+                summe += _anteil(note, e) * anzahl
+                gewichte += e * anzahl
+        return summe, gewichte
+
+    @staticmethod
+    def _status_spalten(ects, noten):
+        """
+        Statuszählung über die Notenspalte (siehe KursTabelle).
+        """
+        np = _lade_numpy(len(noten))
+        if np:
+            n = np.frombuffer(noten, dtype=np.float64)
+            benotet = int(np.count_nonzero(n > 0))
+            angerechnet = int(np.count_nonzero(n == 0))
+        else:
+            angerechnet = noten.count(0.0)
+            benotet = _maske_vorhanden(noten).count(1) - angerechnet
+        return {"benotet": benotet, "angerechnet": angerechnet,
+                "offen": len(noten) - benotet - angerechnet}
 
     @staticmethod
     def setze_note(kurse, kurscode, raw_input):
@@ -43,30 +255,429 @@ class Service:
           - Zahlenwert [1..5] => gültige Note
           - Anderes => False
 
-        :param kurse: Liste von Kurs-Objekten
+        :param kurse: KursListe (oder Liste) von Kurs-Objekten
         :param kurscode: Identifizierender Code des Kurses
         :param raw_input: String vom Benutzer (z. B. "2.3", "A", "-")
         :return: True bei Erfolg, False sonst
         """
+        k = Service.finde_kurs(kurse, kurscode)
+        if k is None:
+            return False
+
+        ok, note = Service.pruefe_note(raw_input)
+        if ok:
+            k.note = note
+        return ok
+
+    @staticmethod
+    def pruefe_note(raw_input):
+        """
+        Interpretiert eine Benutzereingabe als Note, ohne einen Kurs zu verändern.
+        Es gelten dieselben Regeln wie bei setze_note.
+
+        :param raw_input: String vom Benutzer (z. B. "2.3", "A", "-")
+        :return: Tupel (gültig, Note), wobei Note None, 0.0 oder ein Float ist
+        """
+        txt = raw_input.strip().upper()
+
+        if not txt or txt == "-":
+            return True, None
+
+        if txt == "A":
+            return True, 0.0
+
+        try:
+            val = float(txt)
+        except ValueError:
+            return False, None
+        if 1 <= val <= 5:
+            return True, round(val, 2)
+        return False, None
+
+    @staticmethod
+    def pruefe_noten(kurse, eintraege):
+        """
+        Prüft eine Notenliste (z. B. aus NotenImportRepository) mit denselben
+        Regeln wie setze_note, ohne einen Kurs zu verändern. Kommt ein Kurscode
+        mehrfach vor, gilt der letzte gültige Eintrag.
+
+        :param kurse: KursListe (oder Liste) von Kurs-Objekten
+        :param eintraege: Iterable von Tupeln (Zeile, Kurscode, Note als Text)
+        :return: Tupel (gueltig, abgelehnt); gueltig ist eine Liste von Paaren
+                 (Kurs, Note), abgelehnt eine Liste von Tupeln
+                 (Zeile, Kurscode, Note als Text, Grund)
+        """
+        gueltig = {}
+        abgelehnt = []
+        for zeile, kurscode, text in eintraege:
+            k = Service.finde_kurs(kurse, kurscode.strip())
+            if k is None:
+                abgelehnt.append((zeile, kurscode, text, "unbekannter Kurscode"))
+                continue
+            ok, note = Service.pruefe_note(text)
+            if not ok:
+                abgelehnt.append((zeile, kurscode, text, "ungültige Note"))
+                continue
+            gueltig[k] = note
+        return list(gueltig.items()), abgelehnt
+
+    @staticmethod
+    def finde_kurs(kurse, kurscode):
+        """
+        Sucht einen Kurs anhand seines Codes. Nutzt den Index einer KursListe,
+        fällt bei einfachen Listen auf eine lineare Suche zurück.
+
+        :param kurse: KursListe oder Liste von Kurs-Objekten
+        :param kurscode: Identifizierender Code des Kurses
+        :return: Kurs-Objekt oder None
+        """
+        finde = getattr(kurse, "finde", None)
+        if finde is not None:
+            return finde(kurscode)
         for k in kurse:
             if k.kurscode == kurscode:
-                txt = raw_input.strip().upper()
+                return k
+        return None
 
-                if not txt or txt == "-":
-                    k.note = None
-                    return True
+    @staticmethod
+    def vergleiche_kurse(alt, neu):
+        """
+        Ermittelt die Unterschiede zwischen zwei Kursbeständen anhand des Kurscodes.
+        Ein geänderter Kurscode erscheint als entfernter und hinzugefügter Kurs.
+
+        :param alt: Bisheriger Bestand (KursListe, KursTabelle oder Liste von Kursen)
+        :param neu: Neu eingelesener Bestand (KursListe oder KursTabelle)
+        :return: Tupel (hinzugefuegt, entfernt, geaendert); hinzugefuegt und entfernt
+                 sind Listen von Kursen aus neu bzw. alt, geaendert ist eine Liste
+                 von Paaren (Kurs aus alt, Kurs aus neu)
+        """
+        finde = getattr(alt, "finde", None)
+        if finde is None:
+            finde = {k.kurscode: k for k in alt}.get
+        hinzugefuegt = []
+        geaendert = []
+        for k in neu:
+            a = finde(k.kurscode)
+            if a is None:
+                hinzugefuegt.append(k)
+            elif a.name != k.name or a.ects != k.ects or a.note != k.note:
+                geaendert.append((a, k))
+        entfernt = [k for k in alt if k.kurscode not in neu]
+        return hinzugefuegt, entfernt, geaendert
 
-                if txt == "A":
-                    k.note = 0.0
-                    return True
 
-                try:
-                    val = float(txt)
-                    if 1 <= val <= 5:
-                        k.note = round(val, 2)
-                        return True
-                    return False
-                except ValueError:
-                    return False
+class StatistikAggregator:
+    """
+    Hält laufende Summen für die Kursstatistik, damit einzelne Änderungen
+    (Note oder ECTS eines Kurses) in O(1) verrechnet werden können,
+    statt jedes Mal die komplette Kursliste neu zu durchlaufen.
 
-        return False
+    Liefert dieselben Ergebnisse wie Service.berechne_ects und
+    Service.berechne_durchschnitt. Die Notensumme wird dazu ganzzahlig als
+    Festkommazahl geführt (siehe _anteil), sodass sich auch nach beliebig
+    vielen Änderungen keine Rundungsfehler ansammeln.
+    """
+
+    def __init__(self):
+        """
+        Erstellt einen leeren Aggregator (keine Kurse erfasst).
+        """
+        self.erreichte_ects = 0
+        # Summe von _anteil(Note, ECTS) (int)
+        self.notensumme = 0
+        self.benotete_ects = 0
+
+    @classmethod
+    def aus_kursen(cls, kurse):
+        """
+        Baut einen Aggregator mit einem einmaligen Durchlauf über alle Kurse auf.
+        Bietet die Sammlung Spalten an (KursTabelle, SpaltenKursListe), werden
+        die Summen spaltenweise berechnet, ohne Kurs-Objekte zu erzeugen.
+
+        :param kurse: Iterable von Kurs-Objekten
+        :return: Befüllter StatistikAggregator
+        """
+        agg = cls()
+        spalten = _spalten_von(kurse)
+        if spalten is not None:
+            agg.erreichte_ects = Service._ects_spalten(*spalten)
+            agg.notensumme, agg.benotete_ects = Service._notensumme_spalten(*spalten)
+            return agg
+        for k in kurse:
+            agg.hinzufuegen(k.ects, k.note)
+        return agg
+
+    def hinzufuegen(self, ects, note):
+        """
+        Verrechnet einen Kurs mit seinen ECTS und seiner Note.
+
+        :param ects: ECTS des Kurses (int)
+        :param note: Note (float), 0.0 für angerechnet oder None
+        """
+        if note is None:
+            return
+        self.erreichte_ects += ects
+        if note != 0.0:
+            self.notensumme += _anteil(note, ects)
+            self.benotete_ects += ects
+
+    def entfernen(self, ects, note):
+        """
+        Nimmt einen zuvor verrechneten Kurs wieder aus den Summen heraus.
+
+        :param ects: ECTS des Kurses (int)
+        :param note: Note (float), 0.0 für angerechnet oder None
+        """
+        if note is None:
+            return
+        self.erreichte_ects -= ects
+        if note != 0.0:
+            self.notensumme -= _anteil(note, ects)
+            self.benotete_ects -= ects
+
+    def aendere_note(self, ects, alte_note, neue_note):
+        """
+        Verrechnet eine Notenänderung eines Kurses.
+
+        :param ects: ECTS des betroffenen Kurses
+        :param alte_note: Bisherige Note (float/0.0/None)
+        :param neue_note: Neue Note (float/0.0/None)
+        """
+        self.entfernen(ects, alte_note)
+        self.hinzufuegen(ects, neue_note)
+
+    def aendere_ects(self, note, alte_ects, neue_ects):
+        """
+        Verrechnet eine ECTS-Änderung eines Kurses.
+
+        :param note: Note des betroffenen Kurses (float/0.0/None)
+        :param alte_ects: Bisherige ECTS
+        :param neue_ects: Neue ECTS
+        """
+        self.entfernen(alte_ects, note)
+        self.hinzufuegen(neue_ects, note)
+
+    @property
+    def ects(self):
+        """
+        :return: Gesamtanzahl erreichter ECTS (int)
+        """
+        return self.erreichte_ects
+
+    @property
+    def durchschnitt(self):
+        """
+        :return: Gerundeter gewichteter Durchschnitt (float) oder None, wenn keine validen Noten
+        """
+        if self.benotete_ects == 0:
+            return None
+        return _durchschnitt(self.notensumme, self.benotete_ects)
+
+
+# Notenstufen für Szenarien: 1.0, 1.1, ..., 4.0
+NOTENSTUFEN = tuple(round(1 + i / 10, 1) for i in range(31))
+
+
+class NotenPlaner:
+    """
+    Beantwortet, welche Noten in den offenen Modulen (Note None) noch nötig
+    sind, um einen Ziel-Durchschnitt zu erreichen (kleiner ist besser).
+
+    Beim Anlegen werden die Summen der benoteten Kurse einmal bestimmt, mit
+    derselben Festkomma-Arithmetik wie im StatistikAggregator (siehe
+    _anteil). Da sich offene Module nur in ihren ECTS unterscheiden, wird
+    jede Abfrage nur einmal je vorkommendem ECTS-Wert gerechnet; bei jeder
+    Eingabe hängt der Aufwand damit nicht von der Anzahl der Kurse ab.
+    Angerechnete Kurse zählen wie in Service.berechne_durchschnitt nicht
+    zum Durchschnitt.
+    """
+    BESTE_NOTE = 1.0
+    SCHLECHTESTE_NOTE = 4.0
+
+    def __init__(self, kurse):
+        """
+        :param kurse: KursListe, KursTabelle oder Liste von Kurs-Objekten
+        """
+        # Dieselbe Festkomma-Notensumme wie im StatistikAggregator (int)
+        agg = StatistikAggregator.aus_kursen(kurse)
+        self.notensumme = agg.notensumme
+        self.benotete_ects = agg.benotete_ects
+        self.offene = [k for k in kurse if k.note is None]
+        self.offene_ects = [k.ects for k in self.offene]
+        self.offene_summe = sum(self.offene_ects)
+        # Verschiedene ECTS-Werte der offenen Module und je Modul die Position seines Werts
+        stufen = {}
+        self._stufe = [stufen.setdefault(e, len(stufen)) for e in self.offene_ects]
+        self._stufen_ects = list(stufen)
+
+    def benoetigter_durchschnitt(self, ziel):
+        """
+        Geschlossene Form: (ziel * (G + O) - S) / O mit S = Summe Note*ECTS und
+        G = ECTS der benoteten Kurse sowie O = ECTS der offenen Module.
+
+        :param ziel: Ziel-Durchschnitt, z. B. 2.0
+        :return: Durchschnitt, der über alle offenen ECTS mindestens erreicht
+                 werden muss (unter BESTE_NOTE: nicht erreichbar; ab
+                 SCHLECHTESTE_NOTE: mit jeder bestandenen Note erreicht),
+                 oder None, wenn es keine offenen ECTS gibt
+        """
+        if not self.offene_summe:
+            return None
+        return self._basis(ziel) / (self.offene_summe * SKALA)
+
+    def szenarien(self, ziel, noten=NOTENSTUFEN):
+        """
+        Durchläuft für jedes offene Modul jede Note aus noten und berechnet,
+        welcher Durchschnitt dann in den übrigen offenen Modulen nötig wäre.
+
+        :param ziel: Ziel-Durchschnitt
+        :param noten: Aufsteigende Folge von Noten
+        :return: Liste (je offenes Modul) von Listen (je Note); float("inf"),
+                 wenn das Ziel ohne weitere Module sicher erreicht ist,
+                 float("-inf"), wenn es ohne weitere Module verfehlt ist
+        """
+        unendlich = float("inf")
+        zeilen = []
+        for rest, zaehler in self._zaehler(ziel, noten):
+            if rest:
+                nenner = rest * SKALA
+                zeilen.append([z / nenner for z in zaehler])
+            else:
+                zeilen.append([unendlich if z >= 0 else -unendlich for z in zaehler])
+        return [list(zeilen[i]) for i in self._stufe]
+
+    def schlechteste_noten(self, ziel, noten=NOTENSTUFEN):
+        """
+        Ermittelt je offenem Modul die schlechteste Note aus noten, mit der das
+        Ziel noch erreichbar bleibt (alle übrigen Module mit BESTE_NOTE).
+
+        :param ziel: Ziel-Durchschnitt
+        :param noten: Aufsteigende Folge von Noten
+        :return: Liste (je offenes Modul) mit der Note oder None, wenn selbst
+                 die beste Note nicht reicht
+        """
+        # Je schlechter die Note im Modul, desto besser muss der Rest werden:
+        # die passenden Noten bilden daher je ECTS-Wert einen Anfang von noten.
+        # Verglichen wird ganzzahlig, ohne Rundung durch die Division
+        ergebnis = []
+        for rest, zaehler in self._zaehler(ziel, noten):
+            grenze = _anteil(self.BESTE_NOTE, rest) if rest else 0
+            n = sum(map(grenze.__le__, zaehler))
+            ergebnis.append(noten[n - 1] if n else None)
+        return [ergebnis[i] for i in self._stufe]
+
+    def _basis(self, ziel):
+        """
+        :return: ziel * (G + O) - S in Einheiten von 1 / SKALA (int)
+        """
+        return _anteil(ziel, self.benotete_ects + self.offene_summe) - self.notensumme
+
+    def _zaehler(self, ziel, noten):
+        """
+        Nötiger Rest-Durchschnitt je (ECTS-Wert e, Note) als Bruch
+        (ziel * (G + O) - S - Note * e) / (O - e), der Zähler in Einheiten
+        von 1 / SKALA.
+
+        :return: Liste (je ECTS-Wert in _stufen_ects) von Paaren
+                 (O - e, Liste der Zähler je Note)
+        """
+        basis = self._basis(ziel)
+        return [(self.offene_summe - e, [basis - _anteil(n, e) for n in noten])
+                for e in self._stufen_ects]
+
+
+class StatistikCache:
+    """
+    Zwischengespeicherte Kennzahlen über Service für eine KursListe oder
+    KursTabelle: ECTS, Durchschnitt, Fortschritt in Prozent der Ziel-ECTS
+    und Statuszählung.
+
+    Jeder Wert wird höchstens einmal je Stand berechnet. Als Stand dient der
+    Versionszähler der Sammlung (version), der bei jeder Änderung hochgezählt
+    wird; solange er gleich bleibt, kostet eine erneute Abfrage nur einen
+    Dict-Zugriff. Werden Kurs-Objekte einer KursListe direkt geändert, muss
+    markiere_geaendert() der Liste oder invalidiere() aufgerufen werden.
+    """
+
+    def __init__(self, kurse, student=None):
+        """
+        :param kurse: KursListe oder KursTabelle
+        :param student: Student-Objekt für den Fortschritt oder None
+        """
+        self.kurse = kurse
+        self.student = student
+        self.treffer = 0
+        self.fehlgriffe = 0
+        self._werte = {}
+        self._version = None
+
+    def invalidiere(self):
+        """
+        Verwirft alle zwischengespeicherten Werte, z. B. nach Änderungen,
+        die den Versionszähler der Sammlung nicht erhöhen.
+        """
+        self._werte.clear()
+        self._version = None
+
+    def _hole(self, schluessel, berechne):
+        """
+        Liefert den Wert zum Schlüssel für den aktuellen Stand oder berechnet ihn.
+        """
+        version = self.kurse.version
+        if version != self._version:
+            self._werte.clear()
+            self._version = version
+        try:
+            wert = self._werte[schluessel]
+        except KeyError:
+            self.fehlgriffe += 1
+            wert = self._werte[schluessel] = berechne(self.kurse)
+            return wert
+        self.treffer += 1
+        return wert
+
+    @property
+    def ects(self):
+        """
+        :return: Gesamtanzahl erreichter ECTS (wie Service.berechne_ects)
+        """
+        return self._hole("ects", Service.berechne_ects)
+
+    @property
+    def durchschnitt(self):
+        """
+        :return: Gewichteter Durchschnitt oder None (wie Service.berechne_durchschnitt)
+        """
+        return self._hole("durchschnitt", Service.berechne_durchschnitt)
+
+    @property
+    def status(self):
+        """
+        :return: Dict mit "benotet", "angerechnet", "offen" (wie Service.zaehle_status)
+        """
+        return dict(self._hole("status", Service.zaehle_status))
+
+    @property
+    def fortschritt(self):
+        """
+        :return: Erreichte ECTS in Prozent der Ziel-ECTS (eine Nachkommastelle),
+                 0 ohne Studierenden oder Ziel
+        """
+        ziel = self.student.ziel_ects if self.student else 0
+        if ziel <= 0:
+            return 0
+        return self._hole(("fortschritt", ziel), lambda kurse: round(self.ects / ziel * 100, 1))
+
+    @property
+    def notenplaner(self):
+        """
+        :return: NotenPlaner für den aktuellen Stand der Kurse
+        """
+        return self._hole("notenplaner", NotenPlaner)
+
+    def kennzahlen(self):
+        """
+        :return: Dict mit ects, durchschnitt, benotet, angerechnet, offen
+                 (wie Datenquelle.kennzahlen)
+        """
+        return {"ects": self.ects, "durchschnitt": self.durchschnitt, **self.status}
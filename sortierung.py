@@ -0,0 +1,183 @@
+from bisect import bisect_left, insort
+
+SPALTEN = ("Kurscode", "Kursname", "ECTS", "Note")
+
+
+def _noten_schluessel(note):
+    """
+    Sortierschlüssel für Noten: erst Zahlen aufsteigend, dann "A" (angerechnet),
+    zuletzt "-" (keine Note).
+    """
+    if note is None:
+        return 2, 0.0
+    if note == 0.0:
+        return 1, 0.0
+    return 0, note
+
+
+SCHLUESSEL = {
+    "Kurscode": lambda k: k.kurscode.casefold(),
+    "Kursname": lambda k: k.name.casefold(),
+    "ECTS": lambda k: k.ects,
+    "Note": lambda k: _noten_schluessel(k.note),
+}
+
+
+class Sortierfolge:
+    """
+    Sicht auf eine zwischengespeicherte Sortierung als indizierbare Folge
+    (für VirtuelleTabelle.setze_zeilen). Es wird keine Kursliste kopiert;
+    Änderungen an der Sortierung sind sofort sichtbar.
+    """
+    __slots__ = ("_eintraege", "_kurse", "_absteigend")
+
+    def __init__(self, eintraege, kurse, absteigend):
+        self._eintraege = eintraege
+        self._kurse = kurse
+        self._absteigend = absteigend
+
+    def __len__(self):
+        return len(self._eintraege)
+
+    def __getitem__(self, position):
+        if self._absteigend:
+            position = len(self._eintraege) - 1 - position
+        return self._kurse[self._eintraege[position][1]]
+
+    def __iter__(self):
+        eintraege = reversed(self._eintraege) if self._absteigend else self._eintraege
+        return (self._kurse[n] for _, n in eintraege)
+
+
+class SortierIndex:
+    """
+    Zwischengespeicherte Sortierreihenfolgen der Kurse je Tabellenspalte.
+
+    Je Spalte wird beim ersten Sortieren einmal eine sortierte Liste von
+    (Schlüssel, Kursnummer) angelegt; die Kursnummer (Reihenfolge in der
+    Kursliste) entscheidet bei gleichem Schlüssel. Ändert sich danach ein Kurs,
+    wird nur sein Eintrag per bisect entfernt und neu einsortiert, statt die
+    ganze Liste neu zu sortieren. Absteigend wird dieselbe Liste rückwärts gelesen.
+    """
+
+    # Ab diesem Anteil geänderter Kurse wird eine Spalte neu sortiert statt einzeln einsortiert
+    NEU_SORTIEREN_AB = 1 / 32
+
+    def __init__(self, kurse):
+        """
+        :param kurse: KursListe, deren Kurse sortiert werden
+        """
+        self.kurse = kurse
+        self._kurse = []
+        self._nummer = {}
+        self._nummeriert = False
+        # Spalte -> sortierte Liste von (Schlüssel, Nummer) bzw. Kurs -> Eintrag
+        self._eintraege = {}
+        self._eintrag_von = {}
+
+    def _nummeriere(self):
+        """
+        Vergibt die Kursnummern beim ersten Bedarf (Reihenfolge der Kursliste).
+        """
+        if not self._nummeriert:
+            for n, k in enumerate(self.kurse):
+                self._kurse.append(k)
+                self._nummer[k] = n
+            self._nummeriert = True
+
+    def _baue_spalte(self, spalte):
+        """
+        Sortiert alle Kurse einmalig nach der Spalte.
+        """
+        self._nummeriere()
+        schluessel = SCHLUESSEL[spalte]
+        eintrag_von = {k: (schluessel(k), self._nummer[k]) for k in self._kurse if k is not None}
+        self._eintrag_von[spalte] = eintrag_von
+        self._eintraege[spalte] = sorted(eintrag_von.values())
+
+    def folge(self, spalte, absteigend=False, auswahl=None):
+        """
+        Liefert die Kurse sortiert nach einer Spalte.
+
+        :param spalte: Einer der Werte aus SPALTEN
+        :param absteigend: True für absteigende Reihenfolge
+        :param auswahl: Liste von Kursen (z. B. Suchtreffer) oder None für alle Kurse
+        :return: Indizierbare Folge von Kursen
+        """
+        if spalte not in self._eintraege:
+            self._baue_spalte(spalte)
+        if auswahl is None:
+            return Sortierfolge(self._eintraege[spalte], self._kurse, absteigend)
+        return sorted(auswahl, key=self._eintrag_von[spalte].__getitem__, reverse=absteigend)
+
+    def hinzufuegen(self, kurs):
+        """
+        Sortiert einen neuen Kurs in alle bereits angelegten Spalten ein.
+
+        :param kurs: Kurs-Objekt
+        """
+        if not self._nummeriert:
+            return
+        n = len(self._kurse)
+        self._kurse.append(kurs)
+        self._nummer[kurs] = n
+        for spalte, eintraege in self._eintraege.items():
+            eintrag = (SCHLUESSEL[spalte](kurs), n)
+            self._eintrag_von[spalte][kurs] = eintrag
+            insort(eintraege, eintrag)
+
+    def entfernen(self, kurs):
+        """
+        Entfernt einen Kurs aus allen angelegten Spalten.
+
+        :param kurs: Kurs-Objekt
+        """
+        n = self._nummer.pop(kurs, None)
+        if n is None:
+            return
+        self._kurse[n] = None
+        for spalte, eintraege in self._eintraege.items():
+            eintrag = self._eintrag_von[spalte].pop(kurs)
+            del eintraege[bisect_left(eintraege, eintrag)]
+
+    def aktualisiere(self, kurs):
+        """
+        Sortiert einen geänderten Kurs in allen angelegten Spalten neu ein;
+        Spalten, deren Wert sich nicht geändert hat, bleiben unberührt.
+
+        :param kurs: Geändertes Kurs-Objekt
+        """
+        n = self._nummer.get(kurs)
+        if n is None:
+            self.hinzufuegen(kurs)
+            return
+        for spalte, eintraege in self._eintraege.items():
+            alt = self._eintrag_von[spalte][kurs]
+            neu = (SCHLUESSEL[spalte](kurs), n)
+            if neu != alt:
+                del eintraege[bisect_left(eintraege, alt)]
+                insort(eintraege, neu)
+                self._eintrag_von[spalte][kurs] = neu
+
+    def aktualisiere_viele(self, kurse):
+        """
+        Wie aktualisiere, aber für viele geänderte Kurse auf einmal (z. B. nach
+        einem Notenimport). Ab NEU_SORTIEREN_AB der Kurse werden die Einträge
+        ersetzt und die Spalte einmal neu sortiert; die Liste bleibt dabei
+        dasselbe Objekt, damit ausgegebene Sortierfolgen gültig bleiben.
+
+        :param kurse: Liste geänderter Kurs-Objekte
+        """
+        if len(kurse) < len(self._nummer) * self.NEU_SORTIEREN_AB:
+            for k in kurse:
+                self.aktualisiere(k)
+            return
+        for k in kurse:
+            if k not in self._nummer:
+                self.hinzufuegen(k)
+        for spalte, eintraege in self._eintraege.items():
+            schluessel = SCHLUESSEL[spalte]
+            eintrag_von = self._eintrag_von[spalte]
+            for k in kurse:
+                eintrag_von[k] = (schluessel(k), self._nummer[k])
+            eintraege[:] = sorted(eintrag_von.values())
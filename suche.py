@@ -0,0 +1,372 @@
+import re
+from bisect import bisect_left, insort
+from collections import defaultdict
+from heapq import merge
+from itertools import chain, groupby, islice
+
+_WORT = re.compile(r"\w+")
+
+
+def _tokens(text):
+    """
+    Zerlegt einen Text in kleingeschriebene Wörter (Buchstaben/Ziffern).
+    """
+    return _WORT.findall(text.casefold())
+
+
+class SuchIndex:
+    """
+    Präfix-Index über Kurscode und Kursname für die Suche während der Eingabe.
+
+    Für jedes Wort aus Kurscode und Kursname wird eine aufsteigende Liste der
+    Kursnummern geführt, in denen es vorkommt. Die verschiedenen Wörter liegen
+    zusätzlich in einer sortierten Liste; alle Wörter mit einem bestimmten
+    Anfang stehen dort an einem Stück und werden per bisect in O(log n)
+    gefunden. Bei mehreren Suchwörtern müssen alle passen ("mat grund" findet
+    "Mathematik Grundlagen").
+
+    Die Kursnummern entsprechen der Reihenfolge, in der die Kurse aufgenommen
+    wurden; Treffer erscheinen so in derselben Reihenfolge wie in der Kursliste.
+
+    Der Index wird erst bei der ersten Suche aufgebaut und danach bei
+    Änderungen von Kurscode oder Kursname nur für den betroffenen Kurs angepasst.
+    """
+    # Ab so vielen passenden Wörtern werden Kandidaten einzeln geprüft
+    MAX_WOERTER_SCHNITT = 64
+
+    def __init__(self, kurse):
+        """
+        :param kurse: KursListe, deren Kurse durchsucht werden
+        """
+        self.kurse = kurse
+        # Sortierte Wörter und, an derselben Position, ihre Kursnummern-Listen
+        self._woerter = None
+        self._listen = None
+        self._vorkommen = {}
+        self._kurse = []
+        self._nummer = {}
+        # Kurscode und Name je Nummer, wie sie im Index stehen (für spätere Änderungen)
+        self._text_von = {}
+        # Kursnamen wiederholen sich häufig und werden daher nur einmal zerlegt
+        self._zerlegt = {}
+        # Zählt Änderungen, damit noch nicht ausgewertete Suchtreffer sie bemerken
+        self._stand = 0
+
+    @property
+    def aufgebaut(self):
+        return self._woerter is not None
+
+    def _zerlege(self, kurscode, name):
+        """
+        :return: Menge der Wörter aus Kurscode und Kursname
+        """
+        woerter = self._zerlegt.get(name)
+        if woerter is None:
+            woerter = self._zerlegt[name] = frozenset(_tokens(name))
+        code = kurscode.casefold()
+        if code.isalnum():
+            return woerter | {code}
+        return woerter.union(_tokens(code))
+
+    def baue_auf(self):
+        """
+        Legt den Index an, falls das noch nicht geschehen ist (z. B. sobald
+        das Suchfeld den Fokus erhält, also vor dem ersten Tastendruck).
+        """
+        if not self.aufgebaut:
+            self._aufbauen()
+
+    def _aufbauen(self):
+        """
+        Legt den Index für alle Kurse auf einmal an. Da die Nummern aufsteigend
+        vergeben werden, sind die Listen ohne weiteres Sortieren geordnet.
+        """
+        vorkommen = defaultdict(list)
+        kurse_append = self._kurse.append
+        for n, k in enumerate(self.kurse):
+            kurse_append(k)
+            self._nummer[k] = n
+            self._text_von[n] = (k.kurscode, k.name)
+            name_woerter = self._zerlegt.get(k.name)
+            if name_woerter is None:
+                name_woerter = self._zerlegt[k.name] = frozenset(_tokens(k.name))
+            for wort in name_woerter:
+                vorkommen[wort].append(n)
+            code = k.kurscode.casefold()
+            for wort in (code,) if code.isalnum() else set(_tokens(code)):
+                if wort not in name_woerter:
+                    vorkommen[wort].append(n)
+        self._vorkommen = dict(vorkommen)
+        self._woerter = sorted(self._vorkommen)
+        self._listen = [self._vorkommen[w] for w in self._woerter]
+
+    def _trage_ein(self, wort, n):
+        liste = self._vorkommen.get(wort)
+        if liste is None:
+            liste = self._vorkommen[wort] = [n]
+            i = bisect_left(self._woerter, wort)
+            self._woerter.insert(i, wort)
+            self._listen.insert(i, liste)
+        else:
+            insort(liste, n)
+
+    def hinzufuegen(self, kurs):
+        """
+        Nimmt einen neuen Kurs (am Ende der Reihenfolge) in den Index auf.
+
+        :param kurs: Kurs-Objekt
+        """
+        if not self.aufgebaut:
+            return
+        self._stand += 1
+        n = len(self._kurse)
+        self._kurse.append(kurs)
+        self._nummer[kurs] = n
+        self._text_von[n] = (kurs.kurscode, kurs.name)
+        for wort in self._zerlege(kurs.kurscode, kurs.name):
+            self._trage_ein(wort, n)
+
+    def entfernen(self, kurs):
+        """
+        Entfernt einen Kurs aus dem Index.
+
+        :param kurs: Kurs-Objekt
+        """
+        if not self.aufgebaut:
+            return
+        n = self._nummer.pop(kurs, None)
+        if n is None:
+            return
+        self._stand += 1
+        self._kurse[n] = None
+        for wort in self._zerlege(*self._text_von.pop(n)):
+            self._trage_aus(wort, n)
+
+    def aktualisiere(self, kurs):
+        """
+        Passt den Index an, nachdem sich Kurscode oder Kursname eines Kurses
+        geändert haben. Nur die tatsächlich geänderten Wörter werden
+        aus- bzw. eingetragen; die Position des Kurses bleibt erhalten.
+
+        :param kurs: Geändertes Kurs-Objekt
+        """
+        if not self.aufgebaut:
+            return
+        n = self._nummer.get(kurs)
+        if n is None:
+            self.hinzufuegen(kurs)
+            return
+        self._stand += 1
+        alt = self._zerlege(*self._text_von[n])
+        neu = self._zerlege(kurs.kurscode, kurs.name)
+        for wort in alt - neu:
+            self._trage_aus(wort, n)
+        for wort in neu - alt:
+            self._trage_ein(wort, n)
+        self._text_von[n] = (kurs.kurscode, kurs.name)
+
+    def _trage_aus(self, wort, n):
+        liste = self._vorkommen[wort]
+        del liste[bisect_left(liste, n)]
+        if not liste:
+            del self._vorkommen[wort]
+            i = bisect_left(self._woerter, wort)
+            del self._woerter[i], self._listen[i]
+
+    def _bereich(self, praefix):
+        """
+        :return: Tupel (von, bis) der Wörter in _woerter, die mit praefix beginnen
+        """
+        von = bisect_left(self._woerter, praefix)
+        return von, bisect_left(self._woerter, praefix + "\U0010ffff", von)
+
+    def _nummern(self, von, bis):
+        """
+        :return: Sortierte Liste (bei genau einem Wort) bzw. Menge der Kursnummern
+                 zu den Wörtern im Bereich
+        """
+        if bis - von == 1:
+            return self._listen[von]
+        return set(chain.from_iterable(self._listen[von:bis]))
+
+    def suche(self, text):
+        """
+        Sucht Kurse, bei denen jedes Wort der Eingabe Anfang eines Wortes aus
+        Kurscode oder Kursname ist (ohne Beachtung der Groß-/Kleinschreibung).
+
+        Die Treffer werden erst beim Zugriff bestimmt: Für die sichtbaren
+        Zeilen genügen die ersten Kursnummern, die übrigen (und damit die
+        Anzahl) folgen erst, wenn sie tatsächlich gebraucht werden.
+
+        :param text: Sucheingabe, z. B. "mat" oder "wiss arb"
+        :return: Suchtreffer (Folge passender Kurse in Kursreihenfolge) oder
+                 None, wenn die Eingabe leer ist (also alle Kurse passen)
+        """
+        woerter = set(_tokens(text))
+        if not woerter:
+            return None
+        self.baue_auf()
+        return Suchtreffer(self, woerter)
+
+    def _bereiche(self, woerter):
+        """
+        :return: Tupel (von, bis, praefix) je Suchwort; das Suchwort mit den
+                 wenigsten passenden Wörtern steht vorn und liefert die Kandidaten
+        """
+        return sorted(((*self._bereich(w), w) for w in woerter), key=lambda b: b[1] - b[0])
+
+    def _alle(self, bereiche):
+        """
+        :return: Liste aller Kurse, die zu den Bereichen passen, in Kursreihenfolge
+        """
+        von, bis, _ = bereiche[0]
+        treffer = self._nummern(von, bis)
+        sortiert = isinstance(treffer, list)
+        for von, bis, praefix in bereiche[1:]:
+            if not treffer:
+                break
+            if bis - von <= self.MAX_WOERTER_SCHNITT:
+                treffer = set(treffer).intersection(self._nummern(von, bis))
+                sortiert = False
+            else:
+                # Sehr viele passende Wörter (z. B. "k" bei vielen Kurscodes):
+                # Kandidaten direkt prüfen statt eine riesige Menge aufzubauen
+                treffer = list(filter(self._passt(praefix), treffer))
+        if not sortiert:
+            treffer = sorted(treffer)
+        return list(map(self._kurse.__getitem__, treffer))
+
+    def _einzeln(self, bereiche):
+        """
+        Liefert die passenden Kursnummern aufsteigend und erst auf Anfrage.
+        Die sortierten Listen der passenden Wörter werden per heapq.merge
+        zusammengeführt; bei sehr vielen Wörtern werden stattdessen die Kurse
+        der Reihe nach geprüft. Weitere Suchwörter filtern die Kandidaten
+        einzeln, sodass für die ersten Treffer keine Menge entsteht.
+
+        :return: Iterator über Kursnummern
+        """
+        von, bis, praefix = bereiche[0]
+        if bis - von == 1:
+            nummern = iter(self._listen[von])
+        elif bis - von <= self.MAX_WOERTER_SCHNITT:
+            # Ein Kurs mit mehreren passenden Wörtern steht mehrfach im Merge
+            nummern = (n for n, _ in groupby(merge(*self._listen[von:bis])))
+        else:
+            nummern = filter(self._passt(praefix), self._nummer.values())
+        for _, _, praefix in bereiche[1:]:
+            nummern = filter(self._passt(praefix), nummern)
+        return nummern
+
+    def _passt(self, praefix):
+        """
+        :return: Funktion, die für eine Kursnummer prüft, ob Code oder Name ein
+                 Wort mit dem Anfang praefix enthält. Das Ergebnis je Kursname
+                 wird nur einmal bestimmt.
+        """
+        text_von = self._text_von
+        zerlegt = self._zerlegt
+        name_passt = {}
+
+        def passt(n):
+            kurscode, name = text_von[n]
+            ergebnis = name_passt.get(name)
+            if ergebnis is None:
+                ergebnis = name_passt[name] = any(w.startswith(praefix) for w in zerlegt[name])
+            if ergebnis:
+                return True
+            code = kurscode.casefold()
+            if code.isalnum():
+                return code.startswith(praefix)
+            return any(w.startswith(praefix) for w in _tokens(code))
+        return passt
+
+
+class Suchtreffer:
+    """
+    Ergebnis von SuchIndex.suche: Folge der passenden Kurse in Kursreihenfolge,
+    die nur so weit ausgewertet wird, wie auf sie zugegriffen wird. Index oder
+    Ausschnitt am Anfang bestimmen nur diese Treffer; len(), Iteration und
+    negative Indizes werten alle aus.
+
+    Ändert sich der Index, bevor alle Treffer bestimmt sind, wird die Suche
+    beim nächsten Zugriff vollständig auf dem neuen Stand wiederholt. Danach
+    verhält sich das Ergebnis wie eine Liste der damals passenden Kurse.
+    """
+
+    def __init__(self, index, woerter):
+        """
+        :param index: SuchIndex, aus dem die Treffer stammen
+        :param woerter: Menge der Suchwörter
+        """
+        self._index = index
+        self._woerter = woerter
+        self._stand = index._stand
+        self._bereiche = index._bereiche(woerter)
+        self._rest = index._einzeln(self._bereiche)
+        self._kurse = []
+
+    @property
+    def vollstaendig(self):
+        """
+        :return: True, sobald alle Treffer bestimmt sind
+        """
+        return self._rest is None
+
+    def lade(self, anzahl):
+        """
+        Bestimmt die Treffer bis zur angegebenen Anzahl (sofern es so viele gibt).
+
+        :param anzahl: Gewünschte Anzahl Treffer ab dem Anfang
+        :return: Anzahl der davon vorhandenen Treffer
+        """
+        fehlend = anzahl - len(self._kurse)
+        if fehlend > 0 and self._rest is not None:
+            if self._stand != self._index._stand:
+                self._lade_alle()
+            else:
+                vorher = len(self._kurse)
+                self._kurse.extend(map(self._index._kurse.__getitem__, islice(self._rest, fehlend)))
+                if len(self._kurse) - vorher < fehlend:
+                    self._rest = None
+        return min(anzahl, len(self._kurse))
+
+    def _lade_alle(self):
+        """
+        Bestimmt alle Treffer auf einmal (schneller als einzeln).
+        """
+        if self._rest is not None:
+            if self._stand != self._index._stand:
+                self._bereiche = self._index._bereiche(self._woerter)
+            self._kurse = self._index._alle(self._bereiche)
+            self._rest = None
+
+    def __len__(self):
+        self._lade_alle()
+        return len(self._kurse)
+
+    def __bool__(self):
+        return self.lade(1) > 0
+
+    def __iter__(self):
+        self._lade_alle()
+        return iter(self._kurse)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, Suchtreffer)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            if (i.start or 0) >= 0 and i.stop is not None and i.stop >= 0 and (i.step or 1) > 0:
+                self.lade(i.stop)
+            else:
+                self._lade_alle()
+        elif i >= 0:
+            self.lade(i + 1)
+        else:
+            self._lade_alle()
+        return self._kurse[i]
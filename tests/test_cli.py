@@ -0,0 +1,96 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from iu_dashboard.cli import main
+from model import Kurs, KursRepository, Student, StudentRepository
+
+
+@pytest.fixture
+def verzeichnis(tmp_path):
+    StudentRepository.speichere_student(str(tmp_path / "student.csv"), Student("Erika", "Informatik", 30))
+    KursRepository.speichere_kurse(str(tmp_path / "kurse.csv"), [
+        Kurs("MAT01", "Mathematik I", 5, "2.0"),
+        Kurs("PROG01", "Programmierung", 10, "A"),
+        Kurs("ISPE01", "Software Engineering", 5, None),
+        Kurs("WISS01", "Wissenschaftliches Arbeiten", 10, None),
+    ])
+    return str(tmp_path)
+
+
+def _json(capsys, verzeichnis, *argv):
+    assert main(["-d", verzeichnis, *argv]) == 0
+    return json.loads(capsys.readouterr().out)
+
+
+def test_stats(capsys, verzeichnis):
+    assert _json(capsys, verzeichnis, "stats", "--json") == {
+        "name": "Erika", "studiengang": "Informatik", "ects": 15, "ziel_ects": 30,
+        "fortschritt": 50.0, "durchschnitt": 2.0, "benotet": 1, "angerechnet": 1, "offen": 2,
+    }
+
+
+def test_set_grade_schreibt_kurse_csv(capsys, verzeichnis):
+    assert main(["-d", verzeichnis, "set-grade", "ISPE01", "1.0"]) == 0
+    assert main(["-d", verzeichnis, "set-grade", "ISPE01", "7"]) == 1
+    assert main(["-d", verzeichnis, "set-grade", "XYZ", "1.0"]) == 1
+    # Das Journal ist gleich wieder in kurse.csv übernommen
+    assert not os.path.exists(os.path.join(verzeichnis, "kurse.csv.journal"))
+    assert KursRepository.lade_kurse(os.path.join(verzeichnis, "kurse.csv")).finde("ISPE01").note == 1.0
+    assert _json(capsys, verzeichnis, "stats", "--json")["durchschnitt"] == 1.5
+
+
+def test_import_grades(capsys, tmp_path, verzeichnis):
+    datei = tmp_path / "noten.json"
+    datei.write_text(json.dumps({"ISPE01": 1.3, "WISS01": "9", "XYZ": "1.0"}), encoding="utf-8")
+    assert main(["-d", verzeichnis, "import-grades", str(datei)]) == 1
+    ausgabe = capsys.readouterr()
+    assert "1 Noten importiert, 2 abgelehnt" in ausgabe.out
+    assert "ungültige Note" in ausgabe.err and "unbekannter Kurscode" in ausgabe.err
+    assert KursRepository.lade_kurse(os.path.join(verzeichnis, "kurse.csv")).finde("ISPE01").note == 1.3
+
+
+def test_plan(capsys, verzeichnis):
+    plan = _json(capsys, verzeichnis, "plan", "--max-ects", "10", "--json")
+    assert plan["fehlende_ects"] == 15 and plan["erreicht"]
+    assert [[k["Kurscode"] for k in s] for s in plan["semester"]] == [["WISS01"], ["ISPE01"]]
+    assert main(["-d", verzeichnis, "plan", "--max-ects", "10", "--semester", "1"]) == 1
+    assert main(["-d", verzeichnis, "plan", "--max-ects", "0"]) == 1
+
+
+def test_export(capsys, tmp_path, verzeichnis):
+    ziel = str(tmp_path / "export.csv")
+    assert main(["-d", verzeichnis, "export", "-o", ziel]) == 0
+    with open(ziel, encoding="utf-8") as a, open(os.path.join(verzeichnis, "kurse.csv"), encoding="utf-8") as b:
+        assert a.read().splitlines() == b.read().splitlines()
+    daten = _json(capsys, verzeichnis, "export", "--format", "json")
+    assert daten[1] == {"Kurscode": "PROG01", "Kursname": "Programmierung", "ECTS": 10, "Note": "A"}
+
+
+def test_lesende_befehle_schreiben_keinen_cache(capsys, tmp_path, verzeichnis):
+    _json(capsys, verzeichnis, "stats", "--json")
+    _json(capsys, verzeichnis, "export", "--format", "json")
+    _json(capsys, verzeichnis, "plan", "--max-ects", "10", "--json")
+    assert [d for d in os.listdir(verzeichnis) if d.endswith(".cache")] == []
+
+
+def test_migrate_und_datenbank(capsys, tmp_path, verzeichnis):
+    db = str(tmp_path / "kurse.db")
+    assert main(["-d", verzeichnis, "migrate", db]) == 0
+    assert "4 Kurse" in capsys.readouterr().out
+    assert main(["--datenbank", db, "set-grade", "WISS01", "3.0"]) == 0
+    assert _json(capsys, verzeichnis, "--datenbank", db, "stats", "--json")["durchschnitt"] == 2.67
+
+
+def test_importiert_weder_tkinter_noch_sqlite3(verzeichnis):
+    code = ("import sys\n"
+            "from iu_dashboard.cli import main\n"
+            f"main(['-d', {verzeichnis!r}, 'stats'])\n"
+            "print('tkinter' in sys.modules, 'sqlite3' in sys.modules)")
+    wurzel = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    ausgabe = subprocess.run([sys.executable, "-c", code], cwd=wurzel, capture_output=True,
+                             text=True, check=True).stdout
+    assert ausgabe.splitlines()[-1] == "False False"
@@ -0,0 +1,185 @@
+import sys
+import types
+
+import pytest
+
+from datenquelle import CsvDatenquelle
+from model import Kurs, KursListe, KursRepository, Student, StudentRepository
+
+
+class _View:
+    """
+    Ersatz für die Tk-View: zählt nur die Aktualisierungen.
+    """
+
+    def __init__(self, controller, student, kurse, ects, durchschnitt):
+        self.aktualisierungen = []
+
+    def update_student_info(self, student, ects, durchschnitt, geaenderte_kurse=None,
+                            geaenderte_stats=None, zeilen_geaendert=False):
+        self.aktualisierungen.append((ects, durchschnitt, geaenderte_kurse, geaenderte_stats))
+
+    def destroy(self):
+        pass
+
+    def mainloop(self):
+        pass
+
+
+class _ZaehlendeDatenquelle(CsvDatenquelle):
+    """
+    CSV-Datenquelle, die jeden Schreibvorgang mitzählt.
+    """
+
+    def __init__(self, verzeichnis):
+        super().__init__(verzeichnis)
+        self.schreibvorgaenge = []
+
+    def protokolliere(self, aenderungen):
+        self.schreibvorgaenge.append(list(aenderungen))
+        super().protokolliere(aenderungen)
+
+
+def _kurse():
+    return KursListe([
+        Kurs("MAT01", "Mathematik I", 5, "2.3"),
+        Kurs("PROG01", "Programmierung", 10, "A"),
+        Kurs("ISPE01", "Software Engineering", 5, None),
+    ])
+
+
+def _stand(kurse):
+    return [(k.kurscode, k.name, k.ects, k.note) for k in kurse]
+
+
+@pytest.fixture
+def controller(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "view", types.SimpleNamespace(View=_View))
+    from controller import Controller
+    StudentRepository.speichere_student(str(tmp_path / "student.csv"), Student("Erika", "Informatik", 180))
+    KursRepository.speichere_kurse(str(tmp_path / "kurse.csv"), _kurse())
+    c = Controller(_ZaehlendeDatenquelle(str(tmp_path)))
+    yield c
+    c.beenden()
+
+
+def test_aktualisiere_kurs_speichert_und_zeichnet_einmal(controller):
+    assert controller.aktualisiere_kurs("ISPE01", neuer_kurscode="ISPE02", neuer_name="Spezifikation",
+                                        neue_ects="10", neue_note="1.7")
+    controller.speicher.flush()
+    assert controller.datenquelle.schreibvorgaenge == [[
+        ("ISPE01", "Kurscode", "ISPE02", "ISPE01"),
+        ("ISPE02", "Kursname", "Spezifikation", "Software Engineering"),
+        ("ISPE02", "ECTS", 10, 5),
+        ("ISPE02", "Note", 1.7, None),
+    ]]
+    aktualisierungen = controller.view.aktualisierungen
+    assert len(aktualisierungen) == 1
+    ects, durchschnitt, geaendert, stats = aktualisierungen[0]
+    assert (ects, durchschnitt) == (25, 1.9)
+    assert [k.kurscode for k in geaendert] == ["ISPE02"] and stats == {"ects", "durchschnitt"}
+    assert controller.suche_kurse("spez") == [controller.kurse.finde("ISPE02")]
+    assert _stand(controller.datenquelle.lade_kurse()) == _stand(controller.kurse)
+
+
+@pytest.mark.parametrize("felder", [
+    {"neuer_kurscode": "PROG01"},
+    {"neuer_kurscode": " PROG01 "},
+    {"neuer_kurscode": ""},
+    {"neuer_kurscode": "   "},
+    {"neue_ects": "zehn"},
+    {"neue_ects": "0"},
+    {"neue_ects": "-5"},
+    {"neue_ects": "70000"},
+    {"neue_note": "6.0"},
+])
+def test_aktualisiere_kurs_ganz_oder_gar_nicht(controller, felder):
+    vorher = _stand(controller.kurse)
+    gueltig = {"neuer_kurscode": "ISPE02", "neuer_name": "Neu", "neue_ects": "10", "neue_note": "1.0"}
+    with pytest.raises(ValueError):
+        controller.aktualisiere_kurs("ISPE01", **{**gueltig, **felder})
+    # Die Einzelmethoden melden denselben Fehler als False
+    einzeln = {"neuer_kurscode": lambda w: controller.aktualisiere_kurscode("ISPE01", w),
+               "neue_ects": lambda w: controller.aktualisiere_kurs_ects("ISPE01", w),
+               "neue_note": lambda w: controller.aktualisiere_note("ISPE01", w)}
+    (feld, wert), = felder.items()
+    assert einzeln[feld](wert) is False
+    controller.speicher.flush()
+    assert _stand(controller.kurse) == vorher
+    assert (controller.ects, controller.durchschnitt) == (15, 2.3)
+    assert controller.datenquelle.schreibvorgaenge == []
+    assert controller.view.aktualisierungen == []
+
+
+def test_aktualisiere_kurs_kuerzt_kurscode(controller):
+    assert controller.aktualisiere_kurs("ISPE01", neuer_kurscode=" ISPE02 ")
+    assert "ISPE02" in controller.kurse and "ISPE02 " not in controller.kurse
+    assert controller.aktualisiere_kurs("ISPE02", neuer_kurscode="ISPE02 ")
+    assert [k.kurscode for k in controller.kurse] == ["MAT01", "PROG01", "ISPE02"]
+
+
+def test_aktualisiere_unbekannten_kurs(controller):
+    assert not controller.aktualisiere_note("XYZ", "1.0")
+    assert controller.view.aktualisierungen == []
+
+
+def test_aktualisiere_kurs_ohne_aenderung_schreibt_nichts(controller):
+    assert controller.aktualisiere_note("MAT01", "2.3")
+    controller.speicher.flush()
+    assert controller.datenquelle.schreibvorgaenge == []
+    assert controller.view.aktualisierungen[0][2] == []
+
+
+def test_externe_aenderung_wird_uebernommen(controller, tmp_path):
+    pfad = str(tmp_path / "kurse.csv")
+    assert controller.aktualisiere_note("ISPE01", "2.0")
+    controller.speicher.flush()
+    # Ein anderes Programm schreibt kurse.csv neu, ohne das Journal zu kennen
+    extern = KursRepository.lade_kurse(pfad)
+    extern.finde("MAT01").note = 1.0
+    extern.finde("ISPE01").note = 1.3
+    extern.entferne("PROG01")
+    extern.anhaengen(Kurs("NEU01", "Neu", 5, "2.0"))
+    KursRepository.speichere_kurse(pfad, extern)
+
+    assert controller.pruefe_externe_aenderungen() is None
+    controller.waechter._thread.join(5)
+    assert controller.pruefe_externe_aenderungen() is None
+    controller.speicher.flush()
+
+    erwartet = [("MAT01", "Mathematik I", 5, 1.0), ("ISPE01", "Software Engineering", 5, 1.3),
+                ("NEU01", "Neu", 5, 2.0)]
+    assert _stand(controller.kurse) == erwartet
+    assert (controller.ects, controller.durchschnitt) == (15, 1.43)
+    assert controller.suche_kurse("neu") == [controller.kurse.finde("NEU01")]
+    assert controller.view.aktualisierungen[-1][:2] == (15, 1.43)
+    # Die überholte eigene Änderung wurde verdichtet statt später erneut zu greifen
+    assert controller.datenquelle.journal.ist_leer()
+    assert _stand(KursRepository.lade_kurse(pfad)) == erwartet
+
+
+def test_importiere_noten_speichert_und_zeichnet_einmal(controller, tmp_path):
+    datei = tmp_path / "noten.csv"
+    datei.write_text("Kurscode,Note\nISPE01,1.7\nMAT01,9\nXYZ,1.0\nMAT01,2.3\nPROG01,1.0\n",
+                     encoding="utf-8")
+    anzahl, abgelehnt = controller.importiere_noten(str(datei))
+    controller.speicher.flush()
+    assert anzahl == 2
+    assert abgelehnt == [(3, "MAT01", "9", "ungültige Note"), (4, "XYZ", "1.0", "unbekannter Kurscode")]
+    assert controller.datenquelle.schreibvorgaenge == [[
+        ("ISPE01", "Note", 1.7, None),
+        ("PROG01", "Note", 1.0, 0.0),
+    ]]
+    assert len(controller.view.aktualisierungen) == 1
+    assert controller.view.aktualisierungen[0][:2] == (20, 1.5)
+    assert [k.kurscode for k in controller.sortiere_kurse("Note")] == ["PROG01", "ISPE01", "MAT01"]
+
+
+def test_importiere_noten_ohne_aenderung(controller, tmp_path):
+    datei = tmp_path / "noten.json"
+    datei.write_text('{"MAT01": "2.3", "XYZ": "1.0"}', encoding="utf-8")
+    assert controller.importiere_noten(str(datei)) == (0, [(2, "XYZ", "1.0", "unbekannter Kurscode")])
+    assert controller.view.aktualisierungen == []
+    datei.write_text("[1]", encoding="utf-8")
+    with pytest.raises(ValueError):
+        controller.importiere_noten(str(datei))
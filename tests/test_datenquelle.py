@@ -0,0 +1,104 @@
+import pytest
+
+from datenquelle import CsvDatenquelle, SqliteDatenquelle
+from model import Kurs, KursListe, KursRepository, Student, StudentRepository
+from service import Service
+
+
+def _kurse():
+    return KursListe([
+        Kurs("MAT01", "Mathematik I", 5, "2.3"),
+        Kurs("PROG01", "Programmierung", 10, "A"),
+        Kurs("ISPE01", "Software Engineering", 5, None),
+        Kurs("WISS01", "Wissenschaftliches Arbeiten", 5, "1.7"),
+    ])
+
+
+def _stand(kurse):
+    return [(k.kurscode, k.name, k.ects, k.note) for k in kurse]
+
+
+@pytest.fixture
+def sqlite(tmp_path):
+    quelle = SqliteDatenquelle(str(tmp_path / "kurse.db"))
+    yield quelle
+    quelle.schliesse()
+
+
+def test_sqlite_kurse_und_student(sqlite):
+    assert sqlite.lade_student() is None and len(sqlite.lade_kurse()) == 0
+    sqlite.speichere_student(Student("Max Mustermann", "Informatik", 180))
+    sqlite.speichere_kurse(_kurse())
+    student = sqlite.lade_student()
+    assert (student.name, student.studiengang, student.ziel_ects) == ("Max Mustermann", "Informatik", 180)
+    assert _stand(sqlite.lade_kurse()) == _stand(_kurse())
+    tabelle = sqlite.lade_kurse(tabelle=True)
+    assert [k.kurscode for k in tabelle] == ["MAT01", "PROG01", "ISPE01", "WISS01"]
+    assert tabelle.finde("PROG01").note == 0.0
+
+
+def test_sqlite_protokolliere(sqlite):
+    sqlite.speichere_kurse(_kurse())
+    sqlite.protokolliere([
+        ("ISPE01", "Note", 1.3, None),
+        ("MAT01", "ECTS", 10, 5),
+        ("PROG01", "Kurscode", "PROG02", "PROG01"),
+        ("PROG02", "Kursname", "Programmierung I", "Programmierung"),
+        ("XYZ", "Note", 1.0, None),
+    ])
+    assert _stand(sqlite.lade_kurse()) == [
+        ("MAT01", "Mathematik I", 10, 2.3),
+        ("PROG02", "Programmierung I", 10, 0.0),
+        ("ISPE01", "Software Engineering", 5, 1.3),
+        ("WISS01", "Wissenschaftliches Arbeiten", 5, 1.7),
+    ]
+    assert sqlite.finde_kurs("ISPE01").note == 1.3
+    assert sqlite.finde_kurs("PROG01") is None
+
+
+def test_sqlite_kennzahlen_wie_service(sqlite):
+    kurse = _kurse()
+    sqlite.speichere_kurse(kurse)
+    assert sqlite.kennzahlen() == {
+        "ects": Service.berechne_ects(kurse),
+        "durchschnitt": Service.berechne_durchschnitt(kurse),
+        **Service.zaehle_status(kurse),
+    }
+
+
+def test_sqlite_kennzahlen_genaue_noten(sqlite):
+    kurse = KursListe([Kurs("A", "a", 3, "1.006"), Kurs("B", "b", 1, "1.0"), Kurs("C", "c", 3, "A")])
+    sqlite.speichere_kurse(kurse)
+    assert sqlite.kennzahlen()["durchschnitt"] == Service.berechne_durchschnitt(kurse) == 1.0
+
+
+def test_csv_kennzahlen_nach_ungueltiger_ects_aenderung(tmp_path):
+    quelle = CsvDatenquelle(str(tmp_path))
+    quelle.speichere_kurse(_kurse())
+    quelle.protokolliere([("MAT01", "ECTS", -5, 5), ("WISS01", "ECTS", 70000, 5)])
+    assert quelle.kennzahlen()["ects"] == Service.berechne_ects(_kurse())
+
+
+def test_sqlite_erkennt_fremde_aenderung(sqlite):
+    sqlite.speichere_kurse(_kurse())
+    sqlite.lade_kurse()
+    assert not sqlite.fremd_geaendert()
+    fremd = SqliteDatenquelle(sqlite.pfad)
+    fremd.protokolliere([("MAT01", "Note", 1.0, 2.3)])
+    fremd.schliesse()
+    assert sqlite.fremd_geaendert()
+
+
+def test_sqlite_aus_csv(tmp_path):
+    verzeichnis = str(tmp_path)
+    StudentRepository.speichere_student(str(tmp_path / "student.csv"), Student("Erika", "Informatik", 180))
+    KursRepository.speichere_kurse(str(tmp_path / "kurse.csv"), _kurse())
+    CsvDatenquelle(verzeichnis).protokolliere([("ISPE01", "Note", 2.0, None)])
+
+    quelle = SqliteDatenquelle.aus_csv(str(tmp_path / "kurse.db"), verzeichnis)
+    try:
+        assert quelle.lade_student().name == "Erika"
+        assert quelle.finde_kurs("ISPE01").note == 2.0
+        assert len(quelle.lade_kurse()) == 4
+    finally:
+        quelle.schliesse()
@@ -0,0 +1,83 @@
+import json
+import os
+
+import pytest
+
+import instrumentierung
+
+
+@pytest.fixture(autouse=True)
+def leere_messwerte(monkeypatch):
+    monkeypatch.setattr(instrumentierung, "_messwerte", {})
+
+
+def test_aus_umgebung(monkeypatch):
+    for wert, erwartet in (("", None), ("0", None), ("1", instrumentierung.STANDARD_AUSGABE),
+                           (" profil.json ", "profil.json")):
+        monkeypatch.setenv(instrumentierung.UMGEBUNGSVARIABLE, wert)
+        assert instrumentierung.aus_umgebung() == erwartet
+    monkeypatch.delenv(instrumentierung.UMGEBUNGSVARIABLE)
+    assert instrumentierung.aus_umgebung() is None
+
+
+def test_umhuelle_misst_zeit_und_bytes(tmp_path):
+    pfad = str(tmp_path / "daten.txt")
+
+    class Repository:
+        @staticmethod
+        def schreibe(dateipfad, text):
+            with open(dateipfad, "w", encoding="utf-8") as f:
+                f.write(text)
+
+        def haenge_an(self, text):
+            with open(pfad, "a", encoding="utf-8") as f:
+                f.write(text)
+            return len(text)
+
+        def fehler(self):
+            raise ValueError("kaputt")
+
+    instrumentierung._umhuelle(Repository, "schreibe", pfad_von=lambda args: args[0])
+    instrumentierung._umhuelle(Repository, "haenge_an", pfad_von=lambda args: pfad, anhaengend=True)
+    instrumentierung._umhuelle(Repository, "fehler")
+
+    Repository.schreibe(pfad, "x" * 100)
+    Repository.schreibe(pfad, "x" * 10)
+    assert Repository().haenge_an("y" * 5) == 5
+    with pytest.raises(ValueError):
+        Repository().fehler()
+
+    messwerte = instrumentierung.messwerte()
+    # Überschreiben zählt die Dateigröße danach, Anhängen nur den Zuwachs
+    assert messwerte["Repository.schreibe"]["aufrufe"] == 2
+    assert messwerte["Repository.schreibe"]["bytes"] == 110
+    assert messwerte["Repository.haenge_an"]["bytes"] == 5
+    # Auch ein fehlgeschlagener Aufruf wird gemessen
+    fehler = messwerte["Repository.fehler"]
+    assert (fehler["aufrufe"], fehler["bytes"]) == (1, 0)
+    assert Repository.schreibe.__name__ == "schreibe"
+
+
+def test_text_und_json(tmp_path):
+    instrumentierung.erfasse("Controller.aktualisiere_kurs", 0.002, 10)
+    instrumentierung.erfasse("Controller.aktualisiere_kurs", 0.004)
+    instrumentierung.erfasse("KursRepository.lade_kurse", 0.5)
+    zeilen = instrumentierung.als_text().splitlines()
+    assert zeilen[1].startswith("KursRepository.lade_kurse") and zeilen[2].startswith("Controller.")
+
+    pfad = str(tmp_path / "profil.json")
+    instrumentierung.schreibe_json(pfad)
+    with open(pfad, encoding="utf-8") as f:
+        m = json.load(f)["Controller.aktualisiere_kurs"]
+    assert (m["aufrufe"], m["bytes"], m["max_s"]) == (2, 10, 0.004)
+    assert m["gesamt_s"] == pytest.approx(0.006)
+
+
+def test_profilaufnahme(tmp_path):
+    aufnahme = instrumentierung.ProfilAufnahme()
+    assert aufnahme.stoppe() is None
+    aufnahme.starte()
+    assert aufnahme.laeuft
+    sum(range(1000))
+    pfad = aufnahme.stoppe(str(tmp_path / "aufnahme.prof"))
+    assert not aufnahme.laeuft and os.path.getsize(pfad) > 0
@@ -0,0 +1,132 @@
+import csv
+import os
+import random
+import statistics
+
+import pytest
+
+import kohorte
+from model import Kurs, KursJournal, KursKatalog, KursRepository, Student, StudentRepository
+
+
+def _lege_an(wurzel, name, kurse, ziel_ects=180):
+    verzeichnis = os.path.join(str(wurzel), name)
+    os.makedirs(verzeichnis)
+    StudentRepository.speichere_student(os.path.join(verzeichnis, kohorte.STUDENT_DATEI),
+                                        Student(name, "Informatik", ziel_ects))
+    KursRepository.speichere_kurse(os.path.join(verzeichnis, kohorte.KURSE_DATEI), kurse)
+    return verzeichnis
+
+
+def _kohorte(wurzel):
+    a = _lege_an(wurzel, "a", [Kurs("MAT01", "Mathematik I", 5, "2.0"),
+                               Kurs("PROG01", "Programmierung", 10, "1.0"),
+                               Kurs("ISPE01", "Software Engineering", 5, None)])
+    b = _lege_an(wurzel, "b", [Kurs("MAT01", "Mathematik I", 5, "3.0"),
+                               Kurs("PROG01", "Programmierung", 10, "A")], ziel_ects=0)
+    return a, b
+
+
+def test_werte_aus_mit_journal(tmp_path):
+    a, _ = _kohorte(tmp_path)
+    KursJournal(os.path.join(a, kohorte.KURSE_DATEI)).protokolliere([("ISPE01", "Note", 4.0, None)])
+    # (2.0 * 5 + 1.0 * 10 + 4.0 * 5) / 20
+    assert kohorte.werte_aus(a) == [a, "a", "Informatik", 180, 20, 2.0, 11.1, ""]
+
+
+def test_werte_aus_meldet_fehler(tmp_path):
+    a, b = _kohorte(tmp_path)
+    with open(os.path.join(a, kohorte.KURSE_DATEI), "w", encoding="utf-8") as f:
+        # Ein Feld über csv.field_size_limit() hinaus ist ein csv.Error
+        f.write("Kurscode,Kursname,ECTS,Note\nMAT01," + "x" * (csv.field_size_limit() + 1) + ",5,2.0\n")
+    zeile = kohorte.werte_aus(a)
+    assert zeile[:7] == [a, "", "", "", "", "", ""] and zeile[7]
+    os.remove(os.path.join(b, kohorte.STUDENT_DATEI))
+    assert kohorte.werte_aus(b)[7]
+
+
+def test_katalog_nur_je_block(tmp_path):
+    a, b = _kohorte(tmp_path)
+    katalog = KursKatalog()
+    assert [kohorte.werte_aus(v, katalog)[4] for v in (a, b, a)] == [15, 15, 15]
+    # Gleiche Kurse teilen sich Einträge; ohne Katalog bleibt nichts im Prozess zurück
+    assert len(katalog) == 3
+    assert kohorte._werte_block_aus([a, b]) == [kohorte.werte_aus(a), kohorte.werte_aus(b)]
+    assert not any(isinstance(wert, KursKatalog) for wert in vars(kohorte).values())
+    statistiken = kohorte.KursStatistiken()
+    statistiken.erfasse_verzeichnis(a)
+    statistiken.erfasse_verzeichnis(b, katalog)
+    assert statistiken.kurse["MAT01"].anzahl == 2 and len(katalog) == 3
+
+
+def test_zusammenfassung_in_verzeichnisreihenfolge(tmp_path):
+    a, b = _kohorte(tmp_path)
+    os.makedirs(tmp_path / "leer")
+    assert list(kohorte.finde_studierende(str(tmp_path))) == [a, b]
+
+    ausgabe = str(tmp_path / "ergebnis.csv")
+    assert kohorte.schreibe_zusammenfassung(str(tmp_path), ausgabe, max_workers=2, blockgroesse=1) == 2
+    with open(ausgabe, newline="", encoding="utf-8") as f:
+        zeilen = list(csv.reader(f))
+    assert zeilen[0] == kohorte.HEADERS
+    assert zeilen[1:] == [[a, "a", "Informatik", "180", "15", "1.33", "8.3", ""],
+                          [b, "b", "Informatik", "0", "15", "3.0", "0", ""]]
+
+
+def _statistik(noten):
+    s = kohorte.NotenStatistik("Kurs")
+    for note in noten:
+        s.erfasse(note)
+    return s
+
+
+def test_notenstatistik_momente_und_quantile():
+    rnd = random.Random(0)
+    noten = [rnd.choice((1.0, 1.3, 1.7, 2.0, 2.3, 3.0, 4.0, 5.0)) for _ in range(501)]
+    s = _statistik(noten + [None, None, 0.0])
+    assert (s.anzahl, s.offen, s.angerechnet) == (501, 2, 1)
+    assert s.mittel == pytest.approx(statistics.fmean(noten))
+    assert s.varianz == pytest.approx(statistics.variance(noten))
+    assert (s.minimum, s.maximum) == (min(noten), max(noten))
+    sortiert = sorted(noten)
+    # Nearest-Rank: Rang ceil(p * n)
+    assert s.quantile((0.1, 0.5, 0.9, 1.0)) == [sortiert[50], sortiert[250], sortiert[450], sortiert[500]]
+    assert _statistik([2.0]).varianz is None and _statistik([]).quantile() == []
+
+
+def test_notenstatistik_vereinige_wie_ein_durchlauf():
+    rnd = random.Random(1)
+    noten = [rnd.choice((None, 0.0, 1.0, 1.7, 2.3, 3.3, 4.0)) for _ in range(300)]
+    gesamt = _statistik(noten)
+    teile = [_statistik(noten[:0]), _statistik(noten[:120]), _statistik(noten[120:]), _statistik([])]
+    vereinigt = kohorte.NotenStatistik()
+    for teil in teile:
+        vereinigt.vereinige(teil)
+    assert vereinigt.name == "Kurs"
+    assert (vereinigt.anzahl, vereinigt.offen, vereinigt.angerechnet, vereinigt.minimum, vereinigt.maximum) == \
+        (gesamt.anzahl, gesamt.offen, gesamt.angerechnet, gesamt.minimum, gesamt.maximum)
+    assert vereinigt.mittel == pytest.approx(gesamt.mittel)
+    assert vereinigt.varianz == pytest.approx(gesamt.varianz)
+    assert vereinigt.quantile() == gesamt.quantile()
+
+
+def test_kursstatistik_ueber_kohorte(tmp_path):
+    a, b = _kohorte(tmp_path)
+    KursJournal(os.path.join(a, kohorte.KURSE_DATEI)).protokolliere([("ISPE01", "Note", 4.0, None)])
+    kaputt = os.path.join(str(tmp_path), "c")
+    os.makedirs(kaputt)
+    for datei in (kohorte.STUDENT_DATEI, kohorte.KURSE_DATEI):
+        with open(os.path.join(kaputt, datei), "w", encoding="utf-8") as f:
+            f.write("Kurscode\nMAT01\n")
+
+    ausgabe = str(tmp_path / "kurse.csv")
+    statistiken = kohorte.schreibe_kursstatistik(str(tmp_path), ausgabe, max_workers=2, blockgroesse=1)
+    assert (statistiken.dateien, statistiken.fehlerhaft) == (2, 1)
+    with open(ausgabe, newline="", encoding="utf-8") as f:
+        zeilen = list(csv.reader(f))
+    assert zeilen[0] == kohorte.KURS_HEADERS
+    assert zeilen[1:] == [
+        ["ISPE01", "Software Engineering", "1", "4.0", "", "4.0", "4.0", "4.0", "4.0", "4.0", "4.0", "4.0", "0", "0"],
+        ["MAT01", "Mathematik I", "2", "2.5", "0.5", "2.0", "3.0", "2.0", "2.0", "2.0", "3.0", "3.0", "0", "0"],
+        ["PROG01", "Programmierung", "1", "1.0", "", "1.0", "1.0", "1.0", "1.0", "1.0", "1.0", "1.0", "1", "0"],
+    ]
@@ -0,0 +1,424 @@
+import gzip
+import os
+from array import array
+
+import pytest
+
+from model import (Kurs, KursJournal, KursKatalog, KursListe, KursRepository, KursTabelle,
+                   NotenImportRepository, NotenTabelle, SnapshotCache, SpaltenKursListe, Student,
+                   StudentRepository)
+from service import Service, StatistikAggregator
+
+
+def _kurse():
+    return KursListe([
+        Kurs("MAT01", "Mathematik I", 5, "2.3"),
+        Kurs("PROG01", "Programmierung", 10, "A"),
+        Kurs("ISPE01", "Software Engineering", 5, None),
+    ])
+
+
+def _spalten_kurse():
+    return SpaltenKursListe(
+        ["MAT01", "PROG01", "ISPE01"],
+        ["Mathematik I", "Programmierung", "Software Engineering"],
+        array("H", [5, 10, 5]),
+        array("d", [2.3, 0.0, -1.0]),
+    )
+
+
+def _stand(kurse):
+    return [(k.kurscode, k.name, k.ects, k.note) for k in kurse]
+
+
+def test_kursliste_index_und_reihenfolge():
+    kurse = _kurse()
+    assert len(kurse) == 3
+    assert "PROG01" in kurse and "XYZ" not in kurse
+    assert kurse.finde("ISPE01") is kurse[2]
+    assert kurse.finde("XYZ") is None
+    assert [k.kurscode for k in kurse] == ["MAT01", "PROG01", "ISPE01"]
+
+
+def test_kursliste_lehnt_doppelte_kurscodes_ab():
+    kurse = _kurse()
+    with pytest.raises(ValueError):
+        kurse.anhaengen(Kurs("MAT01", "Doppelt", 5))
+    with pytest.raises(ValueError):
+        KursListe([Kurs("A", "a", 5), Kurs("A", "b", 5)])
+
+
+def test_kursliste_aendere_kurscode():
+    kurse = _kurse()
+    version = kurse.version
+    assert kurse.aendere_kurscode("MAT01", "MAT02")
+    assert kurse.finde("MAT02").name == "Mathematik I" and "MAT01" not in kurse
+    assert kurse.version == version + 1
+    assert not kurse.aendere_kurscode("MAT02", "PROG01")
+    assert not kurse.aendere_kurscode("XYZ", "ABC")
+    assert kurse.version == version + 1
+
+
+def test_kursliste_entferne_viele():
+    kurse = _kurse()
+    version = kurse.version
+    entfernt = kurse.entferne_viele(["ISPE01", "XYZ", "MAT01"])
+    assert [k.kurscode for k in entfernt] == ["ISPE01", "MAT01"]
+    assert [k.kurscode for k in kurse] == ["PROG01"]
+    assert "MAT01" not in kurse and kurse.version == version + 1
+    assert kurse.entferne_viele(["XYZ"]) == [] and kurse.version == version + 1
+
+
+def test_kursliste_version_zaehlt_aenderungen():
+    kurse = _kurse()
+    version = kurse.version
+    kurse.anhaengen(Kurs("NEU01", "Neu", 5))
+    kurse.entferne("NEU01")
+    kurse.markiere_geaendert()
+    assert kurse.version == version + 3
+    assert kurse.entferne("NEU01") is None and kurse.version == version + 3
+
+
+def test_journal_wiedergabe(tmp_path):
+    pfad = str(tmp_path / "kurse.csv")
+    KursRepository.speichere_kurse(pfad, _kurse())
+    journal = KursJournal(pfad)
+    journal.protokolliere([
+        ("MAT01", "Note", 1.7, 2.3),
+        ("ISPE01", "ECTS", 10, 5),
+        ("PROG01", "Kurscode", "PROG02", "PROG01"),
+        ("PROG02", "Kursname", "Programmierung I", "Programmierung"),
+        ("XYZ", "Note", 1.0, None),
+    ])
+    kurse = journal.lade_kurse()
+    assert _stand(kurse) == [
+        ("MAT01", "Mathematik I", 5, 1.7),
+        ("PROG02", "Programmierung I", 10, 0.0),
+        ("ISPE01", "Software Engineering", 10, None),
+    ]
+
+
+def test_journal_ueberspringt_unvollstaendige_zeilen(tmp_path):
+    pfad = str(tmp_path / "kurse.csv")
+    KursRepository.speichere_kurse(pfad, _kurse())
+    with open(pfad + ".journal", "w", encoding="utf-8") as f:
+        # Alte Einträge ohne bisherigen Wert und eine abgebrochene Zeile
+        f.write("MAT01,Note,1.0\nISPE01,No")
+    kurse = KursJournal(pfad).lade_kurse()
+    assert kurse.finde("MAT01").note == 1.0 and kurse.finde("ISPE01").note is None
+
+
+def test_journal_behaelt_externe_aenderung(tmp_path):
+    pfad = str(tmp_path / "kurse.csv")
+    KursRepository.speichere_kurse(pfad, _kurse())
+    journal = KursJournal(pfad)
+    journal.protokolliere([("MAT01", "Note", 2.0, 2.3), ("ISPE01", "Note", 1.3, None)])
+    # Ein anderes Programm schreibt die CSV (ohne Journal) mit einer neuen Note neu
+    extern = KursRepository.lade_kurse(pfad)
+    extern.finde("MAT01").note = 1.0
+    KursRepository.speichere_kurse(pfad, extern)
+
+    kurse = KursRepository.lade_kurse(pfad)
+    assert journal.wiedergeben(kurse) == 1
+    assert kurse.finde("MAT01").note == 1.0
+    assert kurse.finde("ISPE01").note == 1.3
+
+
+def test_journal_verdichten(tmp_path):
+    pfad = str(tmp_path / "kurse.csv")
+    KursRepository.speichere_kurse(pfad, _kurse())
+    journal = KursJournal(pfad, schwelle=1)
+    assert journal.ist_leer() and not journal.muss_verdichten()
+    journal.protokolliere([("MAT01", "Note", 1.0, 2.3)])
+    assert not journal.ist_leer() and journal.muss_verdichten()
+
+    kurse = journal.lade_kurse()
+    journal.verdichte(kurse, im_hintergrund=False)
+    assert journal.ist_leer()
+    assert not os.path.exists(journal.alt_pfad)
+    assert _stand(KursRepository.lade_kurse(pfad)) == _stand(kurse)
+
+
+def test_journal_verdichten_im_hintergrund(tmp_path):
+    pfad = str(tmp_path / "kurse.csv")
+    KursRepository.speichere_kurse(pfad, _kurse())
+    journal = KursJournal(pfad)
+    journal.protokolliere([("MAT01", "Note", 1.0, 2.3)])
+    kurse = journal.lade_kurse()
+    journal.verdichte(kurse)
+    # Änderungen während der Verdichtung landen im frischen Journal
+    journal.protokolliere([("ISPE01", "Note", 3.0, None)])
+    journal.warte()
+    assert _stand(journal.lade_kurse()) == [
+        ("MAT01", "Mathematik I", 5, 1.0),
+        ("PROG01", "Programmierung", 10, 0.0),
+        ("ISPE01", "Software Engineering", 5, 3.0),
+    ]
+
+
+@pytest.mark.parametrize("oeffne", [open, gzip.open])
+def test_iter_kurse_blockweise(tmp_path, oeffne):
+    pfad = str(tmp_path / "kurse.csv")
+    with oeffne(pfad, "wt", newline="", encoding="utf-8") as f:
+        # Andere Spaltenreihenfolge, Zusatzspalte, Leerzeile und eine Zeile ohne Note
+        f.write("Semester,Kurscode,ECTS,Kursname,Note\n"
+                "1,MAT01,5,Mathematik I,2.3\n"
+                "1,PROG01,10,Programmierung,A\n"
+                "\n"
+                "2,ISPE01,5,Software Engineering\n"
+                "2,WISS01,5,Wissenschaftliches Arbeiten,1.0\n")
+    bloecke = list(KursRepository.iter_kurse(pfad, chunk_size=2))
+    assert [len(b) for b in bloecke] == [2, 2]
+    assert _stand([k for b in bloecke for k in b])[:3] == _stand(_kurse())
+    assert _stand(KursRepository.lade_kurse(pfad)) == _stand([k for b in bloecke for k in b])
+
+
+def test_iter_kurse_pflichtspalte_fehlt(tmp_path):
+    pfad = str(tmp_path / "kurse.csv.gz")
+    with gzip.open(pfad, "wt", encoding="utf-8") as f:
+        f.write("Kurscode,Kursname,Note\nMAT01,Mathematik I,2.3\n")
+    with pytest.raises(ValueError):
+        next(KursRepository.iter_kurse(pfad))
+
+
+def test_kurstabelle_wie_kursliste():
+    tabelle = KursTabelle(_kurse())
+    assert _stand(tabelle) == _stand(_kurse())
+    assert len(tabelle) == 3 and "PROG01" in tabelle and "XYZ" not in tabelle
+    assert tabelle.finde("PROG01").note == 0.0 and tabelle.finde("ISPE01").note is None
+    assert tabelle[-1] == tabelle.finde("ISPE01") and tabelle.finde("XYZ") is None
+    with pytest.raises(ValueError):
+        tabelle.anhaengen(Kurs("MAT01", "Doppelt", 5))
+
+
+def test_kurstabelle_aenderungen_ueber_zeilen():
+    tabelle = KursTabelle(_kurse())
+    version = tabelle.version
+    zeile = tabelle.finde("ISPE01")
+    zeile.note, zeile.ects, zeile.name = 1.7, 10, "Spezifikation"
+    assert tabelle.aendere_kurscode("ISPE01", "ISPE02") and not tabelle.aendere_kurscode("MAT01", "PROG01")
+    assert tabelle.version == version + 4
+    kopie = tabelle.entferne("MAT01")
+    assert _stand([kopie]) == [("MAT01", "Mathematik I", 5, 2.3)]
+    assert _stand(tabelle) == [("PROG01", "Programmierung", 10, 0.0),
+                               ("ISPE02", "Spezifikation", 10, 1.7)]
+    assert tabelle.finde("ISPE02").kurscode == "ISPE02"
+
+
+def test_kurstabelle_lehnt_negative_noten_ab():
+    tabelle = KursTabelle()
+    with pytest.raises(ValueError):
+        tabelle.anhaengen_werte("X", "x", 5, -1.0)
+    assert len(tabelle) == 0
+
+
+def test_kurstabelle_laden_und_speichern(tmp_path):
+    pfad = str(tmp_path / "kurse.csv")
+    KursRepository.speichere_kurse(pfad, _kurse())
+    tabelle = KursRepository.lade_kurstabelle(pfad)
+    assert _stand(tabelle) == _stand(_kurse())
+    KursRepository.speichere_kurse(pfad, tabelle)
+    assert _stand(KursRepository.lade_kurse(pfad)) == _stand(_kurse())
+
+
+def test_spalten_speichern_noten_verlustfrei(tmp_path):
+    pfad = str(tmp_path / "kurse.csv")
+    kurse = KursListe([Kurs("A", "a", 3, "1.006"), Kurs("B", "b", 1, "1.0"), Kurs("C", "c", 5, "2.3333")])
+    KursRepository.speichere_kurse(pfad, kurse)
+    KursJournal(pfad).protokolliere([("C", "Note", 1.0049, 2.3333)])
+    kurse.finde("C").note = 1.0049
+    erwartet = _stand(kurse)
+
+    assert _stand(KursTabelle(kurse)) == erwartet
+    assert _stand(NotenTabelle(KursKatalog(), kurse)) == erwartet
+    assert list(KursTabelle(kurse).spalten()[1]) == [1.006, 1.0, 1.0049]
+    assert _stand(KursJournal(pfad).lade_kurse()) == erwartet
+    # Zweimal laden: der zweite Aufruf liest die Spalten aus dem Snapshot
+    for _ in range(2):
+        assert _stand(KursRepository.lade_kurstabelle(pfad, cache=True)) == _stand(KursRepository.lade_kurse(pfad))
+        assert _stand(KursRepository.lade_kurse(pfad, cache=True)) == _stand(KursRepository.lade_kurse(pfad))
+    assert KursRepository.lade_kurse(pfad, cache=True).finde("A").note == 1.006
+
+
+def test_spaltenkursliste_wie_kursliste():
+    kurse = _spalten_kurse()
+    assert _stand(kurse) == _stand(_kurse())
+    assert kurse.finde("PROG01").note == 0.0 and kurse.finde("ISPE01").note is None
+    assert "MAT01" in kurse and "XYZ" not in kurse
+    assert [k.kurscode for k in kurse[1:]] == ["PROG01", "ISPE01"]
+
+
+def test_spaltenkursliste_erzeugt_objekte_erst_beim_zugriff():
+    kurse = _spalten_kurse()
+    kurse.finde("ISPE01").note = 1.7
+    assert kurse._erzeugt == [2]
+    ects, noten = kurse.spalten()
+    assert list(ects) == [5, 10, 5]
+    assert list(noten) == [2.3, 0.0, 1.7]
+
+
+def test_spaltenkursliste_nach_entfernen_gewoehnliche_kursliste():
+    kurse = _spalten_kurse()
+    assert kurse.aendere_kurscode("MAT01", "MAT02")
+    kurse.entferne("PROG01")
+    assert kurse.spalten() is None
+    assert [k.kurscode for k in kurse] == ["MAT02", "ISPE01"]
+    kurse.anhaengen(Kurs("NEU01", "Neu", 5))
+    assert kurse.finde("NEU01") is kurse[2]
+
+
+def test_snapshotcache_gueltigkeit(tmp_path):
+    pfad = str(tmp_path / "kurse.csv")
+    with open(pfad, "w", encoding="utf-8") as f:
+        f.write("alt")
+    SnapshotCache.speichere(pfad, "kurse", ("daten", 1))
+    assert SnapshotCache.lade(pfad, "kurse") == ("daten", 1)
+    assert SnapshotCache.lade(pfad, "student") is None
+
+    # Nur die Änderungszeit weicht ab: der Inhalts-Hash entscheidet
+    st = os.stat(pfad)
+    os.utime(pfad, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert SnapshotCache.lade(pfad, "kurse") == ("daten", 1)
+    with open(pfad, "w", encoding="utf-8") as f:
+        f.write("neu")
+    os.utime(pfad, ns=(st.st_atime_ns, st.st_mtime_ns + 2 * 10**9))
+    assert SnapshotCache.lade(pfad, "kurse") is None
+    with open(pfad, "w", encoding="utf-8") as f:
+        f.write("länger")
+    assert SnapshotCache.lade(pfad, "kurse") is None
+
+    with open(pfad + SnapshotCache.ENDUNG, "wb") as f:
+        f.write(b"kein marshal")
+    assert SnapshotCache.lade(pfad, "kurse") is None
+
+
+def test_snapshotcache_frischt_kennung_auf(tmp_path, monkeypatch):
+    pfad = str(tmp_path / "kurse.csv")
+    with open(pfad, "w", encoding="utf-8") as f:
+        f.write("inhalt")
+    SnapshotCache.speichere(pfad, "kurse", "daten")
+    st = os.stat(pfad)
+    os.utime(pfad, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert SnapshotCache.lade(pfad, "kurse") == "daten"
+    # Beim nächsten Laden passt die Kennung wieder, ohne die CSV zu hashen
+    monkeypatch.setattr(SnapshotCache, "_hash", staticmethod(lambda dateipfad: pytest.fail("gehasht")))
+    assert SnapshotCache.lade(pfad, "kurse") == "daten"
+
+
+def test_laden_mit_cache(tmp_path, monkeypatch):
+    pfad = str(tmp_path / "kurse.csv")
+    student_pfad = str(tmp_path / "student.csv")
+    KursRepository.speichere_kurse(pfad, _kurse())
+    StudentRepository.speichere_student(student_pfad, Student("Erika", "Informatik", 180))
+    assert _stand(KursRepository.lade_kurse(pfad, cache=True)) == _stand(_kurse())
+    assert _stand(KursRepository.lade_kurstabelle(pfad, cache=True)) == _stand(_kurse())
+    assert StudentRepository.lade_student(student_pfad, cache=True).name == "Erika"
+
+    # Zweiter Start: beide Dateien kommen aus dem Snapshot, ohne sie zu parsen
+    monkeypatch.setattr(KursRepository, "_iter_zeilen", staticmethod(lambda dateipfad: pytest.fail("geparst")))
+    monkeypatch.setattr("csv.DictReader", lambda *a, **kw: pytest.fail("geparst"))
+    kurse = KursRepository.lade_kurse(pfad, cache=True)
+    assert isinstance(kurse, SpaltenKursListe) and _stand(kurse) == _stand(_kurse())
+    student = StudentRepository.lade_student(student_pfad, cache=True)
+    assert (student.name, student.studiengang, student.ziel_ects) == ("Erika", "Informatik", 180)
+
+
+def test_spaltenkursliste_entferne_viele():
+    kurse = _spalten_kurse()
+    assert [k.kurscode for k in kurse.entferne_viele(["PROG01", "XYZ"])] == ["PROG01"]
+    assert kurse.spalten() is None
+    assert _stand(kurse) == [("MAT01", "Mathematik I", 5, 2.3), ("ISPE01", "Software Engineering", 5, None)]
+
+
+@pytest.mark.parametrize("tabelle", [False, True])
+def test_journal_ignoriert_ects_ausserhalb_der_spalten(tmp_path, tabelle):
+    pfad = str(tmp_path / "kurse.csv")
+    KursRepository.speichere_kurse(pfad, _kurse())
+    KursJournal(pfad).protokolliere([("MAT01", "ECTS", -5, 5), ("ISPE01", "ECTS", 70000, 5),
+                                     ("PROG01", "ECTS", 15, 10)])
+    if tabelle:
+        kurse = KursRepository.lade_kurstabelle(pfad, cache=True)
+        KursJournal(pfad).wiedergeben(kurse)
+    else:
+        kurse = KursJournal(pfad).lade_kurse(cache=True)
+    assert [k.ects for k in kurse] == [5, 15, 5]
+    assert StatistikAggregator.aus_kursen(kurse).ects == 20
+
+
+def test_spalten_mit_ects_ausserhalb_fallen_auf_objekte_zurueck(tmp_path):
+    kurse = _spalten_kurse()
+    kurse.finde("MAT01").ects = 70000
+    kurse.finde("ISPE01").ects = -5
+    assert kurse.spalten() is None
+    assert StatistikAggregator.aus_kursen(kurse).ects == 70010
+    assert Service.berechne_durchschnitt(kurse) == 2.3
+    with pytest.raises(ValueError):
+        KursTabelle(_kurse()).finde("MAT01").ects = -5
+
+    # Eine CSV mit solchen ECTS wird über Kurs-Objekte gelesen, ohne Snapshot
+    pfad = str(tmp_path / "kurse.csv")
+    KursRepository.speichere_kurse(pfad, kurse)
+    for geladen in (KursRepository.lade_kurse(pfad, cache=True),
+                    KursRepository.lade_kurstabelle(pfad, cache=True),
+                    KursRepository.lade_kurstabelle(pfad)):
+        assert type(geladen) is KursListe and _stand(geladen) == _stand(kurse)
+    assert not os.path.exists(pfad + ".cache")
+    with pytest.raises(ValueError):
+        KursRepository.lade_notentabelle(pfad, KursKatalog())
+
+
+def test_notenimport_csv(tmp_path):
+    pfad = tmp_path / "noten.csv"
+    # Export-Format mit BOM: zusätzliche Spalten werden ignoriert
+    pfad.write_text("\ufeffKursname,Note,Kurscode\nMathe,1.3,MAT01\n\nProg,A\n", encoding="utf-8")
+    assert NotenImportRepository.lade(str(pfad)) == [(2, "MAT01", "1.3"), (4, "", "A")]
+    pfad.write_text("Code,Note\nMAT01,1.3\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        NotenImportRepository.lade(str(pfad))
+
+
+def test_notenimport_json(tmp_path):
+    pfad = tmp_path / "noten.json"
+    pfad.write_text('[{"Kurscode": "MAT01", "Note": 1.3}, {"Kurscode": "PROG01", "Note": null}]',
+                    encoding="utf-8")
+    assert NotenImportRepository.lade(str(pfad)) == [(1, "MAT01", "1.3"), (2, "PROG01", "")]
+    pfad.write_text('{"MAT01": "A", "ISPE01": 2}', encoding="utf-8")
+    assert NotenImportRepository.lade(str(pfad)) == [(1, "MAT01", "A"), (2, "ISPE01", "2")]
+    for inhalt in ('[1, 2]', '{"MAT01": ', '"text"'):
+        pfad.write_text(inhalt, encoding="utf-8")
+        with pytest.raises(ValueError):
+            NotenImportRepository.lade(str(pfad))
+
+
+def test_notentabelle_teilt_katalog():
+    katalog = KursKatalog()
+    erste = NotenTabelle(katalog, _kurse())
+    zweite = NotenTabelle(katalog, _kurse())
+    assert len(katalog) == 3
+    assert _stand(erste) == _stand(_kurse()) and list(erste.indizes) == list(zweite.indizes)
+
+    # Abweichende Stammdaten bekommen einen eigenen Eintrag, die andere Tabelle bleibt unverändert
+    zeile = zweite.finde("ISPE01")
+    zeile.ects, zeile.note = 10, 1.3
+    assert zweite.aendere_kurscode("MAT01", "MAT02") and not zweite.aendere_kurscode("MAT02", "PROG01")
+    assert len(katalog) == 5
+    assert _stand(erste) == _stand(_kurse())
+    assert _stand(zweite) == [("MAT02", "Mathematik I", 5, 2.3), ("PROG01", "Programmierung", 10, 0.0),
+                              ("ISPE01", "Software Engineering", 10, 1.3)]
+    assert _stand([zweite.entferne("PROG01")]) == [("PROG01", "Programmierung", 10, 0.0)]
+    assert "PROG01" not in zweite and "PROG01" in erste
+    with pytest.raises(ValueError):
+        erste.anhaengen(Kurs("MAT01", "Doppelt", 5))
+
+
+def test_notentabelle_laden_mit_journal(tmp_path):
+    pfad = str(tmp_path / "kurse.csv")
+    KursRepository.speichere_kurse(pfad, _kurse())
+    KursJournal(pfad).protokolliere([("ISPE01", "Note", 1.7, None), ("MAT01", "ECTS", 10, 5)])
+    katalog = KursKatalog()
+    tabelle = KursRepository.lade_notentabelle(pfad, katalog)
+    assert KursJournal(pfad).wiedergeben(tabelle) == 0
+    assert _stand(tabelle) == [("MAT01", "Mathematik I", 10, 2.3), ("PROG01", "Programmierung", 10, 0.0),
+                               ("ISPE01", "Software Engineering", 5, 1.7)]
+    ects, noten = tabelle.spalten()
+    assert list(ects) == [10, 10, 5]
@@ -0,0 +1,145 @@
+import threading
+
+from datenquelle import CsvDatenquelle
+from model import Kurs, KursRepository
+from persistenz import AenderungsWaechter, SpeicherWorker
+
+
+def _blockierter_worker(max_ausstehend=SpeicherWorker.MAX_AUSSTEHEND):
+    """
+    Worker, dessen erster Auftrag wartet, bis das gelieferte Event gesetzt wird.
+    """
+    worker = SpeicherWorker(max_ausstehend)
+    freigabe = threading.Event()
+    gestartet = threading.Event()
+
+    def warte(_):
+        gestartet.set()
+        freigabe.wait(5)
+
+    worker.ersetze("sperre", warte, None)
+    assert gestartet.wait(5)
+    return worker, freigabe
+
+
+def test_speicherworker_ersetzt_und_haengt_an():
+    worker, freigabe = _blockierter_worker()
+    geschrieben = []
+    worker.ersetze("student", geschrieben.append, "alt")
+    worker.haenge_an("journal", geschrieben.append, [1])
+    worker.haenge_an("journal", geschrieben.append, [2, 3])
+    worker.ersetze("student", geschrieben.append, "neu")
+    worker.haenge_an("journal2", geschrieben.append, [4])
+    assert worker.ist_ausstehend("student") and not worker.ist_ausstehend("sperre")
+    assert not worker.flush(timeout=0)
+    freigabe.set()
+    assert worker.flush(timeout=5)
+    # Nur der neueste Snapshot, alle Journal-Einträge, Reihenfolge wie eingereicht
+    assert geschrieben == ["neu", [1, 2, 3], [4]]
+    worker.beenden()
+
+
+def test_speicherworker_meldet_fehler():
+    worker = SpeicherWorker()
+
+    def fehler(_):
+        raise OSError("Datenträger voll")
+
+    worker.ersetze("kurse", fehler, None)
+    worker.ersetze("student", lambda _: None, None)
+    worker.beenden()
+    meldungen = worker.meldungen_abholen()
+    assert [schluessel for schluessel, _ in meldungen] == ["kurse", "student"]
+    assert isinstance(meldungen[0][1], OSError) and meldungen[1][1] is None
+    assert worker.meldungen_abholen() == []
+
+
+def test_speicherworker_begrenzte_warteschlange():
+    worker, freigabe = _blockierter_worker(max_ausstehend=1)
+    geschrieben = []
+    worker.ersetze("a", geschrieben.append, "a")
+    eingereicht = threading.Event()
+
+    def reiche_ein():
+        worker.ersetze("b", geschrieben.append, "b")
+        eingereicht.set()
+
+    threading.Thread(target=reiche_ein, daemon=True).start()
+    # Die Warteschlange ist voll: der Aufrufer wartet, bis wieder Platz ist
+    assert not eingereicht.wait(0.2)
+    freigabe.set()
+    assert eingereicht.wait(5)
+    worker.beenden()
+    assert geschrieben == ["a", "b"]
+
+
+def _kurse_csv(verzeichnis, *zusatz):
+    KursRepository.speichere_kurse(str(verzeichnis / "kurse.csv"), [
+        Kurs("MAT01", "Mathematik I", 5, "2.3"),
+        Kurs("ISPE01", "Software Engineering", 5, None),
+        *zusatz,
+    ])
+
+
+def _ergebnis(waechter):
+    waechter._thread.join(5)
+    return waechter.abholen()
+
+
+def test_aenderungswaechter_meldet_unterschiede(tmp_path):
+    _kurse_csv(tmp_path, Kurs("ALT01", "Alt", 5))
+    quelle = CsvDatenquelle(str(tmp_path))
+    kurse = quelle.lade_kurse()
+    waechter = AenderungsWaechter(quelle, kurse)
+    assert not waechter.pruefe(0) and waechter.abholen() is None
+
+    # Ein anderes Programm ändert eine Note, entfernt und ergänzt Kurse
+    KursRepository.speichere_kurse(str(tmp_path / "kurse.csv"), [
+        Kurs("MAT01", "Mathematik I", 5, "1.7"),
+        Kurs("ISPE01", "Software Engineering", 5, None),
+        Kurs("NEU01", "Neu", 10, "1.0"),
+    ])
+    assert waechter.pruefe(3)
+    stand, (hinzugefuegt, entfernt, geaendert), fehler = _ergebnis(waechter)
+    assert stand == 3 and fehler is None
+    assert [k.kurscode for k in hinzugefuegt] == ["NEU01"]
+    assert [k.kurscode for k in entfernt] == ["ALT01"]
+    assert [(a.kurscode, a.note, n.note) for a, n in geaendert] == [("MAT01", 2.3, 1.7)]
+    # Das Neuladen hat die Kennung übernommen; erst wiederhole() erzwingt es erneut
+    assert not waechter.pruefe(3)
+    waechter.wiederhole()
+    assert waechter.pruefe(4) and _ergebnis(waechter)[0] == 4
+
+
+def test_aenderungswaechter_vergleicht_momentaufnahme(tmp_path):
+    _kurse_csv(tmp_path)
+    quelle = CsvDatenquelle(str(tmp_path))
+    kurse = quelle.lade_kurse()
+    freigabe = threading.Event()
+    lade_kurse = quelle.lade_kurse
+
+    def lade_verzoegert():
+        freigabe.wait(5)
+        return lade_kurse()
+
+    quelle.lade_kurse = lade_verzoegert
+    waechter = AenderungsWaechter(quelle, kurse)
+    waechter.wiederhole()
+    assert waechter.pruefe(1)
+    # Die GUI ändert die Liste, während im Hintergrund geladen wird
+    kurse.entferne("ISPE01")
+    kurse.anhaengen(Kurs("NEU01", "Neu", 5))
+    freigabe.set()
+    stand, unterschiede, fehler = _ergebnis(waechter)
+    assert (stand, fehler) == (1, None) and unterschiede == ([], [], [])
+
+
+def test_aenderungswaechter_meldet_ladefehler(tmp_path):
+    _kurse_csv(tmp_path)
+    quelle = CsvDatenquelle(str(tmp_path))
+    waechter = AenderungsWaechter(quelle, quelle.lade_kurse())
+    with open(tmp_path / "kurse.csv", "w", encoding="utf-8") as f:
+        f.write("Kurscode,Note\nMAT01,1.0\n")
+    assert waechter.pruefe(0)
+    stand, unterschiede, fehler = _ergebnis(waechter)
+    assert unterschiede is None and isinstance(fehler, ValueError)
@@ -0,0 +1,91 @@
+import itertools
+import random
+
+import pytest
+
+from model import Kurs, KursListe
+from planer import SemesterPlaner
+
+
+def _offene(ects):
+    return KursListe(Kurs(f"K{i}", "Kurs", e) for i, e in enumerate(ects))
+
+
+def _ects(semester):
+    return [[k.ects for k in s] for s in semester]
+
+
+def _minimum(ects, kapazitaet, fehlend):
+    # Kleinste Semesteranzahl per vollständiger Suche über alle Zuordnungen
+    for anzahl in range(1, len(ects) + 1):
+        for zuordnung in itertools.product(range(anzahl + 1), repeat=len(ects)):
+            summen = [0] * anzahl
+            for e, s in zip(ects, zuordnung):
+                if s < anzahl:
+                    summen[s] += e
+            if max(summen) <= kapazitaet and sum(summen) >= fehlend:
+                return anzahl
+    return None
+
+
+def test_weniger_semester_als_gierig():
+    planer = SemesterPlaner(_offene([3, 3, 3, 5, 5]), 16, max_ects=9)
+    semester, erreicht = planer.plane()
+    assert erreicht and planer.untere_grenze == 2
+    assert sorted(map(sorted, _ects(semester))) == [[3, 5], [3, 5]]
+    assert planer.plane(2)[1]
+    assert not planer.plane(1)[1]
+
+
+def test_plan_haelt_grenze_ein_und_nutzt_kurse_einmal():
+    kurse = _offene([10, 5, 5, 15, 5, 10, 5, 5])
+    kurse.anhaengen(Kurs("FERTIG", "Kurs", 10, "2.0"))
+    planer = SemesterPlaner(kurse, 60, max_ects=20)
+    semester, erreicht = planer.plane()
+    gewaehlt = [k for s in semester for k in s]
+    assert erreicht and len(semester) == 3
+    assert all(sum(k.ects for k in s) <= 20 for s in semester)
+    assert len(set(gewaehlt)) == len(gewaehlt)
+    assert kurse.finde("FERTIG") not in gewaehlt
+    assert sum(k.ects for k in gewaehlt) >= 50
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_kleinste_semesteranzahl(seed):
+    rnd = random.Random(seed)
+    kapazitaet = rnd.randint(5, 12)
+    ects = [rnd.randint(1, kapazitaet) for _ in range(rnd.randint(1, 6))]
+    fehlend = rnd.randint(1, sum(ects))
+    semester, erreicht = SemesterPlaner(_offene(ects), fehlend, kapazitaet).plane()
+    assert erreicht
+    assert len(semester) == _minimum(ects, kapazitaet, fehlend)
+
+
+def test_zu_wenige_semester_oder_kurse():
+    planer = SemesterPlaner(_offene([10, 10, 10]), 50, max_ects=20)
+    semester, erreicht = planer.plane()
+    assert not erreicht and sum(map(sum, _ects(semester))) == 30 and len(semester) == 2
+    semester, erreicht = planer.plane(1)
+    assert not erreicht and _ects(semester) == [[10, 10]]
+    assert planer.plane(0) == ([], False)
+
+
+def test_gewichte_nur_bei_gleichstand():
+    kurse = _offene([5, 5, 5, 10])
+    gewichte = {"K2": 3, "K0": 1}
+    semester, erreicht = SemesterPlaner(kurse, 15, max_ects=10, gewichte=gewichte).plane()
+    # Zwei Semester sind nötig; bevorzugte Kurse kommen zuerst an die Reihe
+    assert erreicht and len(semester) == 2
+    assert [k.kurscode for k in semester[0]] == ["K0", "K2"]
+
+    # Bevorzugte Kurse dürfen kein zusätzliches Semester kosten
+    gewichte = {"K0": 5, "K1": 5, "K2": 5}
+    semester, erreicht = SemesterPlaner(_offene([3, 3, 3, 5, 5]), 16, 9, gewichte).plane()
+    assert erreicht and len(semester) == 2
+
+
+def test_nichts_offen_oder_ziel_erreicht():
+    assert SemesterPlaner(KursListe([Kurs("A", "a", 30, "1.0")]), 20).plane() == ([], True)
+    assert SemesterPlaner(KursListe(), 20).plane() == ([], False)
+    with pytest.raises(ValueError):
+        SemesterPlaner(KursListe(), 20, max_ects=0)
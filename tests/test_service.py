@@ -0,0 +1,276 @@
+import math
+import random
+from fractions import Fraction
+
+import pytest
+
+import service
+from model import Kurs, KursListe, KursTabelle, Student
+from service import NotenPlaner, Service, StatistikAggregator, StatistikCache
+
+NOTEN = (None, 0.0, 1.0, 1.3, 1.7, 2.0, 2.3, 2.7, 3.0, 3.3, 3.7, 4.0, 5.0)
+
+
+def _zufallskurse(rnd, anzahl):
+    kurse = KursListe()
+    for i in range(anzahl):
+        k = Kurs(f"K{i:04d}", "Kurs", rnd.choice((5, 10, 15)))
+        k.note = rnd.choice(NOTEN)
+        kurse.anhaengen(k)
+    return kurse
+
+
+def _als_tabelle(kurse):
+    tabelle = KursTabelle()
+    for k in kurse:
+        tabelle.anhaengen_werte(k.kurscode, k.name, k.ects, k.note)
+    return tabelle
+
+
+@pytest.fixture(params=["array", "numpy"])
+def spaltenweg(request, monkeypatch):
+    """
+    Erzwingt die reine array-Variante bzw. NumPy auch für kleine Spalten.
+    """
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+        monkeypatch.setattr(service, "_numpy", None)
+        monkeypatch.setattr(service, "NUMPY_AB", 0)
+    else:
+        monkeypatch.setattr(service, "_numpy", False)
+    return request.param
+
+
+def test_service_kennzahlen():
+    kurse = KursListe([
+        Kurs("A", "a", 5, "1.0"),
+        Kurs("B", "b", 10, "2.5"),
+        Kurs("C", "c", 5, "A"),
+        Kurs("D", "d", 5, None),
+    ])
+    assert Service.berechne_ects(kurse) == 20
+    # Angerechnete Kurse zählen nicht zum Durchschnitt: (1.0 * 5 + 2.5 * 10) / 15
+    assert Service.berechne_durchschnitt(kurse) == 2.0
+    assert Service.zaehle_status(kurse) == {"benotet": 2, "angerechnet": 1, "offen": 1}
+    assert Service.berechne_durchschnitt(KursListe()) is None
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_aggregator_wie_service(seed):
+    rnd = random.Random(seed)
+    kurse = _zufallskurse(rnd, 200)
+    agg = StatistikAggregator.aus_kursen(kurse)
+    for _ in range(500):
+        k = rnd.choice(kurse)
+        if rnd.random() < 0.5:
+            note = rnd.choice(NOTEN)
+            agg.aendere_note(k.ects, k.note, note)
+            k.note = note
+        else:
+            ects = rnd.choice((5, 10, 15))
+            agg.aendere_ects(k.note, k.ects, ects)
+            k.ects = ects
+        assert agg.ects == Service.berechne_ects(kurse)
+        assert agg.durchschnitt == Service.berechne_durchschnitt(kurse)
+
+
+def _durchschnitt_wie_bisher(kurse):
+    # Ursprüngliche Formel: Fließkomma-Summe der Produkte Note * ECTS
+    valid = [k for k in kurse if k.note is not None and k.note != 0.0]
+    if not valid:
+        return None
+    return round(sum(k.note * k.ects for k in valid) / sum(k.ects for k in valid), 2)
+
+
+def _genaue_kurse(rnd, anzahl):
+    kurse = KursListe()
+    for i in range(anzahl):
+        k = Kurs(f"K{i:04d}", "Kurs", rnd.choice((1, 3, 5, 10, 15)))
+        k.note = rnd.choice((None, 0.0, round(rnd.uniform(1, 5), 3)))
+        kurse.anhaengen(k)
+    return kurse
+
+
+def test_durchschnitt_mit_mehr_als_zwei_nachkommastellen(spaltenweg):
+    kurse = KursListe([Kurs("A", "a", 3, "1.006"), Kurs("B", "b", 1, "1.0")])
+    assert _durchschnitt_wie_bisher(kurse) == 1.0
+    assert Service.berechne_durchschnitt(kurse) == 1.0
+    assert Service.berechne_durchschnitt(_als_tabelle(kurse)) == 1.0
+    assert StatistikAggregator.aus_kursen(kurse).durchschnitt == 1.0
+    assert StatistikAggregator.aus_kursen(_als_tabelle(kurse)).durchschnitt == 1.0
+    assert Service.durchschnitt_aus_gruppen([(1.006, 3, 1), (1.0, 1, 1)]) == 1.0
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_durchschnitt_wie_bisherige_formel(seed, spaltenweg):
+    kurse = _genaue_kurse(random.Random(seed), 60)
+    erwartet = _durchschnitt_wie_bisher(kurse)
+    assert Service.berechne_durchschnitt(kurse) == erwartet
+    assert Service.berechne_durchschnitt(_als_tabelle(kurse)) == erwartet
+    assert StatistikAggregator.aus_kursen(_als_tabelle(kurse)).notensumme == \
+        StatistikAggregator.aus_kursen(list(kurse)).notensumme
+    # Die Festkomma-Summe ist die korrekt gerundete Summe der Produkte
+    agg = StatistikAggregator.aus_kursen(kurse)
+    assert agg.notensumme / service.SKALA == math.fsum(k.note * k.ects for k in kurse if k.note)
+
+
+def test_pruefe_note():
+    assert Service.pruefe_note("2.3") == (True, 2.3)
+    assert Service.pruefe_note("A") == (True, 0.0)
+    assert Service.pruefe_note("-") == (True, None)
+    assert not Service.pruefe_note("6.0")[0]
+    assert not Service.pruefe_note("abc")[0]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_spalten_wie_kurs_objekte(seed, spaltenweg):
+    kurse = _zufallskurse(random.Random(seed), 300)
+    tabelle = _als_tabelle(kurse)
+    assert Service.berechne_ects(tabelle) == Service.berechne_ects(kurse)
+    assert Service.berechne_durchschnitt(tabelle) == Service.berechne_durchschnitt(kurse)
+    assert Service.zaehle_status(tabelle) == Service.zaehle_status(kurse)
+
+
+def test_spalten_ohne_benotete_kurse(spaltenweg):
+    tabelle = _als_tabelle([Kurs("A", "a", 5, "A"), Kurs("B", "b", 5, None)])
+    assert Service.berechne_ects(tabelle) == 5
+    assert Service.berechne_durchschnitt(tabelle) is None
+    assert Service.zaehle_status(tabelle) == {"benotet": 0, "angerechnet": 1, "offen": 1}
+
+
+def test_spalten_mit_randwerten_wie_kurs_objekte(spaltenweg):
+    kurse = KursListe(Kurs(f"K{i}", "k", e) for i, e in enumerate((5, 10, 3, 5, 0, 7, 1, 2)))
+    for k, note in zip(kurse, (None, 0.0, -0.0, 5e-324, 1.0, 1e-310, 4.999, None)):
+        k.note = note
+    tabelle = _als_tabelle(kurse)
+    assert Service.berechne_ects(tabelle) == Service.berechne_ects(kurse)
+    assert Service.berechne_durchschnitt(tabelle) == Service.berechne_durchschnitt(kurse)
+    assert Service.zaehle_status(tabelle) == Service.zaehle_status(kurse) == \
+        {"benotet": 4, "angerechnet": 2, "offen": 2}
+
+
+def test_aggregator_aus_spalten_wie_aus_objekten(spaltenweg):
+    kurse = _zufallskurse(random.Random(7), 500)
+    erwartet = StatistikAggregator.aus_kursen(list(kurse))
+    agg = StatistikAggregator.aus_kursen(_als_tabelle(kurse))
+    assert (agg.ects, agg.notensumme, agg.benotete_ects) == \
+        (erwartet.ects, erwartet.notensumme, erwartet.benotete_ects)
+
+
+def test_statistikcache_rechnet_einmal_je_stand():
+    kurse = _zufallskurse(random.Random(3), 50)
+    cache = StatistikCache(kurse, Student("Erika", "Informatik", 180))
+    erwartet = {"ects": Service.berechne_ects(kurse), "durchschnitt": Service.berechne_durchschnitt(kurse),
+                **Service.zaehle_status(kurse)}
+    assert cache.kennzahlen() == erwartet and cache.kennzahlen() == erwartet
+    assert (cache.fehlgriffe, cache.treffer) == (3, 3)
+    assert cache.fortschritt == round(erwartet["ects"] / 180 * 100, 1)
+    assert cache.notenplaner is cache.notenplaner
+
+    # Direkte Änderung an einem Kurs-Objekt: erst markiere_geaendert() macht sie sichtbar
+    k = next(k for k in kurse if k.note is None)
+    k.note = 1.0
+    assert cache.ects == erwartet["ects"]
+    kurse.markiere_geaendert()
+    assert cache.ects == erwartet["ects"] + k.ects
+    k.note = None
+    cache.invalidiere()
+    assert cache.ects == erwartet["ects"]
+
+
+def test_statistikcache_ueber_kurstabelle():
+    tabelle = _als_tabelle(_zufallskurse(random.Random(4), 50))
+    cache = StatistikCache(tabelle)
+    status = cache.status
+    status["offen"] = -1
+    assert cache.status["offen"] >= 0 and cache.fortschritt == 0
+    zeile = next(z for z in tabelle if z.note is None)
+    zeile.note = 2.0
+    assert cache.status == Service.zaehle_status(tabelle)
+
+
+def _notenplaner_kurse():
+    return KursListe([
+        Kurs("A", "a", 10, "2.0"),
+        Kurs("B", "b", 5, "A"),
+        Kurs("C", "c", 5, None),
+        Kurs("D", "d", 10, None),
+    ])
+
+
+def test_notenplaner_benoetigter_durchschnitt():
+    planer = NotenPlaner(_notenplaner_kurse())
+    assert planer.offene_summe == 15
+    # (1.5 * (10 + 15) - 20) / 15
+    assert planer.benoetigter_durchschnitt(1.5) == pytest.approx(1.1666666)
+    assert NotenPlaner(KursListe([Kurs("A", "a", 5, "2.0")])).benoetigter_durchschnitt(1.5) is None
+
+
+def test_notenplaner_schlechteste_noten_erreichen_ziel():
+    kurse = _notenplaner_kurse()
+    planer = NotenPlaner(kurse)
+    ziel = 1.5
+    for k, note in zip(planer.offene, planer.schlechteste_noten(ziel)):
+        # Mit dieser Note und der besten Note im übrigen Modul wird das Ziel erreicht,
+        # mit der nächstschlechteren Stufe nicht mehr
+        for andere in planer.offene:
+            andere.note = NotenPlaner.BESTE_NOTE
+        k.note = note
+        assert Service.berechne_durchschnitt(kurse) <= ziel
+        k.note = round(note + 0.1, 1)
+        assert Service.berechne_durchschnitt(kurse) > ziel
+        for andere in planer.offene:
+            andere.note = None
+
+
+def test_notenplaner_unerreichbares_ziel():
+    planer = NotenPlaner(_notenplaner_kurse())
+    assert planer.schlechteste_noten(1.0) == [None, None]
+    assert planer.schlechteste_noten(4.0) == [4.0, 4.0]
+
+
+def test_notenplaner_szenarien_mit_und_ohne_numpy(spaltenweg):
+    planer = NotenPlaner(_notenplaner_kurse())
+    szenarien = planer.szenarien(1.5, noten=(1.0, 2.0))
+    # Modul C (5 ECTS) mit 1.0: (37.5 - 20 - 5) / 10; Modul D (10 ECTS) mit 2.0: (37.5 - 20 - 20) / 5
+    assert szenarien[0][0] == pytest.approx(1.25) and szenarien[1][1] == pytest.approx(-0.5)
+    einzeln = NotenPlaner(KursListe([Kurs("A", "a", 10, "2.0"), Kurs("C", "c", 5, None)]))
+    assert einzeln.szenarien(2.0, noten=(1.0, 2.0, 3.0)) == [[float("inf"), float("inf"), float("-inf")]]
+
+
+def _schlechteste_noten_genau(kurse, ziel, noten):
+    # Referenz mit Brüchen über dieselben Produkte Note * ECTS
+    benotet = [k for k in kurse if k.note]
+    offene = [k for k in kurse if k.note is None]
+    offen = sum(k.ects for k in offene)
+    basis = Fraction(ziel * (sum(k.ects for k in benotet) + offen)) - \
+        sum(Fraction(k.note * k.ects) for k in benotet)
+    ergebnis = []
+    for k in offene:
+        rest = offen - k.ects
+        passend = [n for n in noten if basis - Fraction(n * k.ects) >= rest * NotenPlaner.BESTE_NOTE]
+        ergebnis.append(passend[-1] if passend else None)
+    return ergebnis
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_notenplaner_genau_wie_bruchrechnung(seed):
+    rnd = random.Random(seed)
+    kurse = _genaue_kurse(rnd, 80)
+    planer = NotenPlaner(kurse)
+    assert planer.notensumme == StatistikAggregator.aus_kursen(kurse).notensumme
+    for _ in range(20):
+        ziel = round(rnd.uniform(1, 4), rnd.choice((1, 2, 3)))
+        assert planer.schlechteste_noten(ziel) == _schlechteste_noten_genau(kurse, ziel, service.NOTENSTUFEN)
+    # Module mit gleichen ECTS teilen sich die Rechnung, erhalten aber eigene Zeilen
+    szenarien = planer.szenarien(2.0)
+    assert len(szenarien) == len(planer.offene)
+    assert len({id(z) for z in szenarien}) == len(szenarien)
+
+
+def test_notenplaner_an_der_grenze():
+    # Mit Fließkomma-Summen erschiene im ersten Modul noch 1.3 als ausreichend
+    kurse = KursListe([Kurs("A", "a", 3, "1.1"), Kurs("B", "b", 5, "1.1"), Kurs("C", "c", 7, "1.1"),
+                       Kurs("D", "d", 5, None), Kurs("E", "e", 10, None)])
+    assert NotenPlaner(kurse).schlechteste_noten(1.1) == [1.2, 1.1] == \
+        _schlechteste_noten_genau(kurse, 1.1, service.NOTENSTUFEN)
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from model import Kurs, KursListe
+from sortierung import SCHLUESSEL, SPALTEN, SortierIndex
+
+
+def _kurse(anzahl=50, seed=0):
+    rnd = random.Random(seed)
+    kurse = KursListe()
+    for i in range(anzahl):
+        k = Kurs(f"K{rnd.randrange(1000):03d}-{i}", rnd.choice(("Mathe", "Prog", "Wiss")), rnd.choice((5, 10)))
+        k.note = rnd.choice((None, 0.0, 1.3, 2.0, 3.7))
+        kurse.anhaengen(k)
+    return kurse
+
+
+def _erwartet(kurse, spalte, absteigend=False):
+    # Stabil nach Schlüssel, bei Gleichstand in Kursreihenfolge
+    reihenfolge = sorted(enumerate(kurse), key=lambda p: (SCHLUESSEL[spalte](p[1]), p[0]))
+    if absteigend:
+        reihenfolge.reverse()
+    return [k for _, k in reihenfolge]
+
+
+@pytest.mark.parametrize("spalte", SPALTEN)
+def test_folge_sortiert(spalte):
+    kurse = _kurse()
+    index = SortierIndex(kurse)
+    assert list(index.folge(spalte)) == _erwartet(kurse, spalte)
+    absteigend = index.folge(spalte, absteigend=True)
+    assert list(absteigend) == _erwartet(kurse, spalte, True)
+    assert [absteigend[i] for i in range(len(absteigend))] == _erwartet(kurse, spalte, True)
+
+
+def test_noten_reihenfolge():
+    kurse = KursListe([Kurs("A", "a", 5, None), Kurs("B", "b", 5, "A"), Kurs("C", "c", 5, "2.0"),
+                       Kurs("D", "d", 5, "1.0")])
+    assert [k.kurscode for k in SortierIndex(kurse).folge("Note")] == ["D", "C", "B", "A"]
+
+
+def test_einsortieren_und_entfernen():
+    kurse = _kurse()
+    index = SortierIndex(kurse)
+    for spalte in SPALTEN:
+        index.folge(spalte)
+    rnd = random.Random(1)
+    for i in range(100):
+        aktion = rnd.random()
+        if aktion < 0.3:
+            k = Kurs(f"N{i}", rnd.choice(("Alpha", "Zeta")), 5, rnd.choice(("1.0", "A", None)))
+            kurse.anhaengen(k)
+            index.hinzufuegen(k)
+        elif aktion < 0.6 and len(kurse) > 1:
+            k = kurse.entferne(rnd.choice(kurse).kurscode)
+            index.entfernen(k)
+        else:
+            k = rnd.choice(kurse)
+            k.note = rnd.choice((None, 0.0, 1.0, 4.0))
+            k.ects = rnd.choice((5, 10, 15))
+            index.aktualisiere(k)
+    for spalte in SPALTEN:
+        assert list(index.folge(spalte)) == _erwartet(kurse, spalte)
+
+
+def test_aktualisiere_viele_behaelt_folge():
+    kurse = _kurse(200)
+    index = SortierIndex(kurse)
+    folge = index.folge("Note")
+    for k in kurse:
+        k.note = 5.0 - (k.note or 0.0)
+    index.aktualisiere_viele(list(kurse))
+    # Die zuvor ausgegebene Folge zeigt bereits die neue Sortierung
+    assert list(folge) == _erwartet(kurse, "Note")
+
+
+def test_folge_einer_auswahl():
+    kurse = _kurse()
+    index = SortierIndex(kurse)
+    auswahl = list(kurse)[::3]
+    assert index.folge("Kursname", auswahl=auswahl) == \
+        [k for k in _erwartet(kurse, "Kursname") if k in auswahl]
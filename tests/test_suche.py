@@ -0,0 +1,103 @@
+import random
+
+from model import Kurs, KursListe
+from suche import SuchIndex
+
+
+def _kurse():
+    return KursListe([
+        Kurs("MAT01", "Mathematik Grundlagen I", 5),
+        Kurs("PROG01", "Einführung in die Programmierung", 5),
+        Kurs("MAT02", "Mathematik Grundlagen II", 5),
+        Kurs("WISS01", "Wissenschaftliches Arbeiten", 5),
+        Kurs("DB-01", "Datenbanken", 5),
+    ])
+
+
+def _codes(treffer):
+    return [k.kurscode for k in treffer]
+
+
+def test_praefix_bereich():
+    index = SuchIndex(_kurse())
+    index.baue_auf()
+    von, bis = index._bereich("mat")
+    assert index._woerter[von:bis] == ["mat01", "mat02", "mathematik"]
+    von, bis = index._bereich("zzz")
+    assert von == bis
+
+
+def test_suche_praefixe_in_kursreihenfolge():
+    index = SuchIndex(_kurse())
+    assert _codes(index.suche("mat")) == ["MAT01", "MAT02"]
+    assert _codes(index.suche("MAT grund ii")) == ["MAT02"]
+    assert _codes(index.suche("wiss arb")) == ["WISS01"]
+    # Kurscodes mit Sonderzeichen werden wie der Name in Wörter zerlegt
+    assert _codes(index.suche("db")) == ["DB-01"]
+    assert index.suche("xyz") == [] and not index.suche("xyz")
+    assert index.suche("  ") is None
+
+
+def test_suche_nach_aenderungen():
+    kurse = _kurse()
+    index = SuchIndex(kurse)
+    index.baue_auf()
+
+    neu = Kurs("MAT03", "Statistik", 5)
+    kurse.anhaengen(neu)
+    index.hinzufuegen(neu)
+    assert _codes(index.suche("mat")) == ["MAT01", "MAT02", "MAT03"]
+
+    mat01 = kurse.finde("MAT01")
+    kurse.entferne("MAT01")
+    index.entfernen(mat01)
+    assert _codes(index.suche("mat")) == ["MAT02", "MAT03"]
+
+    wiss = kurse.finde("WISS01")
+    wiss.name = "Statistik und Methoden"
+    index.aktualisiere(wiss)
+    assert _codes(index.suche("stat")) == ["WISS01", "MAT03"]
+    assert index.suche("arbeiten") == []
+
+
+def test_suche_viele_passende_woerter():
+    kurse = KursListe(Kurs(f"K{i:03d}", f"Modul {i % 3}", 5) for i in range(200))
+    index = SuchIndex(kurse)
+    # "k" passt auf mehr Wörter als MAX_WOERTER_SCHNITT: Kandidaten werden einzeln geprüft
+    assert _codes(index.suche("modul k")) == [k.kurscode for k in kurse]
+    assert _codes(index.suche("k01 2")) == ["K011", "K014", "K017"]
+
+
+def test_treffer_einzeln_wie_vollstaendig():
+    rnd = random.Random(0)
+    namen = ("Mathematik Grundlagen", "Mathe Modul", "Statistik", "Programmierung Modul")
+    kurse = KursListe(Kurs(f"K{i:03d}-{rnd.choice('ab')}", rnd.choice(namen), 5) for i in range(300))
+    index = SuchIndex(kurse)
+    for text in ("k", "mat", "m", "k1 a", "mod k", "ma gr", "a k0", "s", "xyz"):
+        erwartet = _codes(index.suche(text))
+        treffer = index.suche(text)
+        assert [treffer[i].kurscode for i in range(len(erwartet))] == erwartet
+        assert _codes(index.suche(text)[:7]) == erwartet[:7]
+
+
+def test_treffer_nur_bis_zum_zugriff():
+    kurse = KursListe(Kurs(f"K{i:05d}", "Modul", 5) for i in range(10000))
+    index = SuchIndex(kurse)
+    treffer = index.suche("k")
+    assert _codes(treffer[:3]) == ["K00000", "K00001", "K00002"]
+    assert not treffer.vollstaendig and len(treffer._kurse) == 3
+    assert treffer.lade(20) == 20 and len(treffer) == 10000 and treffer.vollstaendig
+
+
+def test_treffer_nach_aenderung_am_index():
+    kurse = _kurse()
+    index = SuchIndex(kurse)
+    treffer = index.suche("mat")
+    assert treffer[0].kurscode == "MAT01"
+    mat02 = kurse.finde("MAT02")
+    kurse.entferne("MAT02")
+    index.entfernen(mat02)
+    neu = Kurs("MAT03", "Statistik", 5)
+    kurse.anhaengen(neu)
+    index.hinzufuegen(neu)
+    assert _codes(treffer) == ["MAT01", "MAT03"]
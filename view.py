@@ -1,13 +1,279 @@
 import tkinter as tk
-from tkinter import ttk, Canvas
+from tkinter import ttk, Canvas, filedialog
 import platform
 
+import instrumentierung
+from planer import STANDARD_MAX_ECTS
+
+
+def note_anzeige(note):
+    """
+    Formatiert eine interne Note für die Anzeige: "-" (keine Note),
+    "A" (angerechnet) oder die Note mit zwei Nachkommastellen.
+    """
+    if note is None:
+        return "-"
+    return "A" if note == 0.0 else f"{note:.2f}"
+
+
+class VirtuelleTabelle:
+    """
+    Virtualisierte Darstellung einer großen Kursliste in einem ttk.Treeview.
+    Statt jeden Kurs als Treeview-Eintrag anzulegen, existieren nur so viele
+    Einträge, wie ins Fenster passen (plus Puffer). Beim Scrollen werden diese
+    Einträge mit den Werten der jeweils sichtbaren Kurse neu befüllt.
+    Speicher- und Zeichenaufwand hängen damit von der Fensterhöhe ab,
+    nicht von der Anzahl der Kurse.
+    """
+    PUFFER = 1
+
+    def __init__(self, tree, scrollbar, zeilenhoehe):
+        """
+        :param tree: ttk.Treeview mit den Spalten Kurscode, Kursname, ECTS, Note
+        :param scrollbar: vertikale ttk.Scrollbar neben dem Treeview
+        :param zeilenhoehe: Zeilenhöhe des Treeview-Styles in Pixeln
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.zeilenhoehe = zeilenhoehe
+        self.zeilen = []
+        self.start = 0
+        # Mapping vom Treeview-Eintrag (iid) zum aktuell angezeigten Kurs und zurück
+        self.item_kurs_map = {}
+        self._kurs_item_map = {}
+        # Zuletzt geschriebene Werte je Eintrag, um unveränderte Zeilen zu überspringen
+        self._werte = {}
+        self._pool = []
+        self._angehaengt = 0
+        # after_idle-Auftrag, der die Gesamtzahl noch nicht ausgewerteter Suchtreffer bestimmt
+        self._nachladen = None
+        # Eintrag, der gerade unter dem Mauszeiger hervorgehoben ist
+        self._hover_iid = None
+
+        scrollbar.configure(command=self.yview)
+        tree.bind("<Configure>", lambda e: self.fuelle())
+        # Alle Handler liefern "break": Die Standardbindungen des Treeview würden
+        # sonst zusätzlich innerhalb des Eintrag-Pools scrollen bzw. an dessen
+        # Ende stehen bleiben
+        tree.bind("<MouseWheel>", self._on_mousewheel)
+        tree.bind("<Button-4>", lambda e: self._on_rad(-3))
+        tree.bind("<Button-5>", lambda e: self._on_rad(3))
+        tree.bind("<Up>", lambda e: self._on_taste(-1))
+        tree.bind("<Down>", lambda e: self._on_taste(1))
+        tree.bind("<Prior>", lambda e: self._on_taste(-self._seite()))
+        tree.bind("<Next>", lambda e: self._on_taste(self._seite()))
+
+    def setze_zeilen(self, zeilen):
+        """
+        Legt die anzuzeigende Kursfolge fest (z. B. eine KursListe) und zeichnet neu.
+
+        :param zeilen: Indizierbare Folge von Kurs-Objekten (auch Suchtreffer,
+                       die erst bei Bedarf ausgewertet werden)
+        """
+        if self._nachladen is not None:
+            self.tree.after_cancel(self._nachladen)
+            self._nachladen = None
+        self.zeilen = zeilen
+        self.start = min(self.start, self._max_start())
+        self.fuelle()
+        if not getattr(zeilen, "vollstaendig", True):
+            # Erst zeichnen, dann (sofern bis dahin keine neue Eingabe kommt) die
+            # Gesamtzahl für die Scrollbar bestimmen
+            self._nachladen = self.tree.after_idle(self._vervollstaendige)
+
+    def _vervollstaendige(self):
+        self._nachladen = None
+        len(self.zeilen)  # wertet die übrigen Suchtreffer aus
+        self._aktualisiere_scrollbar(self.sichtbare_anzahl())
+
+    def _laenge(self):
+        """
+        :return: Anzahl der Zeilen; bei noch nicht ausgewerteten Suchtreffern nur
+                 so viele, wie bis knapp hinter den sichtbaren Ausschnitt reichen
+        """
+        if getattr(self.zeilen, "vollstaendig", True):
+            return len(self.zeilen)
+        return self.zeilen.lade(self.start + self.sichtbare_anzahl() + 1)
+
+    def sichtbare_anzahl(self):
+        """
+        :return: Anzahl Treeview-Einträge, die für die aktuelle Höhe benötigt werden
+        """
+        hoehe = self.tree.winfo_height()
+        if hoehe <= 1:
+            # Noch nicht gezeichnet: angeforderte Höhe in Zeilen verwenden
+            return int(self.tree.cget("height")) + self.PUFFER
+        return max(1, hoehe // self.zeilenhoehe) + self.PUFFER
+
+    def _max_start(self):
+        return max(0, self._laenge() - self.sichtbare_anzahl() + self.PUFFER)
+
+    def fuelle(self):
+        """
+        Passt die Anzahl der Treeview-Einträge an die Fensterhöhe an und befüllt
+        sie mit den Kursen ab der aktuellen Startposition.
+        """
+        # Die Einträge zeigen gleich andere Kurse (oder werden abgehängt): die
+        # Hervorhebung gehört nicht mehr dazu und folgt erst der nächsten Mausbewegung
+        self.hebe_hervor(None)
+        anzahl = self.sichtbare_anzahl()
+        while len(self._pool) < anzahl:
+            iid = self.tree.insert("", "end", values=("", "", "", ""))
+            self.tree.detach(iid)
+            self._pool.append(iid)
+
+        self.item_kurs_map.clear()
+        self._kurs_item_map.clear()
+        benoetigt = max(0, min(anzahl, self._laenge() - self.start))
+        for pos in range(benoetigt):
+            iid = self._pool[pos]
+            k = self.zeilen[self.start + pos]
+            self.item_kurs_map[iid] = k
+            self._kurs_item_map[k] = iid
+            self._schreibe(iid, k)
+        # Einträge werden nur am Ende ab- bzw. wieder angehängt
+        for pos in range(self._angehaengt, benoetigt):
+            self.tree.move(self._pool[pos], "", pos)
+        for pos in range(benoetigt, self._angehaengt):
+            self.tree.detach(self._pool[pos])
+        self._angehaengt = benoetigt
+        self._aktualisiere_scrollbar(anzahl)
+
+    def hebe_hervor(self, iid):
+        """
+        Hebt einen Eintrag hervor (Mouse-Over) und setzt dabei nur den zuvor
+        hervorgehobenen Eintrag zurück, nicht jede Zeile der Tabelle.
+
+        :param iid: Treeview-Eintrag oder None, um die Hervorhebung zu entfernen
+        """
+        if iid == self._hover_iid:
+            return
+        if self._hover_iid is not None and self.tree.exists(self._hover_iid):
+            self.tree.item(self._hover_iid, tags=())
+        if iid is not None:
+            self.tree.item(iid, tags=("hover",))
+        self._hover_iid = iid
+
+    def zeile_neu(self, iid):
+        """
+        Schreibt die Werte eines sichtbaren Eintrags neu (nach einer Änderung am Kurs).
+
+        :param iid: Treeview-Eintrag
+        """
+        k = self.item_kurs_map.get(iid)
+        if k is not None:
+            self._schreibe(iid, k)
+
+    def aktualisiere_kurse(self, kurse):
+        """
+        Aktualisiert nur die Einträge der übergebenen Kurse, sofern sie gerade
+        sichtbar sind. Nicht sichtbare Kurse werden beim nächsten Scrollen
+        ohnehin neu befüllt.
+
+        :param kurse: Iterable geänderter Kurs-Objekte
+        """
+        for k in kurse:
+            iid = self._kurs_item_map.get(k)
+            if iid is not None:
+                self._schreibe(iid, k)
+
+    def _schreibe(self, iid, k):
+        """
+        Schreibt die Werte eines Kurses in einen Eintrag, falls sie sich
+        gegenüber der letzten Darstellung geändert haben.
+        """
+        werte = (k.kurscode, k.name, k.ects, note_anzeige(k.note))
+        if self._werte.get(iid) != werte:
+            self._werte[iid] = werte
+            self.tree.item(iid, values=werte)
+
+    def _aktualisiere_scrollbar(self, anzahl):
+        gesamt = self._laenge()
+        if gesamt == 0:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        sichtbar = max(1, anzahl - self.PUFFER)
+        self.scrollbar.set(self.start / gesamt, min(1.0, (self.start + sichtbar) / gesamt))
+
+    def scrolle(self, zeilen):
+        """
+        Verschiebt den sichtbaren Ausschnitt um eine Anzahl Zeilen.
+
+        :param zeilen: positive Werte scrollen nach unten, negative nach oben
+        """
+        start = max(0, min(self.start + zeilen, self._max_start()))
+        if start != self.start:
+            self.start = start
+            self.tree.selection_remove(self.tree.selection())
+            self.fuelle()
+
+    def yview(self, *args):
+        """
+        Callback der Scrollbar ("moveto <Anteil>" oder "scroll <n> units|pages").
+        """
+        if args[0] == "moveto":
+            ziel = int(float(args[1]) * len(self.zeilen))
+            self.scrolle(ziel - self.start)
+        elif args[0] == "scroll":
+            n = int(args[1])
+            if args[2] == "pages":
+                n *= max(1, self.sichtbare_anzahl() - self.PUFFER)
+            self.scrolle(n)
+
+    def _seite(self):
+        """
+        :return: Anzahl vollständig sichtbarer Zeilen (Schrittweite für Bild auf/ab)
+        """
+        return max(1, self.sichtbare_anzahl() - self.PUFFER)
+
+    def _on_rad(self, zeilen):
+        self.scrolle(zeilen)
+        return "break"
+
+    def _on_mousewheel(self, event):
+        """
+        Mausrad unter Windows/macOS (event.delta statt Button-4/5).
+        """
+        return self._on_rad(-3 if event.delta > 0 else 3)
+
+    def _on_taste(self, schritt):
+        """
+        Pfeil- und Bildtasten: Bewegt die Auswahl um schritt Zeilen durch alle
+        Kurse (nicht nur durch die vorhandenen Einträge) und scrollt mit,
+        sobald sie den sichtbaren Bereich verlässt. Ohne Auswahl wird die
+        erste sichtbare Zeile ausgewählt.
+
+        :param schritt: positive Werte nach unten, negative nach oben
+        """
+        if not self.zeilen:
+            return "break"
+        fokus = self.tree.focus()
+        if fokus in self.item_kurs_map:
+            pos = self.start + self._pool.index(fokus) + schritt
+        else:
+            pos = self.start
+        pos = max(0, min(pos, self._laenge() - 1))
+        seite = self._seite()
+        if pos < self.start:
+            self.scrolle(pos - self.start)
+        elif pos >= self.start + seite:
+            self.scrolle(pos - self.start - seite + 1)
+        iid = self._pool[pos - self.start]
+        self.tree.selection_set(iid)
+        self.tree.focus(iid)
+        return "break"
+
+
 class View(tk.Tk):
     """
     Hauptfenster der Anwendung. Erzeugt das komplette Dashboard-Layout
     (Titelzeile, Statistikbereich, Fortschrittsanzeige, Kurstabelle).
     Kommuniziert mit dem Controller, um Daten anzuzeigen oder zu aktualisieren.
     """
+    SPEICHER_INTERVALL_MS = 250
+    WAECHTER_INTERVALL_MS = 1000
+    DEBUG_INTERVALL_MS = 1000
+    PROFIL_DAUER_MS = 5000
 
     def __init__(self, controller, student, kurse, ects, durchschnitt):
         """
@@ -46,14 +312,21 @@ class View(tk.Tk):
         self.ects_var = tk.StringVar(value=str(self.ects))
         self.durchschnitt_var = tk.StringVar(value=str(self.durchschnitt or "-"))
 
-        # Mapping vom Treeview-Eintrag (iid) zu Kurs-Objekten
-        self.item_kurs_map = {}
+        # Rückmeldung des Speicher-Workers (leer = alles gespeichert)
+        self.status_var = tk.StringVar(value="")
 
         # Initialisierung: Style, Titelbar und Hauptlayout
         self._init_style()
         self._build_titlebar()
         self._build_main()
 
+        if instrumentierung.ist_aktiv():
+            self._init_debug()
+
+        self.protocol("WM_DELETE_WINDOW", self.controller.beenden)
+        self.after(self.SPEICHER_INTERVALL_MS, self._pruefe_speicherstatus)
+        self.after(self.WAECHTER_INTERVALL_MS, self._pruefe_externe_aenderungen)
+
     def _init_style(self):
         """
         Richtet den Stylesheet für Treeview-Elemente (Tabelle) ein.
@@ -113,6 +386,14 @@ class View(tk.Tk):
             bg=self.border_color
         ).pack(side="left", padx=10)
 
+        tk.Label(
+            bar,
+            textvariable=self.status_var,
+            font=("Consolas", 10),
+            fg=self.hover_close_color,
+            bg=self.border_color
+        ).pack(side="left", padx=10)
+
         # Schließen-Button nur auf Windows/Linux (nicht macOS)
         if platform.system() != "Darwin":
             close_btn = tk.Button(
@@ -124,7 +405,7 @@ class View(tk.Tk):
                 width=3,
                 height=1,
                 borderwidth=0,
-                command=self.destroy,
+                command=self.controller.beenden,
                 highlightthickness=0,
                 activebackground=self.border_color
             )
@@ -194,11 +475,65 @@ class View(tk.Tk):
         self.circle_frame = tk.Frame(prog_card, bg=self.border_color)
         self.circle_frame.pack()
         self._draw_circle(self.circle_frame, self.ects, self.student.ziel_ects, 130, 20)
+        # Klick auf den Kreis öffnet den Semesterplan bis zu den Ziel-ECTS
+        self._semesterplan_fenster = None
+        kreis = self._kreis[0]
+        kreis.configure(cursor="hand2")
+        kreis.bind("<Button-1>", lambda e: self._toggle_semesterplan())
 
         # Tabelle (unten)
         tbl_frame = tk.Frame(main_frame, bg=self.background_color)
         tbl_frame.grid(row=1, column=0, columnspan=2, sticky="nsew", padx=10, pady=(0, 10))
 
+        # Suchfeld über der Tabelle: filtert bei jedem Tastendruck nach Kurscode/Kursname
+        filter_frame = tk.Frame(tbl_frame, bg=self.background_color)
+        filter_frame.pack(side="top", fill="x", pady=(0, 5))
+        tk.Label(
+            filter_frame,
+            text="Suche:",
+            font=("Consolas", 12),
+            bg=self.background_color,
+            fg=self.foreground_color
+        ).pack(side="left", padx=(0, 5))
+        self.filter_var = tk.StringVar(value="")
+        filter_entry = tk.Entry(
+            filter_frame,
+            textvariable=self.filter_var,
+            font=("Consolas", 12),
+            bg=self.border_color,
+            fg="#FFFFFF",
+            insertbackground="#FFFFFF",
+            bd=0,
+            highlightthickness=0,
+            relief="flat"
+        )
+        filter_entry.pack(side="left", fill="x", expand=True)
+        import_btn = tk.Label(
+            filter_frame,
+            text="Noten importieren",
+            bg=self.accent_color,
+            fg="#FFFFFF",
+            font=("Consolas", 12, "bold"),
+            cursor="hand2"
+        )
+        import_btn.pack(side="right", padx=(10, 0))
+        import_btn.bind("<Button-1>", lambda e: self._importiere_noten())
+        planer_btn = tk.Label(
+            filter_frame,
+            text="Notenplaner",
+            bg=self.border_color,
+            fg=self.foreground_color,
+            font=("Consolas", 12),
+            cursor="hand2"
+        )
+        planer_btn.pack(side="right", padx=(10, 0))
+        planer_btn.bind("<Button-1>", lambda e: self._toggle_planer())
+        self._planer_fenster = None
+        # Index schon beim Fokussieren aufbauen, damit der erste Tastendruck nicht wartet
+        filter_entry.bind("<FocusIn>", lambda e: self.controller.suche.baue_auf())
+        filter_entry.bind("<Escape>", lambda e: self.filter_var.set(""))
+        self.filter_var.trace_add("write", lambda *args: self._wende_filter_an())
+
         self.tree = ttk.Treeview(
             tbl_frame,
             style="Borderless.Treeview",
@@ -206,27 +541,63 @@ class View(tk.Tk):
             show="headings",
             height=12
         )
+        scrollbar = ttk.Scrollbar(tbl_frame, orient="vertical")
+        scrollbar.pack(side="right", fill="y")
         self.tree.pack(fill="both", expand=True)
 
-        self.tree.heading("Kurscode", text="Kurscode")
-        self.tree.heading("Kursname", text="Kursname")
-        self.tree.heading("ECTS", text="ECTS")
-        self.tree.heading("Note", text="Note")
+        # Klick auf eine Spaltenüberschrift sortiert, erneuter Klick kehrt die Richtung um
+        self._sortierung = None
+        for spalte in ("Kurscode", "Kursname", "ECTS", "Note"):
+            self.tree.heading(spalte, text=spalte, command=lambda s=spalte: self._sortiere(s))
 
         self.tree.column("Kurscode", width=100, anchor="center")
         self.tree.column("Kursname", width=400, anchor="w")
         self.tree.column("ECTS", width=40, anchor="center")
         self.tree.column("Note", width=40, anchor="center")
 
-        # Kurse in die Tabelle einfügen
-        for k in self.kurse:
-            note_txt = "A" if k.note == 0.0 else (f"{k.note:.2f}" if k.note is not None else "-")
-            iid = self.tree.insert("", "end", values=(k.kurscode, k.name, k.ects, note_txt))
-            self.item_kurs_map[iid] = k
+        # Nur die sichtbaren Kurse als Treeview-Einträge anlegen (virtualisiert)
+        # Zeilenhöhe wie im Style "Borderless.Treeview" (siehe _init_style)
+        self.tabelle = VirtuelleTabelle(self.tree, scrollbar, zeilenhoehe=30)
+        # Mapping vom Treeview-Eintrag (iid) zu den aktuell angezeigten Kurs-Objekten
+        self.item_kurs_map = self.tabelle.item_kurs_map
+        self.tabelle.setze_zeilen(self.kurse)
 
         # Bindings für Doppelklick und Mouse-Over (Hover-Effekt)
         self.tree.bind("<Double-1>", self._on_tree_double_click)
         self.tree.bind("<Motion>", self._on_hover_motion)
+        self.tree.bind("<Leave>", self._on_hover_leave)
+        self.tree.tag_configure("hover", background="#44474C")
+
+    def _wende_filter_an(self, nach_oben=True):
+        """
+        Zeigt nur die Kurse, die zur Eingabe im Suchfeld passen, in der
+        gewählten Sortierung. Treffer und Reihenfolge kommen aus den Indizes
+        des Controllers; die Tabelle befüllt nur ihre sichtbaren Einträge neu,
+        statt Treeview-Einträge anzulegen, zu verschieben oder zu löschen.
+
+        :param nach_oben: True, um zum ersten Treffer zu springen
+        """
+        zeilen = self.controller.suche_kurse(self.filter_var.get())
+        if self._sortierung is not None:
+            spalte, absteigend = self._sortierung
+            zeilen = self.controller.sortiere_kurse(spalte, absteigend, zeilen)
+        if nach_oben:
+            self.tabelle.start = 0
+        self.tabelle.setze_zeilen(self.kurse if zeilen is None else zeilen)
+
+    def _sortiere(self, spalte):
+        """
+        Sortiert die Tabelle nach einer Spalte (erst aufsteigend, beim
+        nächsten Klick absteigend) und markiert die Überschrift mit einem Pfeil.
+
+        :param spalte: "Kurscode", "Kursname", "ECTS" oder "Note"
+        """
+        absteigend = self._sortierung == (spalte, False)
+        if self._sortierung is not None:
+            self.tree.heading(self._sortierung[0], text=self._sortierung[0])
+        self._sortierung = (spalte, absteigend)
+        self.tree.heading(spalte, text=f"{spalte} {'▼' if absteigend else '▲'}")
+        self._wende_filter_an()
 
     def _on_tree_double_click(self, event):
         """
@@ -250,14 +621,14 @@ class View(tk.Tk):
         row = self.tree.identify_row(event.y)
         region = self.tree.identify("region", event.x, event.y)
 
-        # Alle Zeilen zurücksetzen
-        for iid in self.tree.get_children():
-            self.tree.item(iid, tags=())
-
         # Nur in "cell" und bei existierender Zeile highlighten
-        if region == "cell" and row:
-            self.tree.item(row, tags=("hover",))
-            self.tree.tag_configure("hover", background="#44474C")
+        self.tabelle.hebe_hervor(row if region == "cell" and row else None)
+
+    def _on_hover_leave(self, event):
+        """
+        Entfernt die Hervorhebung, wenn die Maus die Tabelle verlässt.
+        """
+        self.tabelle.hebe_hervor(None)
 
     def open_course_edit_popup(self, kurs):
         """
@@ -283,8 +654,7 @@ class View(tk.Tk):
         code_var = tk.StringVar(value=kurs.kurscode)
         name_var = tk.StringVar(value=kurs.name)
         ects_var = tk.StringVar(value=str(kurs.ects))
-        note_txt = "-" if kurs.note is None else ("A" if kurs.note == 0.0 else f"{kurs.note:.2f}")
-        note_var = tk.StringVar(value=note_txt)
+        note_var = tk.StringVar(value=note_anzeige(kurs.note))
 
         def add_field(lbl, var, row_index, width=30):
             tk.Label(
@@ -345,33 +715,239 @@ class View(tk.Tk):
 
     def _save_course_changes(self, kurs, new_code, new_name, new_ects, new_note, dialog):
         """
-        Speichert alle Kursänderungen:
-        - Kurscode ändern
-        - Kursname ändern
-        - ECTS ändern
-        - Note ändern
-        Weist den Controller an, die jeweiligen Repositories/Services aufzurufen.
-        Schließt den Dialog, wenn alles gültig ist.
+        Speichert alle Kursänderungen (Kurscode, Kursname, ECTS, Note)
+        in einem einzigen Controller-Aufruf. Der Controller prüft alle Felder
+        gemeinsam, schreibt die CSV einmal und aktualisiert die View einmal.
+        Schließt den Dialog, wenn alles gültig ist; sonst bleibt er offen und
+        der Grund erscheint in der Titelzeile.
+        """
+        try:
+            ok = self.controller.aktualisiere_kurs(
+                kurs.kurscode,
+                neuer_kurscode=new_code.strip(),
+                neuer_name=new_name.strip(),
+                neue_ects=new_ects.strip(),
+                neue_note=new_note
+            )
+        except ValueError as e:
+            self.status_var.set(f"Änderung abgelehnt: {e}")
+            return
+        if not ok:
+            return
+
+        dialog.destroy()
+
+    def _importiere_noten(self):
+        """
+        Lässt eine CSV- oder JSON-Datei mit Kurscodes und Noten auswählen und
+        übergibt sie dem Controller. Das Ergebnis (Anzahl übernommener Noten,
+        die ersten abgelehnten Zeilen) erscheint in der Titelzeile.
+        """
+        pfad = filedialog.askopenfilename(
+            parent=self,
+            title="Noten importieren",
+            filetypes=[("CSV oder JSON", "*.csv *.json"), ("Alle Dateien", "*")]
+        )
+        if not pfad:
+            return
+        try:
+            anzahl, abgelehnt = self.controller.importiere_noten(pfad)
+        except (OSError, ValueError) as e:
+            self.status_var.set(f"Import fehlgeschlagen: {e}")
+            return
+        meldung = f"{anzahl} Noten importiert"
+        if abgelehnt:
+            details = "; ".join(f"Zeile {zeile}: {code} {text!r} ({grund})"
+                                for zeile, code, text, grund in abgelehnt[:3])
+            weitere = " ..." if len(abgelehnt) > 3 else ""
+            meldung += f", {len(abgelehnt)} abgelehnt: {details}{weitere}"
+        self.status_var.set(meldung)
+
+    def _toggle_planer(self):
         """
-        old_code = kurs.kurscode
+        Öffnet bzw. schließt den Notenplaner: Nach Eingabe eines Ziel-Durchschnitts
+        zeigt er sofort den nötigen Durchschnitt über alle offenen Module und je
+        Modul die schlechteste Note, mit der das Ziel noch erreichbar bleibt.
+        """
+        if self._planer_fenster is not None:
+            self._planer_fenster.destroy()
+            self._planer_fenster = None
+            return
+        top = tk.Toplevel(self)
+        top.title("Notenplaner")
+        top.config(bg=self.background_color)
+        top.protocol("WM_DELETE_WINDOW", self._toggle_planer)
 
-        if new_code != old_code:
-            ok_code = self.controller.aktualisiere_kurscode(old_code, new_code)
-            if not ok_code:
-                return
+        zeile = tk.Frame(top, bg=self.background_color)
+        zeile.pack(fill="x", padx=10, pady=(10, 5))
+        tk.Label(
+            zeile,
+            text="Ziel-Durchschnitt:",
+            font=("Consolas", 12),
+            bg=self.background_color,
+            fg=self.foreground_color
+        ).pack(side="left", padx=(0, 5))
+        self._planer_var = tk.StringVar(value=str(self.durchschnitt or "2.0"))
+        tk.Entry(
+            zeile,
+            textvariable=self._planer_var,
+            font=("Consolas", 12),
+            bg=self.border_color,
+            fg="#FFFFFF",
+            insertbackground="#FFFFFF",
+            bd=0,
+            highlightthickness=0,
+            relief="flat",
+            width=6
+        ).pack(side="left")
+
+        self._planer_ergebnis_var = tk.StringVar(value="")
+        tk.Label(
+            top,
+            textvariable=self._planer_ergebnis_var,
+            font=("Consolas", 12, "bold"),
+            bg=self.background_color,
+            fg=self.foreground_color,
+            anchor="w",
+            justify="left"
+        ).pack(fill="x", padx=10)
 
-        if new_name.strip() != kurs.name:
-            self.controller.aktualisiere_kursname(new_code, new_name.strip())
+        self._planer_text = tk.Text(
+            top,
+            font=("Consolas", 10),
+            bg=self.border_color,
+            fg=self.foreground_color,
+            width=70,
+            height=18,
+            bd=0,
+            highlightthickness=0
+        )
+        self._planer_text.pack(fill="both", expand=True, padx=10, pady=10)
 
-        if str(kurs.ects) != new_ects.strip():
-            ok_ects = self.controller.aktualisiere_kurs_ects(new_code, new_ects.strip())
-            if not ok_ects:
-                return
+        self._planer_fenster = top
+        self._planer_var.trace_add("write", lambda *args: self._aktualisiere_planer())
+        self._aktualisiere_planer()
 
-        if not self.controller.aktualisiere_note(new_code, new_note):
+    def _aktualisiere_planer(self):
+        """
+        Berechnet den Notenplaner für die aktuelle Eingabe neu (bei jedem
+        Tastendruck und nach Änderungen an den Kursen).
+        """
+        if self._planer_fenster is None:
+            return
+        try:
+            ziel = float(self._planer_var.get().strip().replace(",", "."))
+        except ValueError:
+            ziel = None
+        if ziel is None or not 1 <= ziel <= 5:
+            self._planer_ergebnis_var.set("Bitte einen Ziel-Durchschnitt zwischen 1.0 und 5.0 eingeben.")
+            self._planer_text.delete("1.0", "end")
             return
 
-        dialog.destroy()
+        planer, benoetigt, module = self.controller.plane_noten(ziel)
+        if benoetigt is None:
+            ergebnis = "Keine offenen Module mit ECTS."
+        elif benoetigt < planer.BESTE_NOTE:
+            ergebnis = (f"Nicht erreichbar: nötig wäre Ø {benoetigt:.2f} "
+                        f"in {len(module)} offenen Modulen.")
+        elif benoetigt >= planer.SCHLECHTESTE_NOTE:
+            ergebnis = f"Mit jeder bestandenen Note in den {len(module)} offenen Modulen erreicht."
+        else:
+            ergebnis = (f"Nötig: Ø {benoetigt:.2f} in {len(module)} offenen Modulen "
+                        f"({planer.offene_summe} ECTS).")
+        self._planer_ergebnis_var.set(ergebnis)
+
+        zeilen = [f"{'Kurs':12s} {'ECTS':>4s}  Schlechteste noch mögliche Note"]
+        for k, note in module:
+            zeilen.append(f"{k.kurscode:12s} {k.ects:4d}  {'-' if note is None else f'{note:.1f}'}  {k.name}")
+        self._planer_text.delete("1.0", "end")
+        self._planer_text.insert("1.0", "\n".join(zeilen))
+
+    def _toggle_semesterplan(self):
+        """
+        Öffnet bzw. schließt den Semesterplan: verteilt die offenen Kurse auf
+        die nächsten Semester, bis die Ziel-ECTS erreicht sind. ECTS-Grenze und
+        Semesterzahl lassen sich ändern; der Plan wird sofort neu berechnet.
+        """
+        if self._semesterplan_fenster is not None:
+            self._semesterplan_fenster.destroy()
+            self._semesterplan_fenster = None
+            return
+        top = tk.Toplevel(self)
+        top.title("Semesterplan")
+        top.config(bg=self.background_color)
+        top.protocol("WM_DELETE_WINDOW", self._toggle_semesterplan)
+
+        zeile = tk.Frame(top, bg=self.background_color)
+        zeile.pack(fill="x", padx=10, pady=(10, 5))
+        self._semesterplan_vars = {
+            "ECTS je Semester": tk.StringVar(value=str(STANDARD_MAX_ECTS)),
+            "Semester (leer = alle)": tk.StringVar(value="")
+        }
+        for lbl, var in self._semesterplan_vars.items():
+            tk.Label(
+                zeile,
+                text=f"{lbl}:",
+                font=("Consolas", 12),
+                bg=self.background_color,
+                fg=self.foreground_color
+            ).pack(side="left", padx=(0, 5))
+            tk.Entry(
+                zeile,
+                textvariable=var,
+                font=("Consolas", 12),
+                bg=self.border_color,
+                fg="#FFFFFF",
+                insertbackground="#FFFFFF",
+                bd=0,
+                highlightthickness=0,
+                relief="flat",
+                width=4
+            ).pack(side="left", padx=(0, 15))
+            var.trace_add("write", lambda *args: self._aktualisiere_semesterplan())
+
+        self._semesterplan_text = tk.Text(
+            top,
+            font=("Consolas", 10),
+            bg=self.border_color,
+            fg=self.foreground_color,
+            width=80,
+            height=22,
+            bd=0,
+            highlightthickness=0
+        )
+        self._semesterplan_text.pack(fill="both", expand=True, padx=10, pady=10)
+
+        self._semesterplan_fenster = top
+        self._aktualisiere_semesterplan()
+
+    def _aktualisiere_semesterplan(self):
+        """
+        Berechnet den Semesterplan für die aktuellen Eingaben neu (bei jedem
+        Tastendruck und nach Änderungen an Kursen oder Ziel-ECTS).
+        """
+        if self._semesterplan_fenster is None:
+            return
+        max_ects, max_semester = (v.get().strip() for v in self._semesterplan_vars.values())
+        try:
+            max_ects = int(max_ects)
+            max_semester = int(max_semester) if max_semester else None
+            planer, semester, erreicht = self.controller.plane_semester(max_ects, max_semester)
+        except ValueError:
+            zeilen = ["Bitte ganze Zahlen größer als 0 eingeben."]
+        else:
+            zeilen = [f"Fehlende ECTS: {planer.fehlend} "
+                      f"(mindestens {planer.untere_grenze} Semester bei {max_ects} ECTS)"]
+            for nr, kurse in enumerate(semester, start=1):
+                zeilen.append("")
+                zeilen.append(f"Semester {nr} ({sum(k.ects for k in kurse)} ECTS)")
+                zeilen.extend(f"  {k.kurscode:12s} {k.ects:3d}  {k.name}" for k in kurse)
+            if not erreicht:
+                zeilen.append("")
+                zeilen.append("Ziel-ECTS mit den offenen Kursen nicht erreichbar"
+                              + (f" (höchstens {max_semester} Semester)" if max_semester else ""))
+        self._semesterplan_text.delete("1.0", "end")
+        self._semesterplan_text.insert("1.0", "\n".join(zeilen))
 
     def open_student_popup(self):
         """
@@ -463,37 +1039,148 @@ class View(tk.Tk):
         self.controller.aktualisiere_student(name_val, stud_val, ziel)
         dialog.destroy()
 
-    def update_student_info(self, student, ects, durchschnitt):
+    def update_student_info(self, student, ects, durchschnitt,
+                            geaenderte_kurse=None, geaenderte_stats=None, zeilen_geaendert=False):
         """
         Aktualisiert die View, nachdem Daten geändert wurden oder
         sich Berechnungswerte geändert haben (ECTS, Durchschnitt).
+        Meldet der Controller, was sich geändert hat, werden nur die
+        betroffenen Tabellenzeilen und Anzeigen angefasst.
 
         :param student: Aktualisiertes Student-Objekt
         :param ects: Neue ECTS-Summe
         :param durchschnitt: Neuer Notendurchschnitt oder None
+        :param geaenderte_kurse: Geänderte Kurs-Objekte; None = alle sichtbaren Zeilen
+        :param geaenderte_stats: Menge aus "student", "ects", "durchschnitt";
+                                 None = alles
+        :param zeilen_geaendert: True, wenn Kurse hinzugekommen oder entfernt wurden
         """
         self.student = student
         self.ects = ects
         self.durchschnitt = durchschnitt
+        alles = geaenderte_stats is None
+
+        if alles or "student" in geaenderte_stats:
+            self.name_var.set(student.name)
+            self.studiengang_var.set(student.studiengang)
+            self.ziel_ects_var.set(str(student.ziel_ects))
+        if alles or "ects" in geaenderte_stats:
+            self.ects_var.set(str(ects))
+        if alles or "durchschnitt" in geaenderte_stats:
+            self.durchschnitt_var.set(str(durchschnitt or "-"))
+
+        # Fortschrittskreis nur anpassen, wenn sich ECTS oder Ziel geändert haben
+        if alles or "ects" in geaenderte_stats or "student" in geaenderte_stats:
+            self._aktualisiere_kreis(ects, student.ziel_ects)
+
+        if geaenderte_kurse is None or geaenderte_kurse or zeilen_geaendert:
+            self._aktualisiere_planer()
+            self._aktualisiere_semesterplan()
+        elif alles or "student" in geaenderte_stats:
+            self._aktualisiere_semesterplan()
+
+        gefiltert = self._sortierung is not None or self.filter_var.get().strip()
+        if zeilen_geaendert or (geaenderte_kurse and gefiltert):
+            # Zeilen hinzugekommen/entfernt oder Treffer/Position evtl. geändert:
+            # Auswahl neu bestimmen, sichtbaren Ausschnitt neu befüllen
+            self._wende_filter_an(nach_oben=False)
+        elif geaenderte_kurse is None:
+            # Tabelle aktualisieren (nur die sichtbaren Einträge)
+            for iid in self.item_kurs_map:
+                self.tabelle.zeile_neu(iid)
+        else:
+            self.tabelle.aktualisiere_kurse(geaenderte_kurse)
+
+    def _init_debug(self):
+        """
+        Richtet bei aktiver Instrumentierung die versteckten Tastenkürzel ein:
+        Strg+Umschalt+D blendet das Debug-Panel mit den Messwerten ein/aus,
+        Strg+Umschalt+P nimmt einige Sekunden lang ein cProfile-Profil auf.
+        """
+        self._debug_fenster = None
+        self._profil = instrumentierung.ProfilAufnahme()
+        self.bind_all("<Control-Shift-D>", lambda e: self._toggle_debug_panel())
+        self.bind_all("<Control-Shift-P>", lambda e: self._starte_profil())
+
+    def _toggle_debug_panel(self):
+        """
+        Öffnet bzw. schließt das Debug-Panel mit Aufrufzahlen und Laufzeiten.
+        """
+        if self._debug_fenster is not None:
+            self._debug_fenster.destroy()
+            self._debug_fenster = None
+            return
+        top = tk.Toplevel(self)
+        top.title("Messwerte")
+        top.config(bg=self.background_color)
+        text = tk.Text(
+            top,
+            font=("Consolas", 10),
+            bg=self.border_color,
+            fg=self.foreground_color,
+            width=82,
+            height=20,
+            bd=0,
+            highlightthickness=0
+        )
+        text.pack(fill="both", expand=True, padx=10, pady=10)
+        self._debug_fenster = top
+        self._aktualisiere_debug_panel(text)
+
+    def _aktualisiere_debug_panel(self, text):
+        """
+        Schreibt die aktuellen Messwerte in das Panel, solange es geöffnet ist.
+        """
+        if self._debug_fenster is None or not text.winfo_exists():
+            self._debug_fenster = None
+            return
+        text.delete("1.0", "end")
+        cache = self.controller.kennzahlen
+        status = cache.status
+        text.insert("1.0", instrumentierung.als_text()
+                    + f"\n\nFortschritt {cache.fortschritt}%, {status['benotet']} benotet, "
+                      f"{status['angerechnet']} angerechnet, {status['offen']} offen"
+                    + f"\nStatistik-Cache: {cache.treffer} Treffer, {cache.fehlgriffe} Fehlgriffe")
+        self.after(self.DEBUG_INTERVALL_MS, self._aktualisiere_debug_panel, text)
+
+    def _starte_profil(self):
+        """
+        Startet eine zeitlich begrenzte cProfile-Aufnahme und schreibt sie
+        anschließend als .prof-Datei; der Dateiname erscheint in der Titelzeile.
+        """
+        if self._profil.laeuft:
+            return
+        self._profil.starte()
+        self.status_var.set("Profil wird aufgenommen ...")
+        self.after(self.PROFIL_DAUER_MS, self._stoppe_profil)
 
-        self.name_var.set(student.name)
-        self.studiengang_var.set(student.studiengang)
-        self.ziel_ects_var.set(str(student.ziel_ects))
-        self.ects_var.set(str(ects))
-        self.durchschnitt_var.set(str(durchschnitt or "-"))
-
-        # Fortschrittskreis neu zeichnen
-        for c in self.circle_frame.winfo_children():
-            c.destroy()
-        self._draw_circle(self.circle_frame, ects, student.ziel_ects, 130, 20)
-
-        # Tabelle aktualisieren (alle Kurse)
-        for iid, k in self.item_kurs_map.items():
-            self.tree.set(iid, "Kurscode", k.kurscode)
-            self.tree.set(iid, "Kursname", k.name)
-            self.tree.set(iid, "ECTS", k.ects)
-            disp_note = "-" if k.note is None else ("A" if k.note == 0.0 else f"{k.note:.2f}")
-            self.tree.set(iid, "Note", disp_note)
+    def _stoppe_profil(self):
+        pfad = self._profil.stoppe()
+        if pfad:
+            self.status_var.set(f"Profil gespeichert: {pfad}")
+
+    def _pruefe_speicherstatus(self):
+        """
+        Fragt regelmäßig (per after()) die Ergebnisse des Speicher-Workers ab
+        und zeigt Fehler in der Titelzeile an. Ein späterer erfolgreicher
+        Speichervorgang derselben Art löscht die Meldung wieder.
+        """
+        for art, fehler in self.controller.speicher.meldungen_abholen():
+            if fehler is not None:
+                self.status_var.set(f"Speichern fehlgeschlagen ({art}): {fehler}")
+            elif self.status_var.get().startswith(f"Speichern fehlgeschlagen ({art})"):
+                self.status_var.set("")
+        self.after(self.SPEICHER_INTERVALL_MS, self._pruefe_speicherstatus)
+
+    def _pruefe_externe_aenderungen(self):
+        """
+        Lässt den Controller regelmäßig (per after()) nach Änderungen anderer
+        Programme an den Kursdaten suchen und zeigt Fehler beim Neuladen an.
+        """
+        fehler = self.controller.pruefe_externe_aenderungen()
+        if fehler is not None:
+            self.status_var.set(f"Neu laden fehlgeschlagen: {fehler}")
+        self.after(self.WAECHTER_INTERVALL_MS, self._pruefe_externe_aenderungen)
 
     def _add_stat_label(self, parent, title, val, row):
         """
@@ -529,24 +1216,36 @@ class View(tk.Tk):
         """
         Zeichnet den Fortschrittskreis als Arc. Der Winkel basiert auf
         (reached/goal) * 360. Der Prozentwert wird ins Zentrum geschrieben.
+        Die Canvas-Elemente werden gemerkt und bei Änderungen über
+        _aktualisiere_kreis angepasst statt neu erzeugt.
         """
         c = Canvas(parent, width=size, height=size, bg=self.border_color, highlightthickness=0)
         c.pack(pady=(0, bottom_pad))
 
-        pct = (reached / goal * 100) if goal > 0 else 0
-        angle = (pct / 100) * 360
         pad = 10
 
         c.create_oval(pad, pad, size - pad, size - pad, outline=self.background_color, width=8)
-        c.create_arc(pad, pad, size - pad, size - pad,
-                     start=-90, extent=-angle, outline=self.accent_color,
-                     width=8, style="arc")
-        c.create_text(
+        arc = c.create_arc(pad, pad, size - pad, size - pad,
+                           start=-90, extent=0, outline=self.accent_color,
+                           width=8, style="arc")
+        text = c.create_text(
             size / 2, size / 2,
-            text=f"{pct:.0f}%",
+            text="",
             fill=self.foreground_color,
             font=("Consolas", 14, "bold")
         )
+        self._kreis = (c, arc, text)
+        self._aktualisiere_kreis(reached, goal)
+
+    def _aktualisiere_kreis(self, reached, goal):
+        """
+        Setzt Winkel und Prozenttext des bestehenden Fortschrittskreises.
+        """
+        c, arc, text = self._kreis
+        pct = (reached / goal * 100) if goal > 0 else 0
+        angle = (pct / 100) * 360
+        c.itemconfigure(arc, extent=-angle)
+        c.itemconfigure(text, text=f"{pct:.0f}%")
 
     def _start_move(self, e):
         """